@@ -0,0 +1,58 @@
+import unittest
+import tempfile
+import os
+import networkx as nx
+from src.cgra.mapping_generator_CGRA import Mapping_generator_CGRA
+from src.utils.Graph_Visualizer import Graph_Visualizer
+from src.utils.dot_reader import Dot_Reader
+
+class TestDotReader(unittest.TestCase):
+
+    """
+    Classe que contém testes unitarios para o leitor rápido de DOT.
+    """
+
+    def write(self, directory, name, text):
+        path = os.path.join(directory, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def assertSameAsPydot(self, path):
+        expected = nx.DiGraph(nx.nx_pydot.read_dot(path))
+        graph = Dot_Reader.read_graph(path)
+        self.assertEqual(list(graph.nodes(data=True)), list(expected.nodes(data=True)))
+        self.assertEqual(list(graph.edges(data=True)), list(expected.edges(data=True)))
+
+    def test_generator_dialect_matches_pydot(self):
+        """
+        Testa se os DOTs do gerador são lidos pelo leitor rápido, com o mesmo resultado do pydot, e
+        se read_mapping recupera as arestas do mapeamento.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            for index in range(10):
+                _, mapping, _, _ = Mapping_generator_CGRA.generate_indexed(index, (3, 7), [(3, 3)], 0.8, 0.4, '1000', seed=5)
+                text = Graph_Visualizer.to_dot(mapping)
+                self.assertIsNotNone(Dot_Reader.parse(text))
+                path = self.write(directory, f"graph_{index}.dot", text)
+                self.assertSameAsPydot(path)
+                self.assertEqual(set(Dot_Reader.read_mapping(path).routing), set(mapping.routing))
+
+    def test_fallback_to_pydot(self):
+        """
+        Testa se arquivos fora do formato restrito são lidos pelo pydot.
+        """
+        texts = [
+            'digraph G {\n    node [shape=box];\n    a -> b;\n}\n',
+            'strict digraph {\n    a -> b -> c;\n}\n',
+            'digraph { a; b; a -> b }\n',
+            'strict digraph {\n    "x y" [label="add, mul"];\n    "x y" -> z [weight=2];\n}\n',
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            for index, text in enumerate(texts):
+                self.assertSameAsPydot(self.write(directory, f"graph_{index}.dot", text))
+        self.assertIsNone(Dot_Reader.parse(texts[0]))
+        self.assertIsNone(Dot_Reader.parse(texts[1]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import unittest
+import tempfile
+import io
+import json
+import sys
+import os
+from contextlib import redirect_stdout
+from src.scripts.Script_Graph_Balancing import Balancing, MANIFEST_NAME, file_hash
+
+# Substituto do executável dot do Graphviz para o pydot, que lê a imagem da saída padrão.
+DOT_STUB = '''#!{python}
+import sys
+sys.stdout.buffer.write(b"PNG")
+'''
+
+class TestGraphBalancing(unittest.TestCase):
+
+    """
+    Classe que contém testes unitarios para a execução incremental do Script_Graph_Balancing.
+    """
+
+    def setUp(self):
+        """
+        Configuração das variaveis:
+
+            input_dir (str): diretório com os DOTs de origem.
+            output_dir (str): diretório de destino, com o manifesto.
+        """
+        self.temporary = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.temporary.name, "input")
+        self.output_dir = os.path.join(self.temporary.name, "output")
+        os.makedirs(self.input_dir)
+        bin_dir = os.path.join(self.temporary.name, "bin")
+        os.makedirs(bin_dir)
+        dot = os.path.join(bin_dir, "dot")
+        with open(dot, "w") as f:
+            f.write(DOT_STUB.format(python=sys.executable))
+        os.chmod(dot, 0o755)
+        self.path = os.environ["PATH"]
+        os.environ["PATH"] = bin_dir + os.pathsep + self.path
+
+        self.write("chain.dot", [("a", "b"), ("b", "c"), ("a", "c")])
+        self.write("diamond.dot", [("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")])
+
+    def tearDown(self):
+        os.environ["PATH"] = self.path
+        self.temporary.cleanup()
+
+    def write(self, name, edges):
+        path = os.path.join(self.input_dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("strict digraph {\n" + "".join(f"    {source} -> {target};\n" for source, target in edges) + "}\n")
+        return path
+
+    def touch(self, name, seconds=10):
+        """
+        Deixa a origem mais nova que as saídas, sem mudar o conteúdo.
+        """
+        path = os.path.join(self.input_dir, name)
+        mtime = os.stat(path).st_mtime_ns + seconds * 10**9
+        os.utime(path, ns=(mtime, mtime))
+
+    def balance(self, **kwargs):
+        """
+        Executa Balancing com um processo e devolve os arquivos processados; os arquivos com erro
+        ficam em self.errors.
+        """
+        output = io.StringIO()
+        with redirect_stdout(output):
+            Balancing(self.input_dir, self.output_dir, 1, **kwargs)
+        lines = output.getvalue().splitlines()
+        self.errors = sorted(line.split(": ", 1)[0][len("Erro ao processar "):] for line in lines if line.startswith("Erro ao processar "))
+        return sorted(line.split(": ", 1)[1] for line in lines if line.startswith("Processado: "))
+
+    def manifest(self):
+        with open(os.path.join(self.output_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_skips_outputs_newer_than_input(self):
+        """
+        Testa se uma segunda execução pula os arquivos cujas saídas (.dot e .png) são mais novas que a origem.
+        """
+        self.assertEqual(self.balance(), ["chain.dot", "diamond.dot"])
+        for name in ["chain.dot", "chain.png", "diamond.dot", "diamond.png"]:
+            self.assertTrue(os.path.exists(os.path.join(self.output_dir, name)), name)
+        self.assertEqual(self.balance(), [])
+
+    def test_touched_input_is_skipped_by_hash(self):
+        """
+        Testa se uma origem tocada mas não alterada é pulada pelo hash do manifesto, e se uma
+        origem alterada é balanceada de novo e tem o hash atualizado.
+        """
+        self.assertEqual(self.balance(), ["chain.dot", "diamond.dot"])
+        self.touch("chain.dot")
+        self.assertEqual(self.balance(), [])
+
+        path = self.write("diamond.dot", [("a", "b"), ("b", "c"), ("c", "d"), ("a", "d")])
+        self.touch("diamond.dot")
+        self.assertEqual(self.balance(), ["diamond.dot"])
+        self.assertEqual(self.manifest()["diamond.dot"], file_hash(path))
+
+    def test_images_disabled(self):
+        """
+        Testa se, com images=False, só os .dot são gerados, e se uma execução posterior com imagens
+        refaz os arquivos que ainda não têm imagem.
+        """
+        self.assertEqual(self.balance(images=False), ["chain.dot", "diamond.dot"])
+        self.assertEqual(sorted(os.listdir(self.output_dir)), sorted([MANIFEST_NAME, "chain.dot", "diamond.dot"]))
+        self.assertEqual(self.balance(images=False), [])
+        self.touch("chain.dot")
+        self.assertEqual(self.balance(images=False), [])
+
+        self.assertEqual(self.balance(), ["chain.dot", "diamond.dot"])
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "chain.png")))
+
+    def test_force_redoes_everything(self):
+        """
+        Testa se force=True balanceia de novo todos os arquivos, mesmo os atualizados.
+        """
+        self.assertEqual(self.balance(images=False), ["chain.dot", "diamond.dot"])
+        self.assertEqual(self.balance(images=False, force=True), ["chain.dot", "diamond.dot"])
+        self.assertEqual(set(self.manifest()), {"chain.dot", "diamond.dot"})
+
+    def test_failing_file_leaves_manifest(self):
+        """
+        Testa se um arquivo que falha não interrompe os outros, sai do manifesto e é tentado de
+        novo na execução seguinte.
+        """
+        self.assertEqual(self.balance(images=False), ["chain.dot", "diamond.dot"])
+        self.write("chain.dot", [("a", "b"), ("b", "a")])
+        self.touch("chain.dot")
+        self.touch("diamond.dot")
+        self.write("new.dot", [("a", "b")])
+
+        self.assertEqual(self.balance(images=False), ["new.dot"])
+        self.assertEqual(self.errors, ["chain.dot"])
+        self.assertEqual(set(self.manifest()), {"diamond.dot", "new.dot"})
+        self.assertEqual(self.balance(images=False), [])
+        self.assertEqual(self.errors, ["chain.dot"])
+
+        self.write("chain.dot", [("a", "b"), ("b", "c")])
+        self.touch("chain.dot", 30)
+        self.assertEqual(self.balance(images=False), ["chain.dot"])
+        self.assertEqual(set(self.manifest()), {"chain.dot", "diamond.dot", "new.dot"})
+
+if __name__ == "__main__":
+    unittest.main()
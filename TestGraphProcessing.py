@@ -0,0 +1,165 @@
+import unittest
+import pickle
+import random
+from collections import defaultdict
+from src.utils.Mapping import Mapping
+from src.utils.graph_processing import Graph_Processing
+from src.utils.graph_balancer import Graph_Balancer
+from src.scripts.Script_Graph_Balancing import balance_graph
+from src.cgra.mapping_generator_CGRA import Mapping_generator_CGRA
+from src.utils.generation_stats import Generation_Stats
+from networkx.algorithms.isomorphism import DiGraphMatcher
+import networkx as nx
+
+class TestGraphProcessing(unittest.TestCase):
+
+    """
+    Classe que contém testes unitarios para a validação de DFGs do Graph_Processing.
+    """
+
+    def random_mapping(self, seed):
+        """
+        Gera um DFG aleatório, que pode ser desconexo, cíclico ou desbalanceado.
+        """
+        rng = random.Random(seed)
+        dfg_tam = rng.randint(1, 12)
+        mapping = Mapping(dfg_tam)
+        mapping.dfg_edges = defaultdict(list)
+        density = rng.random() * 0.4
+        for source in rng.sample(range(dfg_tam), dfg_tam):
+            mapping.dfg_edges[source]
+            for target in range(dfg_tam):
+                if target != source and rng.random() < (density if rng.random() < 0.8 or target > source else density / 4):
+                    mapping.dfg_edges[source].append(target)
+        return mapping, dfg_tam
+
+    def dict_validate(self, mapping, dfg_tam):
+        """
+        Validação com a representação em dicionários (is_connected, has_cycle e is_balanced).
+        """
+        processing = Graph_Processing(mapping, dfg_tam)
+        if not processing.is_connected(mapping):
+            return "disconnected"
+        if processing.has_cycle(mapping.dfg_edges):
+            return "cyclic"
+        if not processing.is_balanced(mapping):
+            return "unbalanced"
+        return None
+
+    def test_bitset_matches_dict_validation(self):
+        """
+        Testa se a validação por máscaras de bits dá a mesma causa que a validação por dicionários.
+        """
+        causes = set()
+        for seed in range(3000):
+            mapping, dfg_tam = self.random_mapping(seed)
+            expected = self.dict_validate(mapping, dfg_tam)
+            self.assertEqual(Graph_Processing(mapping, dfg_tam).validate_bitset(), expected, f"seed {seed}")
+            causes.add(expected)
+        self.assertEqual(causes, {None, "disconnected", "cyclic", "unbalanced"})
+
+    def test_levels_are_wave_depths(self):
+        """
+        Testa se calculate_predecessors_and_levels dá a cada nó a profundidade da sua onda de Kahn.
+        Antes da correção, o contador de nível e a troca de fronteira estavam dentro do laço dos
+        nós, e cada nó recebia um nível diferente.
+        """
+        dfg_edges = {0: [1, 2], 1: [3], 2: [3], 3: []}
+        _, levels = Graph_Processing.calculate_predecessors_and_levels(dfg_edges)
+        self.assertEqual(levels, {0: 0, 1: 1, 2: 1, 3: 2})
+
+        dfg_edges = {0: [1, 2, 3], 1: [4], 2: [4], 3: [5], 4: [6], 5: [6], 6: []}
+        _, levels = Graph_Processing.calculate_predecessors_and_levels(dfg_edges)
+        self.assertEqual(levels, {0: 0, 1: 1, 2: 1, 3: 1, 4: 2, 5: 2, 6: 3})
+
+    def test_is_balanced_accepts_nodes_with_several_predecessors(self):
+        """
+        Testa se is_balanced aceita nós com vários predecessores no mesmo nível (losango) e rejeita
+        nós com predecessores em níveis diferentes.
+        """
+        for dfg_edges, expected in [({0: [1, 2], 1: [3], 2: [3], 3: []}, True),
+                                    ({0: [1, 2, 3], 1: [4], 2: [4], 3: [4], 4: []}, True),
+                                    ({0: [1, 3], 1: [2], 2: [3], 3: []}, False),
+                                    ({0: [1, 2], 1: [2], 2: []}, False)]:
+            mapping = Mapping(len(dfg_edges))
+            mapping.dfg_edges = dfg_edges
+            processing = Graph_Processing(mapping, len(dfg_edges))
+            self.assertEqual(processing.is_balanced(mapping), expected, dfg_edges)
+            self.assertEqual(processing.validate() is None, expected, dfg_edges)
+
+    def test_kahn_sweep_matches_dict_validation(self):
+        """
+        Testa se a passada única de Kahn dá a mesma causa que a validação por dicionários e, para
+        DFGs acíclicos, os mesmos níveis de calculate_predecessors_and_levels.
+        """
+        for seed in range(3000):
+            mapping, dfg_tam = self.random_mapping(seed)
+            expected = self.dict_validate(mapping, dfg_tam)
+            cause, levels = Graph_Processing(mapping, dfg_tam).kahn_sweep()
+            self.assertEqual(cause, expected, f"seed {seed}")
+            if expected in (None, "unbalanced"):
+                self.assertEqual(levels, Graph_Processing.calculate_predecessors_and_levels(mapping.dfg_edges)[1])
+
+    def test_packed_mapping_round_trip(self):
+        """
+        Testa se um Mapping compactado por pack() devolve os mesmos dicionários, na mesma ordem,
+        inclusive depois de serializado com pickle, e continua validando da mesma forma.
+        """
+        for seed in range(200):
+            mapping, dfg_tam = self.random_mapping(seed)
+            rng = random.Random(seed)
+            mapping.placement = {node: (rng.randint(0, 7), rng.randint(0, 7), rng.randint(0, 3)) for node in rng.sample(range(dfg_tam), dfg_tam)}
+            mapping.routing = {(source, target): [source, target] if rng.random() < 0.8 else [source, rng.randint(0, dfg_tam), target]
+                               for source, targets in mapping.dfg_edges.items() for target in targets}
+            mapping.physical_routes = {edge: [mapping.placement[edge[0]]] * rng.randint(0, 2) + [mapping.placement[edge[1]]] for edge in mapping.routing}
+            expected = (list(mapping.placement.items()), [(node, list(targets)) for node, targets in mapping.dfg_edges.items()],
+                        list(mapping.routing.items()), list(mapping.physical_routes.items()))
+            cause = self.dict_validate(mapping, dfg_tam)
+
+            packed = pickle.loads(pickle.dumps(mapping.pack()))
+            self.assertTrue(packed.is_packed)
+            self.assertEqual(Graph_Processing(packed, dfg_tam).validate(), cause)
+            self.assertFalse(packed.is_packed)
+            self.assertEqual((list(packed.placement.items()), list(packed.dfg_edges.items()),
+                              list(packed.routing.items()), list(packed.physical_routes.items())), expected)
+
+    def test_balance_matches_balancing_script(self):
+        """
+        Testa se o Graph_Balancer insere os mesmos nós de roteamento que o balance_graph do
+        Script_Graph_Balancing e se o DFG resultante passa na validação.
+        """
+        balanced = 0
+        for seed in range(3000):
+            mapping, dfg_tam = self.random_mapping(seed)
+            if self.dict_validate(mapping, dfg_tam) != "unbalanced":
+                continue
+            graph = nx.DiGraph([(source, target) for source, targets in mapping.dfg_edges.items() for target in targets])
+            expected = balance_graph(graph)
+
+            added = Graph_Balancer.balance(mapping)
+            self.assertEqual(added, expected.number_of_nodes() - graph.number_of_nodes())
+            self.assertEqual(len(mapping.dfg_vertices), dfg_tam + added)
+            self.assertIsNone(Graph_Processing(mapping, dfg_tam + added).validate(), f"seed {seed}")
+            result = nx.DiGraph([(source, target) for source, targets in mapping.dfg_edges.items() for target in targets])
+            self.assertTrue(DiGraphMatcher(result, expected).is_isomorphic())
+            balanced += 1
+        self.assertGreater(balanced, 0)
+
+    def test_generator_balance_accepts_unbalanced(self):
+        """
+        Testa se, com balance, o gerador não rejeita DFGs por desbalanceamento, e se balance com
+        early_abort (que rejeita os desbalanceados ainda no routing) é recusado.
+        """
+        stats = Generation_Stats()
+        generator = Mapping_generator_CGRA(6, 1, 0.8, 0.4, (3, 3), '1000', random.Random(1), stats=stats, balance=True)
+        for _ in range(500):
+            generator.attempt()
+        row, = stats.rows()
+        self.assertEqual(row["unbalanced"], 0)
+        self.assertGreater(row["time_balancing"], 0)
+
+        with self.assertRaises(ValueError):
+            Mapping_generator_CGRA(6, 1, 0.8, 0.4, (3, 3), '1000', random.Random(1), early_abort=True, balance=True)
+
+if __name__ == "__main__":
+    unittest.main()
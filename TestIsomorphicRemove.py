@@ -0,0 +1,113 @@
+import unittest
+import tempfile
+import io
+import os
+import re
+import sqlite3
+from contextlib import redirect_stdout
+from src.scripts import Isormophic_Remove_Script as script
+
+class TestIsomorphicRemove(unittest.TestCase):
+
+    """
+    Classe que contém testes unitarios para o índice persistente do Isormophic_Remove_Script.
+    """
+
+    def setUp(self):
+        """
+        Configuração das variaveis:
+
+            reference (str): diretório de referência, indexado por update_index.
+            index_path (str): arquivo do índice, fora do diretório indexado.
+        """
+        self.temporary = tempfile.TemporaryDirectory()
+        self.reference = os.path.join(self.temporary.name, "reference")
+        os.makedirs(self.reference)
+        self.index_path = os.path.join(self.temporary.name, "index.sqlite")
+
+    def tearDown(self):
+        self.temporary.cleanup()
+
+    def write(self, folder, name, edges):
+        path = os.path.join(folder, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("strict digraph {\n" + "".join(f"    {source} -> {target};\n" for source, target in edges) + "}\n")
+        return path
+
+    def update(self):
+        """
+        Executa update_index e devolve (arquivos lidos, removidos, sem alteração, linhas do índice).
+        """
+        output = io.StringIO()
+        with redirect_stdout(output):
+            connection = script.update_index(self.reference, self.index_path, workers=1)
+        rows = {path: (mtime, size, key) for path, mtime, size, key in connection.execute("SELECT path, mtime, size, fingerprint FROM graphs")}
+        connection.close()
+        read, removed, unchanged = map(int, re.search(r"(\d+) arquivos lidos, (\d+) removidos, (\d+) sem alteração", output.getvalue()).groups())
+        return read, removed, unchanged, rows
+
+    def test_update_index_is_incremental(self):
+        """
+        Testa se update_index lê só os arquivos novos, modificados ou tocados (mtime alterado), se
+        um arquivo tocado mantém o fingerprint e se os arquivos apagados saem do índice.
+        """
+        chain = self.write(self.reference, "chain.dot", [(0, 1), (1, 2)])
+        diamond = self.write(self.reference, "diamond.dot", [(0, 1), (0, 2), (1, 3), (2, 3)])
+        fork = self.write(self.reference, "fork.dot", [(0, 1), (0, 2)])
+
+        read, removed, unchanged, rows = self.update()
+        self.assertEqual((read, removed, unchanged), (3, 0, 0))
+        self.assertEqual(set(rows), {chain, diamond, fork})
+        self.assertEqual(self.update()[:3], (0, 0, 3))
+
+        before = rows
+        self.write(self.reference, "chain.dot", [(0, 1), (1, 2), (2, 3)])
+        os.utime(chain, ns=(before[chain][0] + 10**9, before[chain][0] + 10**9))
+        os.utime(diamond, ns=(before[diamond][0] + 10**9, before[diamond][0] + 10**9))
+        os.remove(fork)
+        new = self.write(self.reference, "new.dot", [(0, 1)])
+
+        read, removed, unchanged, rows = self.update()
+        self.assertEqual((read, removed, unchanged), (3, 1, 0))
+        self.assertEqual(set(rows), {chain, diamond, new})
+        self.assertNotEqual(rows[chain][2], before[chain][2])
+        self.assertEqual(rows[diamond][2], before[diamond][2])
+        self.assertEqual(rows[diamond][0], before[diamond][0] + 10**9)
+        self.assertEqual(self.update()[:3], (0, 0, 3))
+
+    def test_index_is_rebuilt_on_version_change(self):
+        """
+        Testa se um índice criado com outra versão do cálculo dos fingerprints (por exemplo, outra
+        versão do networkx) é refeito, em vez de manter fingerprints que não são mais comparáveis.
+        """
+        self.write(self.reference, "chain.dot", [(0, 1), (1, 2)])
+        self.write(self.reference, "fork.dot", [(0, 1), (0, 2)])
+        self.assertEqual(self.update()[:3], (2, 0, 0))
+
+        connection = sqlite3.connect(self.index_path)
+        connection.execute("UPDATE meta SET value = 'old' WHERE key = 'version'")
+        connection.execute("UPDATE graphs SET fingerprint = 'stale'")
+        connection.commit()
+        connection.close()
+
+        read, _, _, rows = self.update()
+        self.assertEqual(read, 2)
+        self.assertNotIn("stale", [key for _, _, key in rows.values()])
+        self.assertEqual(self.update()[:3], (0, 0, 2))
+
+    def test_remove_between_folders(self):
+        """
+        Testa se só os grafos do segundo diretório isomorfos a um grafo do primeiro são removidos.
+        """
+        other = os.path.join(self.temporary.name, "other")
+        os.makedirs(other)
+        self.write(self.reference, "diamond.dot", [(0, 1), (0, 2), (1, 3), (2, 3)])
+        renamed = self.write(other, "renamed.dot", [(3, 2), (3, 0), (2, 1), (0, 1)])
+        distinct = self.write(other, "distinct.dot", [(0, 1), (1, 2), (0, 3)])
+        with redirect_stdout(io.StringIO()):
+            script.remove_isomorphic_graphs_between_folders(self.reference, other, workers=1, index_path=self.index_path)
+        self.assertFalse(os.path.exists(renamed))
+        self.assertTrue(os.path.exists(distinct))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,242 @@
+import unittest
+import random
+import tempfile
+import os
+import shutil
+import io
+from unittest import mock
+from contextlib import redirect_stdout
+from src.utils.mapping_archive import Archive_Reader
+from mapp_controller import Mapp_Controler
+from src.cgra.mapping_generator_CGRA import Mapping_generator_CGRA
+from src.utils.Mapping import Mapping
+from src.utils.generation_stats import Generation_Stats
+from src.cgra.alpha_tuner import Alpha_Tuner
+from src.utils.graph_dedup import Graph_Deduplicator
+from networkx.algorithms.isomorphism import DiGraphMatcher
+import networkx as nx
+
+class TestMappController(unittest.TestCase):
+
+    """
+    Classe que contém testes unitarios para a geração paralela e particionada do Mapp_Controler.
+    """
+
+    def setUp(self):
+        """
+        Configuração das variaveis:
+
+            params (tuple): graph_range, tam_arch, alpha, alpha2, bits e k usados em todos os testes.
+            seed (int): semente fixa da execução.
+        """
+        self.params = ((2, 4), [(2, 2), (3, 3)], 0.8, 0.4, '1000', 6)
+        self.seed = 11
+
+    def summarize(self, results):
+        """
+        Reduz cada resultado a (índice, arquitetura, placement, arestas) para comparação.
+        """
+        return [
+            (index, arch, dict(mapping.placement), sorted(mapping.routing))
+            for index, mapping, arch, _ in results
+        ]
+
+    def test_same_output_for_any_worker_count(self):
+        """
+        Testa se a mesma semente gera a mesma saída com 1 e com 2 workers.
+        """
+        sequential = self.summarize(Mapping_generator_CGRA.iter_mappings(*self.params, workers=1, seed=self.seed))
+        parallel = self.summarize(Mapping_generator_CGRA.iter_mappings(*self.params, workers=2, seed=self.seed))
+        self.assertEqual(len(sequential), 6)
+        self.assertEqual(sequential, parallel)
+
+    def test_shards_union_equals_single_run(self):
+        """
+        Testa se a união das partes i/N é igual à execução única com a mesma semente.
+        """
+        single = self.summarize(Mapping_generator_CGRA.iter_mappings(*self.params, seed=self.seed))
+        shards = []
+        for shard_index in range(3):
+            shards += self.summarize(Mapping_generator_CGRA.iter_mappings(*self.params, seed=self.seed, shard=(shard_index, 3)))
+        self.assertEqual(sorted(shards, key=lambda item: item[0]), single)
+
+    def test_dedup_yields_distinct_graphs(self):
+        """
+        Testa se, com dedup, os k DFGs entregues são dois a dois não isomorfos, a saída é a mesma
+        para 1 e 2 workers e as duplicatas aparecem na telemetria.
+        """
+        graph_range, tam_arch, alpha, alpha2, bits, _ = self.params
+        results = []
+        for workers in [1, 2]:
+            stats = Generation_Stats()
+            results.append(list(Mapping_generator_CGRA.iter_mappings(graph_range, tam_arch, alpha, alpha2, bits, 8, self.seed, workers,
+                                                                     stats=stats, dedup=Graph_Deduplicator())))
+        self.assertEqual(self.summarize(results[0]), self.summarize(results[1]))
+        self.assertEqual([index for index, _, _, _ in results[0]], list(range(8)))
+        self.assertGreater(sum(row["duplicate"] for row in stats.rows()), 0)
+        self.assertEqual(sum(row["accepted"] for row in stats.rows()), 8)
+
+        graphs = []
+        for _, mapping, _, num_vertices in results[0]:
+            graph = nx.DiGraph([(source, target) for source, targets in mapping.dfg_edges.items() for target in targets])
+            graph.add_nodes_from(range(num_vertices))
+            self.assertFalse(any(DiGraphMatcher(existing, graph).is_isomorphic() for existing in graphs))
+            graphs.append(graph)
+
+    def test_canonical_form_is_isomorphism_invariant(self):
+        """
+        Testa se DFGs com os nós renumerados são reconhecidos como duplicatas, se DFGs não isomorfos
+        não são, e se os buckets guardam só as arestas, sem grafos do networkx.
+        """
+        rng = random.Random(3)
+        for _ in range(300):
+            num_vertices = rng.randint(2, 7)
+            edges = {(s, t) for s in range(num_vertices) for t in range(num_vertices) if s != t and rng.random() < 0.3}
+            permutation = rng.sample(range(num_vertices), num_vertices)
+            dedup = Graph_Deduplicator()
+            first = Mapping(num_vertices)
+            first.dfg_edges = {s: [t for u, t in edges if u == s] for s in range(num_vertices)}
+            second = Mapping(num_vertices)
+            second.dfg_edges = {permutation[s]: [permutation[t] for u, t in edges if u == s] for s in range(num_vertices)}
+            self.assertTrue(dedup.add(first))
+            self.assertFalse(dedup.add(second))
+
+            other = Mapping(num_vertices)
+            other.dfg_edges = {s: [t for u, t in edges if u == s and rng.random() < 0.7] for s in range(num_vertices)}
+            graphs = [nx.DiGraph([(s, t) for s, ts in m.dfg_edges.items() for t in ts]) for m in (first, other)]
+            for graph in graphs:
+                graph.add_nodes_from(range(num_vertices))
+            self.assertEqual(dedup.add(other), not DiGraphMatcher(graphs[0], graphs[1]).is_isomorphic())
+            for bucket in dedup.buckets.values():
+                self.assertTrue(all(isinstance(edges, tuple) for edges, _ in bucket))
+
+    def test_unbounded_stream(self):
+        """
+        Testa se, sem k, a geração é preguiçosa e segue a mesma sequência da execução com k.
+        """
+        stream = Mapping_generator_CGRA.iter_mappings(*self.params[:5], seed=self.seed, workers=2, prefetch=2)
+        first = [next(stream) for _ in range(3)]
+        stream.close()
+        expected = self.summarize(Mapping_generator_CGRA.iter_mappings(*self.params, seed=self.seed))[:3]
+        self.assertEqual(self.summarize(first), expected)
+
+    def test_stats_merged_from_workers(self):
+        """
+        Testa se a telemetria dos workers é acumulada e conta as mesmas tentativas da execução sequencial.
+        """
+        counts = []
+        for workers in [1, 2]:
+            stats = Generation_Stats()
+            list(Mapping_generator_CGRA.iter_mappings(*self.params, workers=workers, seed=self.seed, stats=stats))
+            counts.append({key: dict(value) for key, value in stats.counts.items()})
+        self.assertEqual(sum(row["accepted"] for row in stats.rows()), 6)
+        self.assertEqual(counts[0], counts[1])
+
+    def test_autotune_cache_is_reused(self):
+        """
+        Testa se o Alpha_Tuner salva os valores ajustados e se outra execução os reaproveita sem novo ajuste.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = os.path.join(directory, "alpha_cache.json")
+            table = Alpha_Tuner(cache_path, pilot_time=0.001).build_table((2, 3), [(2, 2)], '1000', 0.8, 0.4)
+            self.assertEqual(set(table), {(2, (2, 2)), (3, (2, 2))})
+
+            tuner = Alpha_Tuner(cache_path, pilot_time=0.001)
+            tuner.tune = None
+            self.assertEqual(tuner.build_table((2, 3), [(2, 2)], '1000', 0.8, 0.4), table)
+
+            results = list(Mapping_generator_CGRA.iter_mappings((2, 3), [(2, 2)], 0.8, 0.4, '1000', 3, seed=self.seed, alpha_table=table))
+            self.assertEqual(len(results), 3)
+
+    def test_autotune_key_depends_on_generator_options(self):
+        """
+        Testa se as opções do gerador que mudam a taxa de aceitação entram na chave do cache do
+        autotune (sem mudar a chave das execuções sem elas) e se o piloto com --batch passa pelo
+        placement em lote.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = os.path.join(directory, "alpha_cache.json")
+            keys = {Alpha_Tuner(cache_path, generator_options=options).key(4, (3, 3), 1, '1000')
+                    for options in [None, {'early_abort': False, 'batch_size': 0}, {'max_hops': 3}, {'balance': True},
+                                    {'early_abort': True}, {'batch_size': 64}, {'physical_routing': True}]}
+            self.assertEqual(len(keys), 6)
+            self.assertIn("4|3x3|1|1000|rejection", keys)
+
+            tuner = Alpha_Tuner(cache_path, pilot_time=0.001, generator_options={'batch_size': 64})
+            with mock.patch.object(Mapping_generator_CGRA, "mapp_batched", autospec=True, side_effect=Mapping_generator_CGRA.mapp_batched) as batched:
+                self.assertGreaterEqual(tuner.pilot(4, (3, 3), 1, '1000', 0.8, 0.4), 0)
+            self.assertGreater(batched.call_count, 0)
+
+    def test_sharded_autotune_requires_cache(self):
+        """
+        Testa se, com --shard, o autotune não ajusta configurações fora do cache (o ajuste depende
+        do tempo de relógio e cada máquina teria a sua tabela) e usa o cache comum quando completo.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = os.path.join(directory, "alpha_cache.json")
+            with self.assertRaises(ValueError):
+                Alpha_Tuner(cache_path, pilot_time=0.001).build_table((2, 3), [(2, 2)], '1000', 0.8, 0.4, allow_tuning=False)
+            self.assertFalse(os.path.exists(cache_path))
+
+            table = Alpha_Tuner(cache_path, pilot_time=0.001).build_table((2, 3), [(2, 2)], '1000', 0.8, 0.4)
+            tuner = Alpha_Tuner(cache_path, pilot_time=0.001)
+            tuner.tune = None
+            self.assertEqual(tuner.build_table((2, 3), [(2, 2)], '1000', 0.8, 0.4, allow_tuning=False), table)
+            with self.assertRaises(ValueError):
+                tuner.build_table((2, 4), [(2, 2)], '1000', 0.8, 0.4, allow_tuning=False)
+
+            cwd = os.getcwd()
+            os.chdir(directory)
+            try:
+                with self.assertRaises(ValueError):
+                    Mapp_Controler.mapping(2, (2, 4), [(2, 2)], 0.8, 0.4, '1000', "0", seed=self.seed, shard=(0, 2), render="none",
+                                           autotune=(cache_path, 0.001))
+                self.assertFalse(os.path.exists("mappings"))
+            finally:
+                os.chdir(cwd)
+
+    def test_physical_routes_only_saved_in_jsonl(self):
+        """
+        Testa se as rotas físicas são salvas na saída jsonl e se as saídas que não as guardam
+        (dir, tar e npy) avisam que elas são descartadas.
+        """
+        options = {'physical_routing': True}
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as directory:
+            os.chdir(directory)
+            try:
+                for output in ["jsonl", "tar", "npy", "dir"]:
+                    stdout = io.StringIO()
+                    with redirect_stdout(stdout):
+                        Mapp_Controler.mapping(2, (3, 4), [(3, 3)], 0.8, 0.4, '1000', "0", seed=self.seed, render="none",
+                                               output=output, generator_options=options)
+                    self.assertEqual("rotas físicas" in stdout.getvalue(), output != "jsonl", output)
+                    if output == "jsonl":
+                        reader = Archive_Reader("mappings")
+                        for name in reader.names():
+                            mapping = reader.to_mapping(name)
+                            self.assertEqual(set(mapping.physical_routes), set(mapping.routing))
+                    shutil.rmtree("mappings")
+            finally:
+                os.chdir(cwd)
+
+    def test_batched_placement(self):
+        """
+        Testa se a geração com placement em lote é reproduzível e igual para 1 e 2 workers.
+        """
+        options = {'batch_size': 64}
+        sequential = self.summarize(Mapping_generator_CGRA.iter_mappings(*self.params, seed=self.seed, generator_options=options))
+        parallel = self.summarize(Mapping_generator_CGRA.iter_mappings(*self.params, workers=2, seed=self.seed, generator_options=options))
+        self.assertEqual(len(sequential), 6)
+        self.assertEqual(sequential, parallel)
+
+    def test_parse_shard(self):
+        """
+        Testa a conversão do argumento --shard.
+        """
+        self.assertEqual(Mapp_Controler.parse_shard("1/4"), (1, 4))
+        with self.assertRaises(Exception):
+            Mapp_Controler.parse_shard("4/4")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import unittest
+import tempfile
+import tarfile
+import gzip
+import glob
+import json
+import os
+import random
+import numpy as np
+from src.cgra.mapping_generator_CGRA import Mapping_generator_CGRA
+from src.utils.Graph_Visualizer import Graph_Visualizer
+from src.utils.mapping_archive import Archive_Writer, Archive_Reader
+from src.utils.numpy_dataset import Numpy_Dataset_Writer, Numpy_Dataset
+
+class TestMappingArchive(unittest.TestCase):
+
+    """
+    Classe que contém testes unitarios para a saída em shards (Archive_Writer e Archive_Reader) e
+    para o dataset NumPy (Numpy_Dataset_Writer e Numpy_Dataset).
+    """
+
+    def setUp(self):
+        """
+        Configuração das variaveis:
+
+            mappings (list): (nome, mapeamento) gerados com semente fixa.
+            max_shard_bytes (int): tamanho pequeno, para que a escrita abra vários shards.
+        """
+        self.mappings = [
+            (f"{row}x{col}/{num_vertices}/graph_{index}", mapping)
+            for index, mapping, (row, col), num_vertices in Mapping_generator_CGRA.iter_mappings((3, 8), [(3, 3), (4, 4)], 0.8, 0.4, '1000', 30, seed=7)
+        ]
+        self.max_shard_bytes = 1500
+
+    def write(self, directory, format, compress):
+        with Archive_Writer(directory, format, compress, self.max_shard_bytes) as writer:
+            for name, mapping in self.mappings:
+                writer.write(name, mapping, {"num_edges": len(mapping.routing)})
+
+    def assertSameMapping(self, mapping, expected):
+        self.assertEqual(mapping.placement, expected.placement)
+        self.assertEqual({node: list(targets) for node, targets in mapping.dfg_edges.items()},
+                         {node: list(targets) for node, targets in expected.dfg_edges.items()})
+        self.assertEqual(mapping.routing, expected.routing)
+        self.assertEqual(len(mapping.dfg_vertices), len(expected.dfg_vertices))
+
+    def test_round_trip(self):
+        """
+        Testa, para jsonl e tar, com e sem compressão, se os shards são trocados ao atingir o
+        tamanho máximo, se os shards são arquivos válidos do formato e se cada mapeamento é lido de
+        volta pelo nome (to_mapping, read_dot e extract_to_dot).
+        """
+        for format in ["jsonl", "tar"]:
+            for compress in [False, True]:
+                with self.subTest(format=format, compress=compress), tempfile.TemporaryDirectory() as directory:
+                    self.write(directory, format, compress)
+
+                    extension = "tar" if format == "tar" else "jsonl.gz" if compress else "jsonl"
+                    shards = sorted(glob.glob(os.path.join(directory, f"*.{extension}")))
+                    self.assertGreater(len(shards), 1)
+                    self.assertEqual(len(glob.glob(os.path.join(directory, "*.idx"))), len(shards))
+                    for shard in shards[:-1]:
+                        self.assertGreaterEqual(os.path.getsize(shard), self.max_shard_bytes)
+
+                    if format == "tar":
+                        members = [member for shard in shards for member in tarfile.open(shard).getnames()]
+                        self.assertEqual(members, [name + (".dot.gz" if compress else ".dot") for name, _ in self.mappings])
+                    else:
+                        opener = gzip.open if compress else open
+                        records = [json.loads(line) for shard in shards for line in opener(shard, "rt", encoding="utf-8")]
+                        self.assertEqual([record["name"] for record in records], [name for name, _ in self.mappings])
+
+                    reader = Archive_Reader(directory)
+                    self.assertEqual(reader.names(), [name for name, _ in self.mappings])
+                    for name, mapping in self.mappings:
+                        self.assertEqual(reader.read_dot(name), Graph_Visualizer.to_dot(mapping))
+                        if format == "tar":
+                            with self.assertRaises(ValueError):
+                                reader.to_mapping(name)
+                        else:
+                            self.assertSameMapping(reader.to_mapping(name), mapping)
+
+                    name, mapping = self.mappings[-1]
+                    filename = os.path.join(directory, "extracted.dot")
+                    reader.extract_to_dot(name, filename)
+                    with open(filename, encoding="utf-8") as f:
+                        self.assertEqual(f.read(), Graph_Visualizer.to_dot(mapping))
+
+    def test_index_offsets(self):
+        """
+        Testa se cada linha do .idx aponta, com um único seek, para os bytes do registro.
+        """
+        for format in ["jsonl", "tar"]:
+            for compress in [False, True]:
+                with self.subTest(format=format, compress=compress), tempfile.TemporaryDirectory() as directory:
+                    self.write(directory, format, compress)
+                    expected = dict(self.mappings)
+                    for index_path in glob.glob(os.path.join(directory, "*.idx")):
+                        shard = next(path for path in glob.glob(os.path.splitext(index_path)[0] + ".*") if not path.endswith(".idx"))
+                        with open(index_path, encoding="utf-8") as index, open(shard, "rb") as f:
+                            for line in index:
+                                name, offset, size = line.rstrip("\n").split("\t")
+                                f.seek(int(offset))
+                                data = f.read(int(size))
+                                if compress:
+                                    data = gzip.decompress(data)
+                                if format == "tar":
+                                    self.assertEqual(data.decode("utf-8"), Graph_Visualizer.to_dot(expected[name]))
+                                else:
+                                    self.assertSameMapping(Archive_Writer.from_record(json.loads(data)), expected[name])
+
+    def test_writer_continues_shard_numbering(self):
+        """
+        Testa se um novo Archive_Writer no mesmo diretório continua a numeração dos shards.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            self.write(directory, "jsonl", False)
+            first = len(glob.glob(os.path.join(directory, "*.idx")))
+            with Archive_Writer(directory, "jsonl", False, self.max_shard_bytes) as writer:
+                writer.write("extra", self.mappings[0][1])
+            self.assertEqual(len(glob.glob(os.path.join(directory, "*.idx"))), first + 1)
+            self.assertEqual(len(Archive_Reader(directory)), len(self.mappings) + 1)
+
+    def test_numpy_dataset_round_trip(self):
+        """
+        Testa se o dataset NumPy é gravado em vários shards, lido de volta por mmap com os
+        offsets de nós e arestas de cada grafo, e se to_mapping reconstrói os mapeamentos,
+        inclusive os nós de roteamento sem placement inseridos pelo balanceamento.
+        """
+        rng = random.Random(2)
+        balanced = [Mapping_generator_CGRA(10, 1, 0.8, 0.4, (4, 4), '1000', rng, balance=True).mapp() for _ in range(20)]
+        balanced = [mapping for mapping in balanced if len(mapping.dfg_vertices) > len(mapping.placement)]
+        self.assertTrue(balanced)
+        mappings = [(mapping, (3, 3) if index % 2 else (4, 4)) for index, (_, mapping) in enumerate(self.mappings)]
+        mappings += [(mapping, (4, 4)) for mapping in balanced]
+
+        with tempfile.TemporaryDirectory() as directory:
+            with Numpy_Dataset_Writer(directory, 2000) as writer:
+                for index, (mapping, cgra_dim) in enumerate(mappings):
+                    writer.write(mapping, cgra_dim, index)
+
+            dataset = Numpy_Dataset(directory)
+            self.assertGreater(len(dataset.shards), 1)
+            self.assertEqual(len(dataset), len(mappings))
+            for index, (mapping, cgra_dim) in enumerate(mappings):
+                edge_index, placement = dataset[index]
+                self.assertIsInstance(edge_index.base if edge_index.base is not None else edge_index, np.memmap)
+                self.assertEqual(placement.shape, (len(mapping.dfg_vertices), 3))
+                self.assertEqual(sorted(map(tuple, edge_index.T.tolist())), sorted(mapping.routing))
+                for node in mapping.dfg_vertices:
+                    self.assertEqual(tuple(placement[node].tolist()), mapping.placement.get(node, (-1, -1, -1)))
+                self.assertEqual(dataset.cgra_dim(index), cgra_dim)
+
+                restored = dataset.to_mapping(index)
+                self.assertEqual(restored.placement, mapping.placement)
+                self.assertEqual(len(restored.dfg_vertices), len(mapping.dfg_vertices))
+                self.assertEqual({node: sorted(targets) for node, targets in restored.dfg_edges.items() if targets},
+                                 {node: sorted(targets) for node, targets in mapping.dfg_edges.items() if targets})
+                self.assertEqual(set(restored.routing), set(mapping.routing))
+            self.assertEqual([int(i) for shard in dataset.shards for i in shard["index"]], list(range(len(mappings))))
+            with self.assertRaises(IndexError):
+                dataset[len(mappings)]
+
+if __name__ == "__main__":
+    unittest.main()
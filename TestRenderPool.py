@@ -0,0 +1,258 @@
+import unittest
+import tempfile
+import sys
+import os
+from unittest import mock
+from mapp_controller import Mapp_Controler
+from src.utils.render_pool import Render_Pool
+from src.utils.Graph_Visualizer import Graph_Visualizer
+
+# Substituto do executável dot do Graphviz: escreve como "imagem" o conteúdo do DOT, registra cada
+# chamada em dot.log e falha (sem interromper os outros arquivos) nos DOTs que contêm FAIL.
+DOT_STUB = '''#!{python}
+import sys
+with open(sys.argv[0] + ".log", "a") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+args = sys.argv[1:]
+if "-o" in args:
+    outputs = [(args[-3], args[args.index("-o") + 1])]
+else:
+    outputs = [(arg, arg + ".png") for arg in args if not arg.startswith("-")]
+status = 0
+for dot_file, png_file in outputs:
+    content = open(dot_file, "rb").read()
+    if b"FAIL" in content:
+        sys.stderr.write("Error: " + dot_file + "\\n")
+        status = 1
+        continue
+    with open(png_file, "wb") as f:
+        f.write(b"PNG" + content)
+sys.exit(status)
+'''
+
+class TestRenderPool(unittest.TestCase):
+
+    """
+    Classe que contém testes unitarios para a renderização das imagens, com um dot substituto no PATH.
+    """
+
+    def setUp(self):
+        """
+        Configuração das variaveis:
+
+            directory (str): diretório temporário, que também é o diretório de trabalho do teste.
+            log (str): arquivo com uma linha por chamada ao dot.
+        """
+        self.temporary = tempfile.TemporaryDirectory()
+        self.directory = self.temporary.name
+        bin_dir = os.path.join(self.directory, "bin")
+        os.makedirs(bin_dir)
+        dot = os.path.join(bin_dir, "dot")
+        with open(dot, "w") as f:
+            f.write(DOT_STUB.format(python=sys.executable))
+        os.chmod(dot, 0o755)
+        self.log = dot + ".log"
+        self.path = os.environ["PATH"]
+        os.environ["PATH"] = bin_dir + os.pathsep + self.path
+        self.cwd = os.getcwd()
+        os.chdir(self.directory)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        os.environ["PATH"] = self.path
+        self.temporary.cleanup()
+
+    def write_dots(self, contents, folder="graphs"):
+        """
+        Escreve um arquivo DOT por conteúdo e devolve os caminhos.
+        """
+        os.makedirs(folder, exist_ok=True)
+        paths = []
+        for index, content in enumerate(contents):
+            path = os.path.join(folder, f"graph_{index}.dot")
+            with open(path, "w") as f:
+                f.write(content)
+            paths.append(path)
+        return paths
+
+    def dot_calls(self):
+        if not os.path.exists(self.log):
+            return []
+        with open(self.log) as f:
+            return f.read().splitlines()
+
+    def rendered_files(self):
+        """
+        Arquivos passados ao dot em cada chamada.
+        """
+        return [[arg for arg in call.split() if not arg.startswith("-")] for call in self.dot_calls()]
+
+    def assertImages(self, paths):
+        for path in paths:
+            with open(os.path.splitext(path)[0] + ".png", "rb") as f, open(path, "rb") as dot:
+                self.assertEqual(f.read(), b"PNG" + dot.read())
+
+    def test_pool_renders_submitted_files(self):
+        """
+        Testa se close() espera a renderização de todos os arquivos enviados com submit(), também
+        quando o pool é usado como gerenciador de contexto.
+        """
+        paths = self.write_dots([f"strict digraph {{\n    {i};\n}}\n" for i in range(20)])
+        pool = Render_Pool(2)
+        for path in paths[:10]:
+            pool.submit(path)
+        pool.close()
+        with Render_Pool(3, max_pending=2) as pool:
+            for path in paths[10:]:
+                pool.submit(path)
+        self.assertImages(paths)
+        self.assertTrue(all(not thread.is_alive() for thread in pool.threads))
+
+    def test_render_batch_renders_each_content_once(self):
+        """
+        Testa se render_batch renderiza em uma única chamada ao dot um arquivo por conteúdo e se os
+        arquivos de mesmo conteúdo recebem a mesma imagem do cache por hard link.
+        """
+        contents = ["strict digraph {\n    0;\n}\n", "strict digraph {\n    1;\n}\n"]
+        paths = self.write_dots([contents[0], contents[1], contents[0], contents[0]])
+        self.assertEqual(Graph_Visualizer.render_batch(paths, "cache"), 2)
+        self.assertEqual(self.rendered_files(), [[paths[0], paths[1]]])
+        self.assertImages(paths)
+        self.assertEqual(len(os.listdir("cache")), 2)
+        self.assertTrue(os.path.samefile("graphs/graph_0.png", "graphs/graph_2.png"))
+        self.assertTrue(os.path.samefile("graphs/graph_0.png", "graphs/graph_3.png"))
+        self.assertEqual(Graph_Visualizer.find_pending_images("graphs"), [])
+
+    def test_cache_hit_is_linked_without_render(self):
+        """
+        Testa se um conteúdo já presente no cache não é renderizado de novo: a imagem é ligada por
+        hard link ou, se o link falhar, copiada, e fica mais nova que o DOT.
+        """
+        content = "strict digraph {\n    0 -> 1;\n}\n"
+        first = self.write_dots([content], "first")
+        self.assertEqual(Graph_Visualizer.render_batch(first, "cache"), 1)
+
+        linked = self.write_dots([content], "linked")
+        self.assertEqual(Graph_Visualizer.render_batch(linked, "cache"), 0)
+        copied = self.write_dots([content], "copied")
+        with mock.patch("src.utils.Graph_Visualizer.os.link", side_effect=OSError):
+            self.assertEqual(Graph_Visualizer.render_batch(copied, "cache"), 0)
+
+        self.assertEqual(len(self.dot_calls()), 1)
+        self.assertImages(first + linked + copied)
+        self.assertTrue(os.path.samefile("first/graph_0.png", "linked/graph_0.png"))
+        self.assertFalse(os.path.samefile("first/graph_0.png", "copied/graph_0.png"))
+        for folder in ["first", "linked", "copied"]:
+            self.assertEqual(Graph_Visualizer.find_pending_images(folder), [])
+
+    def test_failing_file_does_not_break_batch(self):
+        """
+        Testa se um arquivo que o dot não consegue renderizar não impede as imagens dos outros
+        arquivos do lote, não entra no cache e continua pendente.
+        """
+        paths = self.write_dots(["strict digraph {\n    0;\n}\n", "strict digraph {\n    FAIL;\n}\n", "strict digraph {\n    2;\n}\n"])
+        for cache_dir in ["cache", None]:
+            with self.subTest(cache_dir=cache_dir):
+                for path in paths:
+                    if os.path.exists(os.path.splitext(path)[0] + ".png"):
+                        os.remove(os.path.splitext(path)[0] + ".png")
+                self.assertEqual(Graph_Visualizer.render_batch(paths, cache_dir), 2)
+                self.assertImages([paths[0], paths[2]])
+                self.assertFalse(os.path.exists("graphs/graph_1.png"))
+                self.assertEqual(Graph_Visualizer.find_pending_images("graphs"), [paths[1]])
+        self.assertEqual(len(os.listdir("cache")), 2)
+
+    def test_unreadable_files_do_not_break_batch(self):
+        """
+        Testa se render_batch pula um DOT que não pode ser lido ou uma imagem que não pode ser
+        salva, e renderiza os outros arquivos do lote.
+        """
+        paths = self.write_dots([f"strict digraph {{\n    {i};\n}}\n" for i in range(3)])
+        os.makedirs("graphs/graph_2.png")
+        self.assertEqual(Graph_Visualizer.render_batch(["graphs/missing.dot"] + paths, "cache"), 3)
+        self.assertImages(paths[:2])
+        self.assertTrue(os.path.isdir("graphs/graph_2.png"))
+        self.assertFalse(os.path.exists("graphs/graph_2.png.tmp"))
+
+    def test_pool_survives_render_errors(self):
+        """
+        Testa se uma exceção na renderização de um lote não encerra a thread: com a fila pequena,
+        uma thread encerrada faria submit() e close() bloquearem para sempre.
+        """
+        paths = self.write_dots([f"strict digraph {{\n    {i};\n}}\n" for i in range(3)])
+        pool = Render_Pool(1, max_pending=2)
+        for path in ["missing.dot"] + paths:
+            pool.submit(path)
+        pool.close()
+        self.assertImages(paths)
+
+        render_batch = Graph_Visualizer.render_batch
+        failures = iter([RuntimeError("falha")])
+        def failing_once(batch, cache_dir=None):
+            for error in failures:
+                raise error
+            return render_batch(batch, cache_dir)
+        for path in paths:
+            os.remove(os.path.splitext(path)[0] + ".png")
+        with mock.patch.object(Graph_Visualizer, "render_batch", side_effect=failing_once), Render_Pool(1, max_pending=1, batch_size=1) as pool:
+            for path in paths:
+                pool.submit(path)
+        self.assertEqual(Graph_Visualizer.find_pending_images("graphs"), [paths[0]])
+        self.assertImages(paths[1:])
+
+    def test_pool_renders_in_batches(self):
+        """
+        Testa se as threads do Render_Pool agrupam os arquivos enfileirados em lotes de até
+        batch_size, se cada conteúdo é renderizado uma só vez e se um arquivo com erro não impede
+        os demais.
+        """
+        contents = [f"strict digraph {{\n    {i % 7};\n}}\n" for i in range(40)] + ["strict digraph {\n    FAIL;\n}\n"]
+        paths = self.write_dots(contents)
+        render_batch = mock.patch.object(Graph_Visualizer, "render_batch", wraps=Graph_Visualizer.render_batch)
+        with render_batch as batches, Render_Pool(1, batch_size=8, cache_dir="cache") as pool:
+            for path in paths:
+                pool.submit(path)
+
+        sizes = [len(call.args[0]) for call in batches.call_args_list]
+        self.assertEqual(sum(sizes), len(paths))
+        self.assertTrue(all(size <= 8 for size in sizes))
+        self.assertLess(len(sizes), len(paths))
+        self.assertEqual(len([file for files in self.rendered_files() for file in files]), 8)
+        self.assertEqual(len(os.listdir("cache")), 7)
+        self.assertImages(paths[:-1])
+        self.assertEqual(Graph_Visualizer.find_pending_images("graphs"), [paths[-1]])
+
+    def test_render_tree_only_renders_pending(self):
+        """
+        Testa se render_tree renderiza só os DOTs sem imagem atualizada.
+        """
+        paths = self.write_dots([f"strict digraph {{\n    {i};\n}}\n" for i in range(6)])
+        self.assertEqual(Render_Pool.render_tree("graphs", 2), 6)
+        self.assertImages(paths)
+        self.assertEqual(Render_Pool.render_tree("graphs", 2), 0)
+        self.assertEqual(Graph_Visualizer.find_pending_images("graphs"), [])
+
+    def test_render_tree_counts_only_generated_images(self):
+        """
+        Testa se render_tree não conta como geradas as imagens que falharam, nem todas quando o
+        Graphviz não está instalado.
+        """
+        paths = self.write_dots(["strict digraph {\n    0;\n}\n", "strict digraph {\n    FAIL;\n}\n", "strict digraph {\n    2;\n}\n"])
+        self.assertEqual(Render_Pool.render_tree("graphs", 2), 2)
+        self.assertEqual(Graph_Visualizer.find_pending_images("graphs"), [paths[1]])
+
+        os.environ["PATH"] = os.path.join(self.directory, "empty")
+        self.write_dots(["strict digraph {\n    3;\n}\n"], "other")
+        self.assertEqual(Render_Pool.render_tree("other", 2), 0)
+
+    def test_mapping_renders_by_default(self):
+        """
+        Testa se Mapp_Controler.mapping, sem o parâmetro render, gera as imagens como a linha de comando.
+        """
+        Mapp_Controler.mapping(4, (2, 4), [(2, 2)], 0.8, 0.4, '1000', "0", seed=3)
+        dots = [os.path.join(root, file) for root, _, files in os.walk("mappings") for file in files if file.endswith(".dot")]
+        self.assertEqual(len(dots), 4)
+        self.assertImages(dots)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+import unittest
+import random
+import numpy as np
+from math import ceil
+from src.utils.Mapping import Mapping
+from src.cgra.placement_cgra import Placement_CGRA
+from src.cgra.interconnection import Interconnection
+from src.cgra.routing_cgra import Routing_CGRA
+from src.cgra.constructive_routing_cgra import Constructive_Routing_CGRA
+from src.cgra.batch_placement_cgra import Batch_Placement_CGRA
+from src.cgra.mapping_generator_CGRA import Mapping_generator_CGRA
+from src.utils.graph_processing import Graph_Processing
+from src.utils.generation_stats import Generation_Stats
+
+class TestRoutingCGRA(unittest.TestCase):
+
+    """
+    Classe que contém testes unitarios para o routing com interrupção antecipada e o routing construtivo.
+    """
+
+    def route_pair(self, seed):
+        """
+        Faz o mesmo routing (mesmo placement e mesma sequência aleatória) com e sem early_abort.
+
+        Returns:
+            tuple: (Routing_CGRA com early_abort, Mapping roteado sem early_abort, dfg_tam).
+        """
+        rng = random.Random(seed)
+        dfg_tam = rng.randint(2, 9)
+        cgra_dim = rng.choice([(2, 2), (2, 3), (3, 3), (4, 4)])
+        II = ceil(dfg_tam / (cgra_dim[0] * cgra_dim[1])) + rng.randint(0, 1)
+        bits = rng.choice(['1000', '1100', '1010', '1001', '1111'])
+        alpha, alpha2 = rng.random(), rng.random()
+
+        mapping = Mapping(dfg_tam)
+        Placement_CGRA(mapping, cgra_dim, dfg_tam, II, rng)
+        interconnection = Interconnection(cgra_dim, bits, mapping, II)
+        state = rng.getstate()
+
+        results = []
+        for early_abort in [True, False]:
+            routed = Mapping(dfg_tam)
+            routed.placement = dict(mapping.placement)
+            routing_rng = random.Random()
+            routing_rng.setstate(state)
+            results.append((Routing_CGRA(routed, dfg_tam, alpha, alpha2, interconnection, routing_rng, early_abort), routed))
+        return results[0][0], results[1][1], dfg_tam
+
+    def test_early_abort_matches_validation(self):
+        """
+        Testa se o routing só é interrompido quando o DFG completo seria inválido, e se um
+        routing que chega ao fim sem interrupção sempre gera um DFG válido.
+        """
+        for seed in range(3000):
+            routing, full_mapping, dfg_tam = self.route_pair(seed)
+            valid = Graph_Processing(full_mapping, dfg_tam).is_valid()
+            self.assertEqual(routing.reject_cause is None, valid, f"seed {seed}: {routing.reject_cause}")
+
+    def test_neighbor_table_matches_interconnections(self):
+        """
+        Testa se os vizinhos obtidos pela tabela da arquitetura são os mesmos, e na mesma ordem,
+        que os calculados por get_interconnections para as posições do placement.
+        """
+        for seed in range(200):
+            rng = random.Random(seed)
+            cgra_dim = rng.choice([(2, 2), (3, 4), (4, 4)])
+            II = rng.randint(1, 3)
+            dfg_tam = rng.randint(2, cgra_dim[0] * cgra_dim[1] * II)
+            mapping = Mapping(dfg_tam)
+            Placement_CGRA(mapping, cgra_dim, dfg_tam, II, rng)
+            interconnection = Interconnection(cgra_dim, rng.choice(['1000', '0110', '1111', '1001']), mapping, II)
+
+            position_to_node = {pos: node for node, pos in mapping.placement.items()}
+            expected = {
+                node: [position_to_node[pos] for pos in positions if pos in position_to_node]
+                for node, positions in interconnection.neighbor_dict.items()
+            }
+            self.assertEqual(interconnection.successors(), expected)
+
+    def test_batch_adjacency_matches_interconnection(self):
+        """
+        Testa se as arestas possíveis calculadas em lote são as mesmas do Interconnection, e se o
+        filtro de candidatos promissores só descarta placements em que o routing é sempre desconexo.
+        """
+        for cgra_dim, II, dfg_tam, bits in [((3, 3), 1, 5, '1000'), ((4, 4), 2, 12, '1100'), ((2, 3), 2, 11, '1001')]:
+            batch = Batch_Placement_CGRA(cgra_dim, II, bits, dfg_tam, np.random.default_rng(0))
+            slots = batch.sample_slots(200)
+            adjacency = batch.adjacency(slots)
+            promising = batch.promising(adjacency)
+            for row in range(len(slots)):
+                mapping = batch.to_mapping(slots[row])
+                interconnection = Interconnection(cgra_dim, bits, mapping, II)
+                successors = interconnection.successors()
+                self.assertEqual(len(set(slots[row].tolist())), dfg_tam)
+                self.assertEqual({node: [v for v in adjacency[row, node].tolist() if v >= 0] for node in range(dfg_tam)}, successors)
+                if not promising[row]:
+                    for seed in range(20):
+                        Routing_CGRA(mapping, dfg_tam, 0.8, 0.4, interconnection, random.Random(seed))
+                        self.assertFalse(Graph_Processing(mapping, dfg_tam).is_valid())
+
+    def test_routing_path_matches_recursive_search(self):
+        """
+        Testa se get_routing_path, iterativo e limitado pelos níveis, devolve os mesmos caminhos
+        que a busca recursiva por caminhos simples em DAGs aleatórios (balanceados ou não).
+        """
+        def recursive_path(dfg_edges, current, path, dst):
+            if current == dst:
+                return path
+            for next_node in dfg_edges.get(current, []):
+                if next_node not in path:
+                    result = recursive_path(dfg_edges, next_node, path + [next_node], dst)
+                    if result:
+                        return result
+            return None
+
+        for seed in range(300):
+            rng = random.Random(seed)
+            dfg_tam = rng.randint(2, 14)
+            mapping = Mapping(dfg_tam)
+            mapping.dfg_edges = {node: [] for node in range(dfg_tam)}
+            for source in range(dfg_tam):
+                for target in rng.sample(range(source + 1, dfg_tam), min(dfg_tam - source - 1, rng.randint(0, 4))):
+                    mapping.dfg_edges[source].append(target)
+            mapping.dfg_edges = {node: mapping.dfg_edges[node] for node in rng.sample(range(dfg_tam), dfg_tam)}
+
+            Routing_CGRA.get_routing_path(mapping)
+            for (source, target), path in mapping.routing.items():
+                self.assertEqual(path, recursive_path(mapping.dfg_edges, source, [source], target))
+
+    def test_constructive_mode_never_rejects_in_validation(self):
+        """
+        Testa se o modo construtivo, em vários tamanhos de DFG e arquiteturas, só rejeita placements
+        em que algum nó não é alcançável pelas interconexões: todo routing concluído passa na
+        validação, nenhuma tentativa é rejeitada como cíclica ou desbalanceada, e a mesma semente
+        gera a mesma saída.
+        """
+        params = ((2, 12), [(2, 2), (3, 3), (4, 4), (2, 5)], 0.8, 0.4)
+        options = {'mode': 'constructive'}
+        for bits in ['1000', '1100', '1111']:
+            results = []
+            for _ in range(2):
+                stats = Generation_Stats()
+                results.append([(index, arch, dict(mapping.placement), sorted(mapping.routing))
+                                for index, mapping, arch, _ in Mapping_generator_CGRA.iter_mappings(*params, bits, 30, seed=4,
+                                                                                                    generator_options=options, stats=stats)])
+                for row in stats.rows():
+                    self.assertEqual((row["cyclic"], row["unbalanced"], row["routing_path"]), (0, 0, 0), (bits, row))
+            self.assertEqual(len(results[0]), 30)
+            self.assertEqual(results[0], results[1])
+
+        for seed in range(500):
+            rng = random.Random(seed)
+            cgra_dim = rng.choice([(2, 2), (3, 3), (4, 4), (2, 5)])
+            II = rng.randint(1, 2)
+            dfg_tam = rng.randint(2, cgra_dim[0] * cgra_dim[1] * II)
+            mapping = Mapping(dfg_tam)
+            Placement_CGRA(mapping, cgra_dim, dfg_tam, II, rng)
+            interconnection = Interconnection(cgra_dim, rng.choice(['1000', '1100', '1111']), mapping, II)
+            routing = Constructive_Routing_CGRA(mapping, dfg_tam, rng.random(), rng.random(), interconnection, rng)
+            if routing.reject_cause is None:
+                self.assertIsNone(Graph_Processing(mapping, dfg_tam).validate(), f"seed {seed}")
+
+    def test_physical_routes_are_valid(self):
+        """
+        Testa se as rotas do MRRG ligam os slots dos nós da aresta por saltos da tabela de vizinhos,
+        têm no máximo max_hops saltos e não compartilham slots de passagem entre redes diferentes.
+        """
+        cgra_dim, dfg_tam, bits = (4, 4), 8, '1000'
+        table = Interconnection.get_neighbor_table(cgra_dim, 1, (1, 0, 0, 0))
+        for max_hops in [1, 3]:
+            rng = random.Random(max_hops)
+            for _ in range(5):
+                mapping = Mapping_generator_CGRA(dfg_tam, 1, 0.8, 0.4, cgra_dim, bits, rng, physical_routing=True, max_hops=max_hops).mapp()
+                owners = {}
+                self.assertEqual(set(mapping.physical_routes), set(mapping.routing))
+                for (source, target), route in mapping.physical_routes.items():
+                    self.assertEqual((route[0], route[-1]), (mapping.placement[source], mapping.placement[target]))
+                    self.assertLessEqual(len(route) - 1, max_hops)
+                    slots = [Interconnection.slot_index(position, cgra_dim, 1) for position in route]
+                    for slot, next_slot in zip(slots, slots[1:]):
+                        self.assertIn(next_slot, table[slot])
+                    for slot in slots[1:-1]:
+                        self.assertEqual(owners.setdefault(slot, source), source)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,18 @@
 from src.cgra.mapping_generator_CGRA import Mapping_generator_CGRA
+from src.cgra.alpha_tuner import Alpha_Tuner
 from src.qca.mapping_generator_QCA import Mapping_generator_QCA
 from src.utils.Graph_Visualizer import Graph_Visualizer
-from math import ceil
+from src.utils.render_pool import Render_Pool
+from src.utils.mapping_archive import Archive_Writer
+from src.utils.numpy_dataset import Numpy_Dataset_Writer
+from src.utils.generation_stats import Generation_Stats
+from src.utils.graph_dedup import Graph_Deduplicator
 import argparse
-import random
 import os
 
+# Cache de imagens por conteúdo DOT, dentro da pasta de saída (ver Graph_Visualizer.render_batch).
+RENDER_CACHE = ".render_cache"
+
 class Mapp_Controler:
    #0 cgra, 1 qca
    @staticmethod
@@ -18,49 +25,146 @@ class Mapp_Controler:
       parser.add_argument('--alpha2', type=float, default=0.4, help='Valor de alpha2.')
       parser.add_argument('--bits', type=str, default='1000', help='Bits de interconexão (ex: 1100).')
       parser.add_argument('--tec', type=str, default='0', choices=['0', '1'], help='Tecnologia: 0 = CGRA, 1 = QCA.')
+      parser.add_argument('--workers', type=int, default=1, help='Número de processos de geração (0 = todos os núcleos).')
+      parser.add_argument('--seed', type=int, default=None, help='Semente da execução. A saída é a mesma para qualquer número de workers.')
+      parser.add_argument('--render', type=str, default='async', choices=['sync', 'async', 'deferred', 'none'],
+                          help='Geração das imagens PNG: sync = no laço de geração, async = pool em segundo plano, deferred = uma passada ao final, none = sem imagens.')
+      parser.add_argument('--render_workers', type=int, default=None, help='Número de threads de renderização (padrão: número de núcleos).')
+      parser.add_argument('--output', type=str, default='dir', choices=['dir', 'jsonl', 'tar', 'npy'],
+                          help='Formato de saída: dir = um arquivo DOT por mapeamento, jsonl/tar = shards com índice em mappings/, npy = dataset NumPy em mappings/.')
+      parser.add_argument('--compress', action='store_true', help='Comprime os registros dos shards jsonl/tar com gzip.')
+      parser.add_argument('--shard_size', type=int, default=64, help='Tamanho máximo de cada shard jsonl/tar/npy, em MB.')
+      parser.add_argument('--early_abort', action='store_true', help='Interrompe no routing as tentativas que não podem mais gerar um DFG válido.')
+      parser.add_argument('--mode', type=str, default='rejection', choices=['rejection', 'constructive'],
+                          help='rejection = sorteia arestas e descarta DFGs inválidos, constructive = constrói DFGs balanceados diretamente.')
+      parser.add_argument('--shard', type=Mapp_Controler.parse_shard, default=(0, 1), help='Parte i/N da execução gerada por esta máquina (ex: 0/4). Exige --seed.')
+      parser.add_argument('--stats', type=str, default=None,
+                          help='Salva as causas de rejeição e o tempo de cada etapa por configuração (arquivo .json ou .csv).')
+      parser.add_argument('--batch', type=int, default=0,
+                          help='Sorteia os placements em lotes desse tamanho com NumPy e só roteia os candidatos promissores (0 = desligado).')
+      parser.add_argument('--physical_routing', action='store_true',
+                          help='Roteia as arestas de cada DFG no MRRG; as rotas físicas só são salvas com --output jsonl.')
+      parser.add_argument('--max_hops', type=int, default=1,
+                          help='Distância máxima, em saltos pelo MRRG, entre os nós de uma aresta (>1 ativa --physical_routing).')
+      parser.add_argument('--balance', action='store_true',
+                          help='Balanceia em memória os DFGs desbalanceados, inserindo nós de roteamento, em vez de descartá-los. Não pode ser usado com --early_abort.')
+      parser.add_argument('--dedup', action='store_true',
+                          help='Descarta durante a geração os DFGs isomorfos a um DFG já gerado; --k passa a contar DFGs distintos.')
+      parser.add_argument('--autotune', action='store_true',
+                          help='Ajusta alpha e alpha2 de cada configuração para maximizar os mapeamentos aceitos por segundo.')
+      parser.add_argument('--autotune_cache', type=str, default='alpha_cache.json', help='Arquivo com os valores ajustados pelo --autotune. Com --shard, precisa já conter todas as configurações.')
+      parser.add_argument('--autotune_time', type=float, default=0.05, help='Duração, em segundos, de cada lote piloto do --autotune.')
     
       args = parser.parse_args()
+
+      if args.shard[1] > 1 and args.seed is None:
+         parser.error("--shard exige --seed para que as partes sejam disjuntas.")
+      if args.balance and args.early_abort:
+         parser.error("--balance não pode ser usado com --early_abort, que descarta os DFGs desbalanceados durante o routing.")
       
       tam_arch = [(args.tam_arch[i], args.tam_arch[i+1]) for i in range(0, len(args.tam_arch), 2)]
       
-      Mapp_Controler.mapping(args.k, tuple(args.graph_range), tam_arch, args.alpha, args.alpha2, args.bits, args.tec)
+      Mapp_Controler.mapping(args.k, tuple(args.graph_range), tam_arch, args.alpha, args.alpha2, args.bits, args.tec,
+                             workers=args.workers, seed=args.seed, shard=args.shard,
+                             render=args.render, render_workers=args.render_workers,
+                             output=args.output, compress=args.compress, shard_size=args.shard_size,
+                             generator_options={'early_abort': args.early_abort, 'mode': args.mode, 'batch_size': args.batch,
+                                                'physical_routing': args.physical_routing, 'max_hops': args.max_hops,
+                                                'balance': args.balance},
+                             stats_path=args.stats, dedup=args.dedup,
+                             autotune=(args.autotune_cache, args.autotune_time) if args.autotune else None)
 
    @staticmethod
-   def mapping(k, graph_range, tam_arch,alpha, alpha2, bits, tecnology):
+   def parse_shard(value):
+      """
+        Converte o argumento --shard no formato i/N em uma tupla (i, N).
+      """
+      try:
+         shard_index, shard_count = (int(x) for x in value.split("/"))
+      except ValueError:
+         raise argparse.ArgumentTypeError(f"Shard inválido: {value}. Use o formato i/N.")
+      if shard_count < 1 or not 0 <= shard_index < shard_count:
+         raise argparse.ArgumentTypeError(f"Shard inválido: {value}. É preciso 0 <= i < N.")
+      return shard_index, shard_count
+
+   @staticmethod
+   def mapping(k, graph_range, tam_arch,alpha, alpha2, bits, tecnology, workers=1, seed=None, shard=(0, 1),
+               render="async", render_workers=None, output="dir", compress=False, shard_size=64, generator_options=None,
+               stats_path=None, autotune=None, dedup=False):
       if tecnology == "0":
-         initial , final = graph_range
-         num_graphs = 0
-         
-         while num_graphs < k:
-            num_vertices = random.randint(initial, final)
-            
-            row , col = random.choice(tam_arch)
-            II = ceil(num_vertices/(row * col))
-
-            if row * col < num_vertices:
-               print(f"[AVISO] Arquitetura {row}x{col} não suporta {num_vertices} vértices. Pulando.")
-               continue
-            mapping_generator = Mapping_generator_CGRA(num_vertices, II, alpha, alpha2, (row,col), bits)
-                        
-            try:
-                  mapping = mapping_generator.mapp()
-            except ValueError as e:
-                  continue
-
-            num_edges = sum(len([v for v in targets if v in mapping.dfg_vertices]) for targets in mapping.dfg_edges.values())
-
-            directory = f"mappings/{row}x{col}/{num_vertices}/{num_edges}"
-            os.makedirs(directory, exist_ok=True)
-            path = f"{directory}/graph_{num_vertices}_{num_edges}.dot"
-            
-            Graph_Visualizer.export_to_dot(mapping, path)
-            print(f"Mapa {num_graphs+1}/{k} salvo em {path}")
-            Graph_Visualizer.generate_image_from_dot(path)
-            num_graphs += 1
+         options = generator_options or {}
+         if (options.get("physical_routing") or options.get("max_hops", 1) > 1) and output != "jsonl":
+            print(f"[AVISO] A saída {output} não guarda as rotas físicas (só o DFG); use --output jsonl para salvá-las.")
+
+         alpha_table = None
+         if autotune is not None:
+            # Partes de uma execução só geram a mesma saída da execução única com um cache comum.
+            cache_path, pilot_time = autotune
+            alpha_table = Alpha_Tuner(cache_path, pilot_time, generator_options).build_table(graph_range, tam_arch, bits, alpha, alpha2,
+                                                                                             allow_tuning=shard[1] == 1)
+
+         archive = None
+         if output != "dir":
+            if render != "none":
+               print("[AVISO] Imagens não são geradas com saída em shards; extraia o mapeamento com Archive_Reader.extract_to_dot ou Numpy_Dataset.to_mapping.")
+               render = "none"
+            shard_index, shard_count = shard
+            prefix = f"mappings_{shard_index}of{shard_count}_" if shard_count > 1 else "mappings_"
+            if output == "npy":
+               archive = Numpy_Dataset_Writer("mappings", shard_size * 1024 * 1024, prefix)
+            else:
+               archive = Archive_Writer("mappings", output, compress, shard_size * 1024 * 1024, prefix)
+
+         render_cache = os.path.join("mappings", RENDER_CACHE)
+         render_pool = Render_Pool(render_workers, cache_dir=render_cache) if render == "async" else None
+         stats = Generation_Stats() if stats_path else None
+         try:
+            Mapp_Controler.mapping_cgra(k, graph_range, tam_arch, alpha, alpha2, bits, workers, seed, shard, render, render_pool, archive,
+                                        generator_options, stats, alpha_table, Graph_Deduplicator() if dedup else None, render_cache)
+         finally:
+            if stats is not None:
+               stats.dump(stats_path)
+            if render_pool is not None:
+               render_pool.close()
+            if archive is not None:
+               archive.close()
+
+         if render == "deferred":
+            Render_Pool.render_tree("mappings", render_workers, render_cache)
             
       if tecnology == "1":
          pass
 
+   @staticmethod
+   def mapping_cgra(k, graph_range, tam_arch, alpha, alpha2, bits, workers, seed, shard, render, render_pool, archive=None, generator_options=None,
+                    stats=None, alpha_table=None, dedup=None, render_cache=None):
+      for index, mapping, (row, col), num_vertices in Mapping_generator_CGRA.iter_mappings(graph_range, tam_arch, alpha, alpha2, bits, k, seed, workers,
+                                                                                            shard=shard, generator_options=generator_options, stats=stats,
+                                                                                            alpha_table=alpha_table, dedup=dedup):
+         num_edges = sum(len([v for v in targets if v in mapping.dfg_vertices]) for targets in mapping.dfg_edges.values())
+
+         if isinstance(archive, Numpy_Dataset_Writer):
+            archive.write(mapping, (row, col), index)
+            print(f"Mapa {index+1}/{k} salvo no dataset NumPy")
+            continue
+
+         if archive is not None:
+            name = f"{row}x{col}/{num_vertices}/{num_edges}/graph_{num_vertices}_{num_edges}_{index}"
+            archive.write(name, mapping, {"index": index, "cgra_dim": [row, col], "num_edges": num_edges})
+            print(f"Mapa {index+1}/{k} salvo em {name}")
+            continue
+
+         directory = f"mappings/{row}x{col}/{num_vertices}/{num_edges}"
+         os.makedirs(directory, exist_ok=True)
+         path = f"{directory}/graph_{num_vertices}_{num_edges}_{index}.dot"
+         
+         Graph_Visualizer.export_to_dot(mapping, path)
+         print(f"Mapa {index+1}/{k} salvo em {path}")
+         if render == "sync":
+            Graph_Visualizer.render_batch([path], render_cache)
+         elif render == "async":
+            render_pool.submit(path)
+
 if __name__ == "__main__":
    Mapp_Controler.get_parameters()
 
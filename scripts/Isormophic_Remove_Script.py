@@ -1,15 +1,28 @@
 import os
+import argparse
+import hashlib
+import json
+import sqlite3
+import warnings
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import networkx as nx
-from networkx.algorithms.isomorphism import GraphMatcher
+from networkx.algorithms.isomorphism import DiGraphMatcher
+from src.utils.dot_reader import Dot_Reader
+
+INDEX_NAME = ".isomorphism_index.sqlite"
+# Versão do cálculo dos fingerprints; deve ser incrementada sempre que graph_invariants mudar.
+INDEX_SCHEME = 1
 
 def load_graph_from_dot(file_path):
     """
-        Carrega um grafo a partir de um arquivo .dot .
+        Carrega um grafo a partir de um arquivo .dot, com o leitor rápido do formato do gerador
+        (Dot_Reader) e o pydot para os demais arquivos.
 
         file_path: Caminho para o arquivo .dot.
     """
     try:
-        return nx.drawing.nx_pydot.read_dot(file_path)
+        return Dot_Reader.read_graph(file_path)
     except Exception as e:
         print(f"Erro ao carregar {file_path}: {e}")
         return None
@@ -29,76 +42,254 @@ def find_dot_files(folder_path):
                 dot_files.append(os.path.join(root, file))
     return dot_files
 
-def remove_isomorphic_graphs_in_folder(folder_path):
+def graph_invariants(graph):
     """
-        Remove grafos isomorfos dentro de uma pasta, incluindo subdiretórios.
-    
-        folder_path: Caminho para a pasta raiz da busca.
+        Calcula invariantes baratos do grafo: grafos isomorfos têm sempre os mesmos invariantes,
+        então só grafos com invariantes iguais precisam ser comparados com o DiGraphMatcher.
+
+        graph: Grafo direcionado.
+
+        Retorna uma tupla com o número de nós e de arestas, as sequências ordenadas de graus de
+        entrada e de saída, o perfil de níveis (nós por nível, ou None se houver ciclo) e o hash
+        Weisfeiler-Lehman do grafo.
+    """
+    in_degrees = tuple(sorted(d for _, d in graph.in_degree()))
+    out_degrees = tuple(sorted(d for _, d in graph.out_degree()))
+
+    levels = {}
+    try:
+        for node in nx.topological_sort(graph):
+            levels[node] = max((levels[p] + 1 for p in graph.predecessors(node)), default=0)
+        profile = [0] * (max(levels.values(), default=-1) + 1)
+        for level in levels.values():
+            profile[level] += 1
+        profile = tuple(profile)
+    except nx.NetworkXUnfeasible:
+        profile = None
+
+    with warnings.catch_warnings():
+        # O networkx >= 3.5 avisa que os hashes mudaram em relação às versões anteriores. Como eles
+        # entram nos fingerprints do índice persistente, o índice guarda a versão do networkx e é
+        # refeito por update_index quando ela muda (ver index_version).
+        warnings.simplefilter("ignore", UserWarning)
+        wl_hash = nx.weisfeiler_lehman_graph_hash(graph)
+    return (graph.number_of_nodes(), graph.number_of_edges(), in_degrees, out_degrees, profile, wl_hash)
+
+def load_with_invariants(file_path):
+    """
+        Carrega um grafo .dot e calcula seus invariantes. Executada nos processos do pool.
+
+        file_path: Caminho para o arquivo .dot.
+
+        Retorna (file_path, invariantes, grafo), ou None se o arquivo não puder ser carregado.
+    """
+    graph = load_graph_from_dot(file_path)
+    if graph is None:
+        return None
+    graph = nx.DiGraph(graph)
+    return file_path, graph_invariants(graph), graph
+
+def parallel_iter(function, items, workers):
+    """
+        Aplica function a cada item, em um pool de processos se workers > 1, entregando os
+        resultados sob demanda e na ordem de items.
+    """
+    if workers <= 1:
+        yield from map(function, items)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(function, items, chunksize=max(1, len(items) // (workers * 16)))
+
+def parallel_map(function, items, workers):
+    """
+        Aplica function a cada item, em um pool de processos se workers > 1, preservando a ordem.
+    """
+    return list(parallel_iter(function, items, workers))
+
+def bucket_graphs(graph_files, workers):
+    """
+        Carrega os grafos e os agrupa por invariantes.
+
+        graph_files: Lista de caminhos dos arquivos .dot.
+        workers: Número de processos.
+
+        Retorna um dicionário invariantes -> lista de (caminho, grafo), na ordem de graph_files.
+    """
+    buckets = defaultdict(list)
+    for result in parallel_map(load_with_invariants, graph_files, workers):
+        if result is not None:
+            file_path, key, graph = result
+            buckets[key].append((file_path, graph))
+    return buckets
+
+def duplicates_in_bucket(bucket):
+    """
+        Compara os grafos de um mesmo bucket e mantém o primeiro de cada classe de isomorfismo.
+
+        bucket: Lista de (caminho, grafo).
+
+        Retorna a lista de caminhos dos grafos isomorfos a um grafo anterior do bucket.
+    """
+    kept = []
+    duplicates = []
+    for file_path, graph in bucket:
+        if any(DiGraphMatcher(existing, graph).is_isomorphic() for existing in kept):
+            duplicates.append(file_path)
+        else:
+            kept.append(graph)
+    return duplicates
+
+def fingerprint(invariants):
+    """
+        Resume os invariantes de graph_invariants em um hash hexadecimal, usado como chave do índice.
     """
-    graph_files = find_dot_files(folder_path) 
-    graphs = []
-    graphs_to_remove = set()
-
-    for file_path in graph_files:
-        graph = load_graph_from_dot(file_path)
-        if graph is None:
-            continue
-        
-        is_isomorphic = False
-        for existing_graph in graphs:
-            if GraphMatcher(existing_graph, graph).is_isomorphic():
-                is_isomorphic = True
-                graphs_to_remove.add(file_path)
-                break
-        
-        if not is_isomorphic:
-            graphs.append(graph)
-    
-    for file in graphs_to_remove:
+    return hashlib.sha1(repr(invariants).encode()).hexdigest()
+
+def graph_to_record(graph):
+    return json.dumps([list(graph.nodes), list(graph.edges)])
+
+def graph_from_record(record):
+    nodes, edges = json.loads(record)
+    graph = nx.DiGraph()
+    graph.add_nodes_from(nodes)
+    graph.add_edges_from(edges)
+    return graph
+
+def load_fingerprint(file_path):
+    """
+        Carrega um grafo .dot e calcula sua entrada no índice. Executada nos processos do pool.
+
+        Retorna (file_path, fingerprint, grafo serializado), com None nos dois últimos se o
+        arquivo não puder ser carregado.
+    """
+    result = load_with_invariants(file_path)
+    if result is None:
+        return file_path, None, None
+    _, key, graph = result
+    return file_path, fingerprint(key), graph_to_record(graph)
+
+def index_version():
+    """
+        Identifica o cálculo dos fingerprints: INDEX_SCHEME e a versão do networkx, cujo hash
+        Weisfeiler-Lehman faz parte dos invariantes e muda entre versões.
+    """
+    return f"{INDEX_SCHEME}:{nx.__version__}"
+
+def update_index(folder_path, index_path=None, workers=None):
+    """
+        Atualiza o índice persistente (SQLite) de fingerprints dos grafos de uma pasta. Só os
+        arquivos novos ou cujo mtime ou tamanho mudou desde a última atualização são lidos; os
+        arquivos removidos saem do índice. Se o índice foi criado com outra index_version, os
+        fingerprints antigos não são comparáveis aos novos e todos os arquivos são lidos de novo.
+
+        folder_path: Pasta indexada.
+        index_path: Arquivo do índice (padrão: INDEX_NAME dentro de folder_path).
+        workers: Número de processos (padrão: número de núcleos).
+
+        Retorna a conexão com o índice atualizado.
+    """
+    workers = workers or os.cpu_count() or 1
+    connection = sqlite3.connect(index_path or os.path.join(folder_path, INDEX_NAME))
+    connection.execute("CREATE TABLE IF NOT EXISTS graphs (path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, fingerprint TEXT, graph TEXT)")
+    connection.execute("CREATE INDEX IF NOT EXISTS graphs_fingerprint ON graphs (fingerprint)")
+    connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    version = connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    if version != (index_version(),):
+        if version is not None:
+            print(f"Índice de '{folder_path}' criado com a versão {version[0]} (atual: {index_version()}); refazendo o índice.")
+        connection.execute("DELETE FROM graphs")
+        connection.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (index_version(),))
+
+    indexed = {path: (mtime, size) for path, mtime, size in connection.execute("SELECT path, mtime, size FROM graphs")}
+    current = {}
+    for file_path in find_dot_files(folder_path):
+        stat = os.stat(file_path)
+        current[file_path] = (stat.st_mtime_ns, stat.st_size)
+
+    removed = [(path,) for path in indexed if path not in current]
+    stale = [path for path, signature in current.items() if indexed.get(path) != signature]
+
+    connection.executemany("DELETE FROM graphs WHERE path = ?", removed)
+    for file_path, key, record in parallel_iter(load_fingerprint, stale, workers):
+        connection.execute("INSERT OR REPLACE INTO graphs VALUES (?, ?, ?, ?, ?)", (file_path, *current[file_path], key, record))
+    connection.commit()
+
+    print(f"Índice de '{folder_path}': {len(stale)} arquivos lidos, {len(removed)} removidos, {len(current) - len(stale)} sem alteração.")
+    return connection
+
+def remove_files(files):
+    """
+        Remove os arquivos, em ordem alfabética.
+    """
+    for file in sorted(files):
         os.remove(file)
         print(f"Removido: {file}")
 
+def remove_isomorphic_graphs_in_folder(folder_path, workers=None):
+    """
+        Remove grafos isomorfos dentro de uma pasta, incluindo subdiretórios. De cada classe de
+        isomorfismo é mantido o primeiro arquivo encontrado.
+
+        Os grafos são agrupados por invariantes (graph_invariants) e só os grafos de um mesmo grupo
+        são comparados; a leitura dos arquivos e a comparação dos grupos são feitas em um pool de
+        processos.
+
+        folder_path: Caminho para a pasta raiz da busca.
+        workers: Número de processos (padrão: número de núcleos).
+    """
+    workers = workers or os.cpu_count() or 1
+    buckets = bucket_graphs(find_dot_files(folder_path), workers)
+
+    candidates = [bucket for bucket in buckets.values() if len(bucket) > 1]
+    graphs_to_remove = [file for duplicates in parallel_map(duplicates_in_bucket, candidates, workers) for file in duplicates]
+    remove_files(graphs_to_remove)
+
     print("Processo concluído. Grafos isomorfos removidos.")
 
-def remove_isomorphic_graphs_between_folders(dir1, dir2):
+def remove_isomorphic_graphs_between_folders(dir1, dir2, workers=None, index_path=None):
     """
         Verifica e remove grafos isomorfos do segundo diretório, se também existirem no primeiro diretório.
 
-        dir1: Diretório de referência (não sofre alterações).
+        Os grafos do primeiro diretório ficam em um índice persistente (update_index), atualizado
+        incrementalmente a cada execução. Os grafos do segundo diretório são lidos um a um e
+        comparados apenas com os grafos de referência de mesmo fingerprint, carregados do índice.
+
+        dir1: Diretório de referência (não sofre alterações, exceto pelo arquivo do índice).
         dir2: Diretório do qual os grafos isomorfos serão removidos.
+        workers: Número de processos (padrão: número de núcleos).
+        index_path: Arquivo do índice de dir1 (padrão: INDEX_NAME dentro de dir1).
     """
     print(f"Analisando grafos entre '{dir1}' e '{dir2}'...")
+    workers = workers or os.cpu_count() or 1
+    connection = update_index(dir1, index_path, workers)
 
-    graphs_dir1 = [load_graph_from_dot(file) for file in find_dot_files(dir1)]
-    files_dir2 = find_dot_files(dir2)
-
-    graphs_dir1 = [g for g in graphs_dir1 if g is not None]
-    graphs_to_remove = set()
-
-    for file_path in files_dir2:
-        graph = load_graph_from_dot(file_path)
-        if graph is None:
-            continue
-        
-        for existing_graph in graphs_dir1:
-            if GraphMatcher(existing_graph, graph).is_isomorphic():
-                graphs_to_remove.add(file_path)
-                break
-    
-    for file in graphs_to_remove:
-        os.remove(file)
-        print(f"Removido: {file}")
+    graphs_to_remove = []
+    try:
+        for file_path, key, record in parallel_iter(load_fingerprint, find_dot_files(dir2), workers):
+            if key is None:
+                continue
+            graph = graph_from_record(record)
+            for (reference,) in connection.execute("SELECT graph FROM graphs WHERE fingerprint = ?", (key,)):
+                if DiGraphMatcher(graph_from_record(reference), graph).is_isomorphic():
+                    graphs_to_remove.append(file_path)
+                    break
+    finally:
+        connection.close()
+    remove_files(graphs_to_remove)
 
     print(f"Processo concluído. Grafos isomorfos removidos de {dir2}")
 
 if __name__ == "__main__":
-    import sys
-    if len(sys.argv) == 2:
-        remove_isomorphic_graphs_in_folder(sys.argv[1])
-    elif len(sys.argv) == 3:
-        remove_isomorphic_graphs_between_folders(sys.argv[1], sys.argv[2])
+    parser = argparse.ArgumentParser(description="Remove grafos isomorfos de um diretório ou do segundo diretório em relação ao primeiro.",
+                                     usage="%(prog)s <diretorio> | <diretorio_1> <diretorio_2> [--index arquivo] [--workers N]")
+    parser.add_argument('dirs', nargs='+', help='Um diretório (remove isomorfos dentro dele) ou dois (remove do segundo os isomorfos ao primeiro).')
+    parser.add_argument('--workers', type=int, default=None, help='Número de processos (padrão: número de núcleos).')
+    parser.add_argument('--index', type=str, default=None, help=f'Índice do diretório de referência (padrão: <diretorio_1>/{INDEX_NAME}).')
+    args = parser.parse_args()
+    if len(args.dirs) == 1:
+        remove_isomorphic_graphs_in_folder(args.dirs[0], args.workers)
+    elif len(args.dirs) == 2:
+        remove_isomorphic_graphs_between_folders(args.dirs[0], args.dirs[1], args.workers, args.index)
     else:
-        print("Uso:")
-        print("  Para remover isomorfos dentro de um diretório: python script.py <diretorio>")
-        print("  Para remover isomorfos entre dois diretórios: python script.py <diretorio_1> <diretorio_2>")
-    
+        parser.error("Informe um ou dois diretórios.")
@@ -1,7 +1,12 @@
 import os
+import argparse
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
 import networkx as nx
 import pydot
 from networkx.drawing.nx_pydot import read_dot, to_pydot
+from src.utils.dot_reader import Dot_Reader
 
 def find_dot_files(folder_path):
     """
@@ -90,35 +95,137 @@ def save_graph_image(Graph, output_path):
     pydot_graph = to_pydot(Graph)
     pydot_graph.write_png(output_path)
 
-def Balancing(input_dir, output_dir):
+MANIFEST_NAME = ".balancing_manifest.json"
+
+def file_hash(path):
+    """
+        Retorna o hash sha1 do conteúdo de um arquivo.
+    """
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def is_up_to_date(input_path, output_path, img_output_path, images):
+    """
+        Args:
+            input_path: Caminho do .dot de origem.
+            output_path: Caminho do .dot balanceado.
+            img_output_path: Caminho da imagem do grafo balanceado.
+            images: Se as imagens também são geradas.
+        Returns:
+            True se as saídas existem e são mais novas que a origem.
+    """
+    try:
+        input_mtime = os.stat(input_path).st_mtime_ns
+        if os.stat(output_path).st_mtime_ns < input_mtime:
+            return False
+        return not images or os.stat(img_output_path).st_mtime_ns >= input_mtime
+    except FileNotFoundError:
+        return False
+
+def balance_file(task):
+    """
+        Balanceia um arquivo. Executada nos processos do pool.
+
+        Args:
+            task: Tupla (input_path, output_path, img_output_path, images).
+        Returns:
+            Tupla (nome do arquivo, erro ou None).
+    """
+    input_path, output_path, img_output_path, images = task
+    file = os.path.basename(input_path)
+    try:
+        Graph = Dot_Reader.read_graph(input_path)
+        balanced_Graph = balance_graph(Graph)
+
+        save_graph_dot(balanced_Graph, output_path)
+        if images:
+            save_graph_image(balanced_Graph, img_output_path)
+        return file, None
+    except Exception as e:
+        return file, str(e)
+
+def load_manifest(output_dir):
+    """
+        Returns:
+            O manifesto do diretório de destino: nome do arquivo -> hash da origem já balanceada.
+    """
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_manifest(output_dir, manifest):
+    """
+        Salva o manifesto no diretório de destino, substituindo o anterior de uma só vez.
+    """
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(path + ".tmp", path)
+
+def Balancing(input_dir, output_dir, workers=1, images=True, force=False):
     """
         Args:
             input_dir: Diretorio de origem, no qual esta os grafos que serão balanceados.
             output_dir: Diretorio de destino, no qual serão salvos os grafos balanceados.
+            workers: Número de processos (0 = todos os núcleos).
+            images: Se False, gera apenas os .dot balanceados, sem as imagens.
+            force: Se True, refaz todos os arquivos.
         Returns:
             Pega todos os grafos (.dot) do dir de origem, depois de balanceados, gera um .dot e uma imagem do grafo balanceado.
+
+        A execução é incremental: um arquivo é pulado se as saídas são mais novas que a origem ou se
+        o conteúdo da origem tem o mesmo hash registrado no manifesto (MANIFEST_NAME, no destino)
+        quando foi balanceado pela última vez.
     """
     os.makedirs(output_dir, exist_ok=True)
-    
-    graph_files = find_dot_files(input_dir)
-
-    for file_path, file in graph_files:
-            input_path = os.path.join(file_path)
-            output_path = os.path.join(output_dir, file)
-            img_output_path = os.path.join(output_dir, file.replace(".dot", ".png"))
-            
-            try:
-                Graph = nx.DiGraph(nx.nx_pydot.read_dot(input_path))
-                balanced_Graph = balance_graph(Graph)
-                
-                save_graph_dot(balanced_Graph, output_path)
-                save_graph_image(balanced_Graph, img_output_path)
-                
+    workers = workers or os.cpu_count() or 1
+    manifest = {} if force else load_manifest(output_dir)
+
+    tasks = []
+    hashes = {}
+    for file_path, file in find_dot_files(input_dir):
+        output_path = os.path.join(output_dir, file)
+        img_output_path = os.path.join(output_dir, file.replace(".dot", ".png"))
+        if not force and is_up_to_date(file_path, output_path, img_output_path, images):
+            continue
+        if not force and file in manifest and os.path.exists(output_path) and (not images or os.path.exists(img_output_path)):
+            hashes[file] = file_hash(file_path)
+            if manifest[file] == hashes[file]:
+                continue
+        tasks.append((file_path, output_path, img_output_path, images))
+
+    if workers <= 1:
+        results = map(balance_file, tasks)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(balance_file, tasks, chunksize=max(1, len(tasks) // (workers * 16)))
+
+    processed = 0
+    try:
+        for (file_path, _, _, _), (file, error) in zip(tasks, results):
+            if error is None:
+                manifest[file] = hashes.get(file) or file_hash(file_path)
+                processed += 1
                 print(f"Processado: {file}")
-            except Exception as e:
-                print(f"Erro ao processar {file}: {e}")
+            else:
+                manifest.pop(file, None)
+                print(f"Erro ao processar {file}: {error}")
+    finally:
+        if workers > 1:
+            executor.shutdown()
+        save_manifest(output_dir, manifest)
+
+    print(f"Balanceamento concluído: {processed} processados, {len(tasks) - processed} com erro.")
 
 
 if __name__ == "__main__":
-    import sys
-    Balancing(sys.argv[1], sys.argv[2])
+    parser = argparse.ArgumentParser(description="Balanceia os grafos .dot de um diretório.")
+    parser.add_argument('input_dir', help='Diretório de origem.')
+    parser.add_argument('output_dir', help='Diretório de destino.')
+    parser.add_argument('--workers', type=int, default=0, help='Número de processos (0 = todos os núcleos).')
+    parser.add_argument('--no-images', dest='images', action='store_false', help='Não gera as imagens PNG dos grafos balanceados.')
+    parser.add_argument('--force', action='store_true', help='Refaz todos os arquivos, mesmo os já balanceados.')
+    args = parser.parse_args()
+    Balancing(args.input_dir, args.output_dir, args.workers, args.images, args.force)
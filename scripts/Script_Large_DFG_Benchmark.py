@@ -0,0 +1,75 @@
+import argparse
+import random
+from collections import defaultdict
+from time import perf_counter
+from src.utils.Mapping import Mapping
+from src.utils.graph_processing import Graph_Processing
+from src.utils.graph_transformer import Graph_Transformer
+from src.cgra.routing_cgra import Routing_CGRA
+
+def large_dfg(num_vertices, width, rng):
+    """
+    Gera um DFG balanceado em camadas: uma raiz e camadas de até width nós, em que cada nó
+    recebe de 1 a 3 arestas de nós da camada anterior.
+
+    Args:
+        num_vertices (int): Número de nós do DFG.
+        width (int): Número máximo de nós por camada.
+        rng (random.Random): Gerador de números aleatórios.
+
+    Returns:
+        Mapping: Mapeamento com dfg_edges preenchido.
+    """
+    mapping = Mapping(num_vertices)
+    mapping.dfg_edges = defaultdict(list)
+    previous = [0]
+    mapping.dfg_edges[0]
+    node = 1
+    while node < num_vertices:
+        layer = list(range(node, min(node + width, num_vertices)))
+        for target in layer:
+            mapping.dfg_edges[target]
+            for source in rng.sample(previous, min(len(previous), rng.randint(1, 3))):
+                mapping.dfg_edges[source].append(target)
+        previous = layer
+        node += len(layer)
+    return mapping
+
+def benchmark(sizes, width, seed):
+    """
+    Mede o tempo de cada algoritmo em DFGs grandes e o tempo por nó + aresta, que deve ficar
+    aproximadamente constante se o algoritmo for O(V + E).
+
+    Args:
+        sizes (list): Números de nós dos DFGs.
+        width (int): Número máximo de nós por camada.
+        seed (int): Semente dos DFGs.
+    """
+    print(f"{'V':>7} {'E':>8} {'algoritmo':<28} {'tempo (ms)':>11} {'ns/(V+E)':>9}")
+    for num_vertices in sizes:
+        mapping = large_dfg(num_vertices, width, random.Random(seed))
+        num_edges = sum(len(targets) for targets in mapping.dfg_edges.values())
+        processing = Graph_Processing(mapping, num_vertices)
+
+        algorithms = [
+            ("is_connected", lambda: processing.is_connected(mapping)),
+            ("has_cycle", lambda: processing.has_cycle(mapping.dfg_edges)),
+            ("is_balanced", lambda: processing.is_balanced(mapping)),
+            ("kahn_sweep", lambda: processing.kahn_sweep()),
+            ("Graph_Transformer.is_connected", lambda: Graph_Transformer.is_connected(mapping.dfg_edges)),
+            ("get_routing_path", lambda: Routing_CGRA.get_routing_path(mapping)),
+        ]
+        for name, algorithm in algorithms:
+            mapping.routing = {}
+            start = perf_counter()
+            algorithm()
+            elapsed = perf_counter() - start
+            print(f"{num_vertices:>7} {num_edges:>8} {name:<28} {elapsed * 1e3:>11.2f} {elapsed * 1e9 / (num_vertices + num_edges):>9.0f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dos algoritmos de grafo em DFGs grandes.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 20000, 100000], help='Números de nós dos DFGs.')
+    parser.add_argument('--width', type=int, default=16, help='Número máximo de nós por camada.')
+    parser.add_argument('--seed', type=int, default=0, help='Semente dos DFGs.')
+    args = parser.parse_args()
+    benchmark(args.sizes, args.width, args.seed)
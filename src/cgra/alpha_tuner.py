@@ -0,0 +1,151 @@
+from src.cgra.mapping_generator_CGRA import Mapping_generator_CGRA
+from math import ceil
+from time import perf_counter
+import random
+import json
+import os
+
+class Alpha_Tuner:
+    """
+    Ajusta alpha e alpha2 de cada configuração para maximizar os mapeamentos aceitos por segundo.
+
+    Cada configuração (dfg_tam, cgra_dim, II, bits, mode e as opções de KEY_OPTIONS) é avaliada com
+    lotes piloto curtos de mapeamentos do Mapping_generator_CGRA: primeiro em uma grade grossa de
+    (alpha, alpha2) e depois nos vizinhos do melhor ponto com metade do passo. Os valores
+    encontrados são salvos em um arquivo JSON e reaproveitados nas execuções seguintes.
+
+    Atenção: alpha e alpha2 também mudam a distribuição dos DFGs gerados (número de arestas),
+    então o ajuste troca os valores escolhidos pelo usuário pelos mais rápidos de cada configuração.
+    """
+
+    GRID = [0.2, 0.4, 0.6, 0.8, 1.0]
+    GRID2 = [0.0, 0.2, 0.4, 0.6, 0.8]
+
+    def __init__(self, cache_path="alpha_cache.json", pilot_time=0.05, generator_options=None):
+        """
+        Args:
+            cache_path (str): Arquivo JSON com os valores já ajustados.
+            pilot_time (float): Tempo, em segundos, do lote piloto de cada par (alpha, alpha2).
+            generator_options (dict | None): Parâmetros opcionais repassados ao Mapping_generator_CGRA.
+        """
+        self.cache_path = cache_path
+        self.pilot_time = pilot_time
+        self.generator_options = generator_options or {}
+        self.mode = self.generator_options.get("mode", "rejection")
+        self.cache = {}
+
+        if os.path.exists(cache_path):
+            with open(cache_path, encoding="utf-8") as f:
+                self.cache = json.load(f)
+
+    # Opções do gerador que mudam a taxa de aceitação ou o custo de cada tentativa, com o valor padrão.
+    KEY_OPTIONS = {"early_abort": False, "batch_size": 0, "physical_routing": False, "max_hops": 1, "balance": False}
+
+    def key(self, dfg_tam, cgra_dim, II, bits):
+        """
+        Chave da configuração no cache. As opções de KEY_OPTIONS com valor diferente do padrão
+        entram na chave, então as chaves das execuções sem essas opções continuam as mesmas.
+        """
+        options = "".join(f"|{name}={self.generator_options[name]}" for name, default in Alpha_Tuner.KEY_OPTIONS.items()
+                          if self.generator_options.get(name, default) != default)
+        return f"{dfg_tam}|{cgra_dim[0]}x{cgra_dim[1]}|{II}|{bits}|{self.mode}{options}"
+
+    # Tentativas de cada chamada a mapp no lote piloto, para que um par ruim não ultrapasse muito pilot_time.
+    PILOT_ATTEMPTS = 64
+
+    def pilot(self, dfg_tam, cgra_dim, II, bits, alpha, alpha2):
+        """
+        Executa mapeamentos durante pilot_time segundos, por Mapping_generator_CGRA.mapp, o mesmo
+        caminho da execução (inclusive o placement em lote do mapp_batched).
+
+        Returns:
+            float: Mapeamentos aceitos por segundo.
+        """
+        rng = random.Random(f"{dfg_tam}:{cgra_dim}:{bits}:{alpha}:{alpha2}")
+        generator = Mapping_generator_CGRA(dfg_tam, II, alpha, alpha2, cgra_dim, bits, rng, **self.generator_options)
+        accepted = 0
+        start = perf_counter()
+        while perf_counter() - start < self.pilot_time:
+            try:
+                generator.mapp(Alpha_Tuner.PILOT_ATTEMPTS)
+                accepted += 1
+            except ValueError:
+                pass
+        return accepted / (perf_counter() - start)
+
+    def tune(self, dfg_tam, cgra_dim, II, bits, alpha, alpha2):
+        """
+        Busca o melhor (alpha, alpha2) de uma configuração. O par inicial é avaliado primeiro,
+        então ele é mantido se nenhum outro aceitar mapeamentos.
+
+        Returns:
+            tuple: (alpha, alpha2, mapeamentos aceitos por segundo).
+        """
+        rates = {}
+
+        def evaluate(candidates):
+            for candidate in candidates:
+                if candidate not in rates:
+                    rates[candidate] = self.pilot(dfg_tam, cgra_dim, II, bits, *candidate)
+
+        evaluate([(alpha, alpha2)] + [(a, a2) for a in Alpha_Tuner.GRID for a2 in Alpha_Tuner.GRID2])
+        best = max(rates, key=rates.get)
+
+        step = (Alpha_Tuner.GRID[1] - Alpha_Tuner.GRID[0]) / 2
+        evaluate([
+            (round(min(max(best[0] + da, 0.0), 1.0), 2), round(min(max(best[1] + da2, 0.0), 1.0), 2))
+            for da in (-step, 0, step) for da2 in (-step, 0, step)
+        ])
+        best = max(rates, key=rates.get)
+        return best[0], best[1], rates[best]
+
+    def get(self, dfg_tam, cgra_dim, II, bits, alpha, alpha2):
+        """
+        Retorna o (alpha, alpha2) ajustado da configuração, ajustando e salvando no cache se necessário.
+        """
+        key = self.key(dfg_tam, cgra_dim, II, bits)
+        if key not in self.cache:
+            tuned_alpha, tuned_alpha2, rate = self.tune(dfg_tam, cgra_dim, II, bits, alpha, alpha2)
+            self.cache[key] = {"alpha": tuned_alpha, "alpha2": tuned_alpha2, "rate": rate}
+            print(f"[AUTOTUNE] {key}: alpha={tuned_alpha} alpha2={tuned_alpha2} ({rate:.1f} mapeamentos/s)")
+            self.save()
+        return self.cache[key]["alpha"], self.cache[key]["alpha2"]
+
+    def build_table(self, graph_range, tam_arch, bits, alpha, alpha2, allow_tuning=True):
+        """
+        Ajusta todas as configurações que uma execução pode sortear.
+
+        Args:
+            allow_tuning (bool): Se False, todas as configurações precisam estar no cache. O ajuste
+                                 depende do tempo de relógio, então máquinas que geram partes
+                                 (--shard) de uma mesma execução só têm a mesma tabela, e a união
+                                 das partes só é igual à execução única, se usarem um cache comum.
+
+        Returns:
+            dict: {(num_vertices, (linhas, colunas)): (alpha, alpha2)}, no formato aceito por
+                  Mapping_generator_CGRA.iter_mappings(alpha_table=...).
+
+        Raises:
+            ValueError: Se allow_tuning for False e alguma configuração não estiver no cache.
+        """
+        configurations = [
+            (num_vertices, (row, col), ceil(num_vertices / (row * col)))
+            for num_vertices in range(graph_range[0], graph_range[1] + 1)
+            for row, col in tam_arch
+            if row * col >= num_vertices
+        ]
+        if not allow_tuning:
+            missing = [self.key(num_vertices, cgra_dim, II, bits) for num_vertices, cgra_dim, II in configurations
+                       if self.key(num_vertices, cgra_dim, II, bits) not in self.cache]
+            if missing:
+                raise ValueError(f"Configurações sem valores ajustados em {self.cache_path}: {', '.join(missing)}. "
+                                 "Execute o --autotune sem --shard e compartilhe o cache entre as partes.")
+
+        return {
+            (num_vertices, cgra_dim): self.get(num_vertices, cgra_dim, II, bits, alpha, alpha2)
+            for num_vertices, cgra_dim, II in configurations
+        }
+
+    def save(self):
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            json.dump(self.cache, f, indent=2, sort_keys=True)
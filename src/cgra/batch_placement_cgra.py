@@ -0,0 +1,125 @@
+from src.cgra.interconnection import Interconnection
+from src.utils.Mapping import Mapping
+from functools import lru_cache
+import numpy as np
+
+class Batch_Placement_CGRA:
+    """
+    Placement em lote: sorteia B placements de uma vez como um array (B, dfg_tam) de índices de
+    slot e calcula as arestas possíveis de todos eles com a tabela de vizinhos da arquitetura.
+
+    Só os candidatos que passam pelos filtros de promising seguem para o routing e a validação
+    em Python; os demais não podem gerar um DFG conexo com nenhuma sequência de sorteios do routing.
+    """
+
+    def __init__(self, cgra_dim, II, bits, dfg_tam, generator):
+        """
+        Args:
+            cgra_dim (tuple): Dimensões do CGRA (linhas, colunas).
+            II (int): Intervalo de inicialização.
+            bits (str): Bits de interconexão (ex: 1100).
+            dfg_tam (int): Número de nós no DFG.
+            generator (numpy.random.Generator): Gerador de números aleatórios do NumPy.
+        """
+        self.cgra_dim = cgra_dim
+        self.II = II
+        self.dfg_tam = dfg_tam
+        self.generator = generator
+        self.table = Batch_Placement_CGRA.get_padded_table(tuple(cgra_dim), II, tuple(Interconnection.get_bits(bits)))
+        self.total = len(self.table)
+
+        if self.total < dfg_tam:
+            raise ValueError("Capacidade insuficiente!!")
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def get_padded_table(cgra_dim, II, bits):
+        """
+        Converte a tabela de Interconnection.get_neighbor_table em um array (slots, D) completado com -1.
+        """
+        table = Interconnection.get_neighbor_table(cgra_dim, II, bits)
+        padded = np.full((len(table), max(len(neighbors) for neighbors in table)), -1, dtype=np.int64)
+        for slot, neighbors in enumerate(table):
+            padded[slot, :len(neighbors)] = neighbors
+        return padded
+
+    def sample_slots(self, batch_size):
+        """
+        Sorteia batch_size placements, cada um com dfg_tam slots distintos em ordem aleatória.
+
+        Quando colisões são raras (dfg_tam² <= 4 * slots), sorteia índices com repetição e
+        sorteia de novo só as linhas repetidas; senão ordena chaves aleatórias de todos os slots.
+
+        Returns:
+            numpy.ndarray: Array (batch_size, dfg_tam) com o slot de cada nó.
+        """
+        k, total = self.dfg_tam, self.total
+        if k * k > 4 * total:
+            return np.argsort(self.generator.random((batch_size, total)), axis=1)[:, :k]
+
+        slots = self.generator.integers(0, total, (batch_size, k))
+        while True:
+            ordered = np.sort(slots, axis=1)
+            repeated = (ordered[:, 1:] == ordered[:, :-1]).any(axis=1)
+            if not repeated.any():
+                return slots
+            slots[repeated] = self.generator.integers(0, total, (int(repeated.sum()), k))
+
+    def adjacency(self, slots):
+        """
+        Calcula as arestas possíveis de cada candidato com gathers na tabela de vizinhos.
+
+        Returns:
+            numpy.ndarray: Array (B, dfg_tam, D): para cada nó, os nós posicionados nos slots
+                           vizinhos (na ordem da tabela) ou -1.
+        """
+        batch_size, k = slots.shape
+        order = np.argsort(slots, axis=1)
+        offsets = np.arange(batch_size)[:, None] * self.total
+        keys = (np.take_along_axis(slots, order, axis=1) + offsets).ravel()
+
+        neighbors = self.table[slots]
+        query = neighbors + offsets[:, :, None]
+        position = np.minimum(np.searchsorted(keys, query), keys.size - 1)
+        found = (neighbors >= 0) & (keys[position] == query)
+        return np.where(found, order.ravel()[position], -1)
+
+    def promising(self, adjacency):
+        """
+        Filtra os candidatos que ainda podem gerar um DFG válido. Todo nó do DFG precisa ser
+        alcançável a partir da raiz pelas arestas possíveis, então são descartados os candidatos
+        com mais de um nó sem arestas de entrada ou cujo grafo de arestas possíveis é desconexo.
+
+        Returns:
+            numpy.ndarray: Array booleano (B,).
+        """
+        batch_size, k, _ = adjacency.shape
+        rows, sources, _ = np.nonzero(adjacency >= 0)
+        sources = rows * k + sources
+        targets = rows * k + adjacency[adjacency >= 0]
+
+        in_degree = np.bincount(targets, minlength=batch_size * k).reshape(batch_size, k)
+        single_source = (in_degree == 0).sum(axis=1) <= 1
+
+        labels = np.tile(np.arange(k), batch_size)
+        for _ in range(k):
+            smallest = np.minimum(labels[sources], labels[targets])
+            updated = labels.copy()
+            np.minimum.at(updated, sources, smallest)
+            np.minimum.at(updated, targets, smallest)
+            if np.array_equal(updated, labels):
+                break
+            labels = updated
+        connected = (labels.reshape(batch_size, k) == 0).all(axis=1)
+
+        return single_source & connected
+
+    def to_mapping(self, slots):
+        """
+        Cria o Mapping de um candidato a partir da sua linha (dfg_tam,) de slots.
+        """
+        pe, cycle = np.divmod(slots, self.II)
+        row, col = np.divmod(pe, self.cgra_dim[1])
+        mapping = Mapping(self.dfg_tam)
+        mapping.placement = {node: position for node, position in enumerate(zip(row.tolist(), col.tolist(), cycle.tolist()))}
+        return mapping
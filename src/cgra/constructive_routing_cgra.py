@@ -0,0 +1,86 @@
+from collections import defaultdict
+from src.utils.Mapping import Mapping
+from src.cgra.interconnection import Interconnection
+import random
+
+class Constructive_Routing_CGRA:
+    """
+    Routing construtivo: em vez de sortear arestas e descartar o DFG se ele não for válido,
+    constrói diretamente um DAG conexo e balanceado sobre os PEs já posicionados.
+
+    Todo DFG válido tem uma árvore geradora a partir da raiz em que a profundidade de cada nó
+    é o seu nível, e todas as suas arestas ligam o nível d ao nível d + 1. O routing sorteia
+    uma árvore dessas crescendo uma fronteira aleatória de interconexões e só acrescenta
+    arestas entre níveis consecutivos, então o resultado é sempre conexo, acíclico e
+    balanceado, e qualquer DFG válido pode ser gerado.
+    """
+
+    def __init__(self, mapping:Mapping, dfg_tam:int, alpha, alpha2, interconnection:Interconnection, rng=random) -> None:
+        """
+        Args:
+            mapping (Mapping): Objeto com o placement já feito.
+            dfg_tam (int): Número de nós no DFG.
+            alpha (float): Probabilidade de criar cada aresta adicional permitida.
+            alpha2 (float): Probabilidade de, ao criar uma aresta adicional para um nó, remover
+                            uma das outras arestas que chegam a ele.
+            interconnection (Interconnection): Interconexões do placement, com a tabela de vizinhos da arquitetura.
+            rng (random.Random): Gerador de números aleatórios.
+        """
+        self.dfg_tam = dfg_tam
+        self.alpha = alpha
+        self.alpha2 = alpha2
+        self.mapping = mapping
+        self.interconnection = interconnection
+        self.rng = rng
+        self.reject_cause = None
+        self.get_routing()
+
+    def get_routing(self):
+        """
+        Constrói as arestas do DFG. Se algum nó não for alcançável a partir da raiz pelas
+        interconexões, nenhum DFG válido existe para este placement e reject_cause recebe
+        'disconnected'.
+        """
+        self.mapping.dfg_edges = defaultdict(list)
+        self.mapping.routing = {}
+        self.reject_cause = None
+
+        successors = self.interconnection.successors()
+
+        root = self.rng.randint(0, self.dfg_tam - 1)
+        depth = {root: 0}
+        order = [root]
+        preds = defaultdict(list)
+        frontier = [(root, target) for target in successors[root]]
+
+        while frontier:
+            position = self.rng.randrange(len(frontier))
+            frontier[position], frontier[-1] = frontier[-1], frontier[position]
+            source, target = frontier.pop()
+            if target in depth:
+                continue
+            depth[target] = depth[source] + 1
+            order.append(target)
+            self.mapping.dfg_edges[source].append(target)
+            preds[target].append(source)
+            frontier.extend((target, neighbor) for neighbor in successors[target] if neighbor not in depth)
+
+        if len(depth) < self.dfg_tam:
+            self.reject_cause = "disconnected"
+            return
+
+        for source in order:
+            for target in successors[source]:
+                if depth[target] != depth[source] + 1 or target in self.mapping.dfg_edges[source]:
+                    continue
+                if self.rng.random() < self.alpha:
+                    self.mapping.dfg_edges[source].append(target)
+                    if self.rng.random() < self.alpha2:
+                        removed = self.rng.choice(preds[target])
+                        preds[target].remove(removed)
+                        self.mapping.dfg_edges[removed].remove(target)
+                    preds[target].append(source)
+
+        # Folhas também viram chaves, como acontece no Routing_CGRA durante a validação.
+        for node in order:
+            self.mapping.dfg_edges.setdefault(node, [])
@@ -1,4 +1,5 @@
 from src.utils.Mapping import Mapping
+from functools import lru_cache
 
 """
 Para verificar e mudar, terminar de fazer as interconexões, e nao esquecer de verificar se para cada no, nao a vizinhos iguais entre as interconexões, por exemplo pegar um vizinho mesh que seja o mesmo diagonal, verificação para ignorar se for igual
@@ -7,12 +8,111 @@ Verificar tambem o que pode ser geral e o que pode ser modulado para tornar o co
 """
 
 class Interconnection:
-    def __init__(self, cgra_dim,interconnection:str, mapping:Mapping, II) -> None:
+    def __init__(self, cgra_dim,interconnection:str, mapping:Mapping, II, cached=True, max_hops=1) -> None:
+        """
+        Com cached=True, os vizinhos vêm da tabela da arquitetura (get_neighbor_table), calculada
+        uma única vez por (cgra_dim, II, bits), e cada tentativa só monta o vetor slot_to_node.
+        O neighbor_dict com as posições vizinhas de cada nó é calculado apenas se for acessado.
+
+        Com max_hops > 1, successors também inclui os nós alcançáveis em até max_hops saltos
+        passando apenas por slots livres, que o MRRG_Routing_CGRA pode rotear.
+        """
+        self.max_hops = max_hops
         self.bits = Interconnection.get_bits(interconnection)
         self.cgra_dim = cgra_dim
         self.mapping = mapping
         self.II = II
-        self.neighbor_dict = self.get_interconnections()
+        self._neighbor_dict = None
+
+        if cached:
+            self.neighbor_table = Interconnection.get_neighbor_table(tuple(cgra_dim), II, tuple(self.bits))
+            self.slot_to_node = [-1] * len(self.neighbor_table)
+            self.node_slots = {}
+            for node, position in mapping.placement.items():
+                slot = Interconnection.slot_index(position, cgra_dim, II)
+                self.slot_to_node[slot] = node
+                self.node_slots[node] = slot
+
+    @property
+    def neighbor_dict(self):
+        if self._neighbor_dict is None:
+            self._neighbor_dict = self.get_interconnections()
+        return self._neighbor_dict
+
+    @staticmethod
+    def slot_index(position, cgra_dim, II):
+        """
+        Converte a posição (linha, coluna, ciclo) no índice plano (linha * colunas + coluna) * II + ciclo.
+        """
+        r, c, t = position
+        return (r * cgra_dim[1] + c) * II + t
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def get_neighbor_table(cgra_dim, II, bits):
+        """
+        Calcula os vizinhos de todos os slots da arquitetura, que dependem apenas de (cgra_dim, II, bits).
+        O resultado fica em cache (LRU) e é compartilhado por todas as tentativas.
+
+        Args:
+            cgra_dim (tuple): Dimensões do CGRA (linhas, colunas).
+            II (int): Intervalo de inicialização.
+            bits (tuple): Bits de interconexão já convertidos por get_bits.
+
+        Returns:
+            tuple: Para cada índice de slot, a tupla dos índices dos slots vizinhos, na mesma ordem
+                   da lista de posições de get_interconnections.
+        """
+        rows, cols = cgra_dim
+        full = Mapping(rows * cols * II)
+        full.placement = dict(enumerate((r, c, t) for r in range(rows) for c in range(cols) for t in range(II)))
+        neighbor_dict = Interconnection(cgra_dim, "".join(str(bit) for bit in bits), full, II, cached=False).get_interconnections()
+        return tuple(
+            tuple(Interconnection.slot_index(position, cgra_dim, II) for position in neighbor_dict[slot])
+            for slot in range(len(full.placement))
+        )
+
+    def successors(self):
+        """
+        Retorna, para cada nó posicionado, os nós posicionados nos slots vizinhos, consultando a
+        tabela da arquitetura e o vetor slot_to_node.
+
+        Returns:
+            dict: {nó: [nós vizinhos]}, na ordem das posições de neighbor_dict.
+        """
+        table, slot_to_node = self.neighbor_table, self.slot_to_node
+        if self.max_hops > 1:
+            return {node: self.reachable_nodes(slot) for node, slot in self.node_slots.items()}
+        return {
+            node: [slot_to_node[neighbor] for neighbor in table[slot] if slot_to_node[neighbor] >= 0]
+            for node, slot in self.node_slots.items()
+        }
+
+    def reachable_nodes(self, start):
+        """
+        Busca em largura a partir do slot start que só atravessa slots livres, até max_hops saltos.
+
+        Returns:
+            list: Nós posicionados alcançados, em ordem de distância (os vizinhos diretos primeiro,
+                  na ordem de neighbor_dict).
+        """
+        table, slot_to_node = self.neighbor_table, self.slot_to_node
+        seen = {start}
+        nodes = []
+        frontier = [start]
+        for _ in range(self.max_hops):
+            next_frontier = []
+            for slot in frontier:
+                for neighbor in table[slot]:
+                    if neighbor in seen:
+                        continue
+                    seen.add(neighbor)
+                    if slot_to_node[neighbor] >= 0:
+                        nodes.append(slot_to_node[neighbor])
+                    else:
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        return nodes
 
     """
         bits:
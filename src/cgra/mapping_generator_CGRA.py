@@ -1,15 +1,30 @@
 from src.cgra.placement_cgra import Placement_CGRA
+from src.cgra.batch_placement_cgra import Batch_Placement_CGRA
 from src.cgra.routing_cgra import Routing_CGRA
+from src.cgra.constructive_routing_cgra import Constructive_Routing_CGRA
+from src.cgra.mrrg_routing_cgra import MRRG_Routing_CGRA
 from src.cgra.interconnection import Interconnection
 from src.utils.Mapping import Mapping
 from src.utils.graph_processing import Graph_Processing
+from src.utils.graph_balancer import Graph_Balancer
+from src.utils.generation_stats import Generation_Stats
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from functools import partial
+from itertools import count, islice
+from math import ceil
+from time import perf_counter
+import numpy as np
+import random
+import os
 
 class Mapping_generator_CGRA:
     """
     Classe responsável por gerar e verificar mapeamentos aleatórios de um DFG para um CGRA.
     """
 
-    def __init__(self, dfg_tam, II, alpha, alpha2, cgra_dim, bits):
+    def __init__(self, dfg_tam, II, alpha, alpha2, cgra_dim, bits, rng=random, early_abort=False, mode="rejection", stats=None, batch_size=0,
+                 physical_routing=False, max_hops=1, balance=False):
       """
         Inicializa os parâmetros necessários para o mapeamento.
 
@@ -18,7 +33,32 @@ class Mapping_generator_CGRA:
             II (int): Intervalo de inicialização (Initiation Interval) do CGRA.
             alpha (float): Probabilidade de criar conexões adicionais.
             alpha2 (float): Probabilidade de remover conexões existentes.
-            cgra (CGRA): Objeto representando a arquitetura do CGRA.
+            cgra_dim (tuple): Dimensões do CGRA (linhas, colunas).
+            bits (str): Bits de interconexão (ex: 1100).
+            rng (random.Random): Gerador de números aleatórios usado no placement e no routing.
+                                 Por padrão usa o módulo global random.
+            early_abort (bool): Se True, o routing interrompe tentativas que não podem mais ser válidas.
+                                Compensa quando as rejeições acontecem cedo (arquiteturas esparsas);
+                                em arquiteturas densas o custo das verificações supera o ganho.
+            mode (str): 'rejection' sorteia arestas e descarta DFGs inválidos; 'constructive' usa o
+                        Constructive_Routing_CGRA, que só gera DFGs conexos, acíclicos e balanceados.
+            stats (Generation_Stats | None): Se informado, registra a causa de rejeição e o tempo
+                                             de cada etapa de todas as tentativas.
+            batch_size (int): Se maior que 0, os placements são sorteados em lotes desse tamanho pelo
+                              Batch_Placement_CGRA, e só os candidatos promissores passam pelo routing.
+            physical_routing (bool): Se True, as arestas de cada DFG válido são roteadas no MRRG pelo
+                                     MRRG_Routing_CGRA e as rotas ficam em mapping.physical_routes.
+            max_hops (int): Distância máxima, em saltos pelo MRRG, entre os nós de uma aresta do DFG.
+                            Com max_hops > 1 o routing físico é sempre feito, e DFGs cujas arestas
+                            não podem ser roteadas juntas são rejeitados com causa 'routing_path'.
+            balance (bool): Se True, os DFGs rejeitados apenas por desbalanceamento são balanceados
+                            pelo Graph_Balancer, com os níveis calculados na validação, e aceitos. Os
+                            nós de roteamento inseridos não têm placement, então não pode ser usado
+                            com o routing físico. Também não pode ser usado com early_abort, que
+                            interrompe no routing as tentativas desbalanceadas antes do balanceamento.
+
+        Raises:
+            ValueError: Se mode for inválido ou se balance for usado com o routing físico ou com early_abort.
         """
       self.dfg_tam = dfg_tam
       self.II = II
@@ -26,6 +66,22 @@ class Mapping_generator_CGRA:
       self.alpha2 = alpha2
       self.cgra_dim = cgra_dim
       self.bits = bits
+      self.rng = rng
+      self.early_abort = early_abort
+
+      if mode not in ["rejection", "constructive"]:
+         raise ValueError("Modo deve ser 'rejection' ou 'constructive'.")
+      self.mode = mode
+      self.stats = stats
+      self.batch_size = batch_size
+      self.physical_routing = physical_routing or max_hops > 1
+      self.max_hops = max_hops
+      if balance and self.physical_routing:
+         raise ValueError("O balanceamento não pode ser usado com o routing físico (--physical_routing ou --max_hops > 1).")
+      if balance and early_abort:
+         raise ValueError("O balanceamento não pode ser usado com --early_abort, que descarta os DFGs desbalanceados durante o routing.")
+      self.balance = balance
+      self.stats_key = (dfg_tam, tuple(cgra_dim), II, bits, alpha, alpha2)
 
     def mapp(self, max_attempts=200000):
       """
@@ -41,18 +97,302 @@ class Mapping_generator_CGRA:
         Raises:
             ValueError: Se o número máximo de tentativas for atingido sem encontrar um mapeamento balanceado.
         """
+      if self.batch_size > 0:
+         return self.mapp_batched(max_attempts)
+
       for attempt in range(max_attempts):
-         mapping = Mapping(self.dfg_tam)
-         Placement_CGRA(mapping,self.cgra_dim,self.dfg_tam,self.II)
-         interconnection = Interconnection(self.cgra_dim,self.bits,mapping, self.II)
-         Routing_CGRA(mapping,self.dfg_tam,self.alpha,self.alpha2,interconnection.neighbor_dict)
-         Routing_CGRA.get_routing_path(mapping)
-         if Graph_Processing(mapping, self.dfg_tam).is_valid():
+         mapping = self.attempt()
+         if mapping is not None:
             return mapping
       raise ValueError(f"Não foi possível encontrar um mapeamento balanceado após {max_attempts} tentativas.")
-    
 
-  
+    def mapp_batched(self, max_attempts=200000):
+      """
+        Igual a mapp, mas sorteia os placements em lotes com o Batch_Placement_CGRA e só faz o
+        routing e a validação dos candidatos promissores. Os candidatos descartados pelo filtro
+        contam como tentativas com causa 'disconnected'.
+
+        O mapeamento termina no primeiro candidato aceito e o resto do lote é descartado, então
+        os lotes começam com 8 candidatos e dobram de tamanho até batch_size.
+
+        Raises:
+            ValueError: Se o número máximo de tentativas for atingido sem encontrar um mapeamento balanceado.
+        """
+      batch = Batch_Placement_CGRA(self.cgra_dim, self.II, self.bits, self.dfg_tam, np.random.default_rng(self.rng.getrandbits(64)))
+      attempts = 0
+      size = min(8, self.batch_size)
+      while attempts < max_attempts:
+         start = perf_counter()
+         slots = batch.sample_slots(min(size, max_attempts - attempts))
+         size = min(2 * size, self.batch_size)
+         if self.max_hops > 1:
+            # O filtro só conhece as arestas de um salto.
+            promising = np.ones(len(slots), dtype=bool)
+         else:
+            promising = batch.promising(batch.adjacency(slots))
+         attempts += len(slots)
+         if self.stats is not None:
+            self.stats.record(self.stats_key, "disconnected", {"placement": perf_counter() - start}, len(slots) - int(promising.sum()))
+
+         for row in np.flatnonzero(promising):
+            mapping = self.attempt(batch.to_mapping(slots[row]))
+            if mapping is not None:
+               return mapping
+      raise ValueError(f"Não foi possível encontrar um mapeamento balanceado após {max_attempts} tentativas.")
+
+    def attempt(self, mapping=None):
+      """
+        Faz uma tentativa de mapeamento e, se houver stats, registra o resultado e o tempo das etapas.
+
+        Args:
+            mapping (Mapping | None): Mapeamento com o placement já feito (por exemplo, pelo
+                                      Batch_Placement_CGRA). Se None, o placement é sorteado aqui.
+
+        Returns:
+            Mapping | None: O mapeamento, se for válido, ou None se a tentativa for rejeitada.
+
+        Raises:
+            ValueError: Se o placement não couber no CGRA ou se o caminho de routing não puder
+                        ser montado (a tentativa é registrada com causa 'capacity' ou 'routing_path').
+        """
+      timings = {}
+      start = perf_counter()
+      cause = "capacity"
+      try:
+         if mapping is None:
+            mapping = Mapping(self.dfg_tam)
+            Placement_CGRA(mapping,self.cgra_dim,self.dfg_tam,self.II,self.rng)
+            timings["placement"] = perf_counter() - start
+
+         start = perf_counter()
+         interconnection = Interconnection(self.cgra_dim,self.bits,mapping, self.II, max_hops=self.max_hops)
+         timings["interconnection"] = perf_counter() - start
+
+         start = perf_counter()
+         if self.mode == "constructive":
+            routing = Constructive_Routing_CGRA(mapping,self.dfg_tam,self.alpha,self.alpha2,interconnection,self.rng)
+         else:
+            routing = Routing_CGRA(mapping,self.dfg_tam,self.alpha,self.alpha2,interconnection,self.rng,self.early_abort)
+         timings["routing"] = perf_counter() - start
+         cause = routing.reject_cause
+
+         if cause is None:
+            start = perf_counter()
+            if self.balance:
+               cause, levels = Graph_Processing(mapping, self.dfg_tam).kahn_sweep()
+               timings["validation"] = perf_counter() - start
+               if cause == "unbalanced":
+                  start = perf_counter()
+                  Graph_Balancer.balance(mapping, levels)
+                  timings["balancing"] = perf_counter() - start
+                  cause = None
+            else:
+               cause = Graph_Processing(mapping, self.dfg_tam).validate()
+               timings["validation"] = perf_counter() - start
+
+         if cause is not None:
+            return None
+
+         start = perf_counter()
+         cause = "routing_path"
+         Routing_CGRA.get_routing_path(mapping)
+         if self.physical_routing and not MRRG_Routing_CGRA(mapping, self.cgra_dim, self.II, self.bits, self.max_hops).route():
+            timings["routing_path"] = perf_counter() - start
+            return None
+         timings["routing_path"] = perf_counter() - start
+         cause = "accepted"
+         return mapping
+      finally:
+         if self.stats is not None:
+            self.stats.record(self.stats_key, cause, timings)
+
+    @staticmethod
+    def task_rng(seed, index):
+      """
+        Cria o gerador aleatório da tarefa de índice index.
+
+        A semente de cada tarefa depende apenas de (seed, index), de modo que o resultado
+        de uma tarefa não depende da ordem nem do processo em que ela é executada.
+
+        Args:
+            seed (int | None): Semente global da execução. Se None, usa uma semente do sistema.
+            index (int): Índice do mapeamento dentro da execução.
+
+        Returns:
+            random.Random: Gerador exclusivo da tarefa.
+        """
+      if seed is None:
+         return random.Random()
+      return random.Random(f"{seed}:{index}")
+
+    @staticmethod
+    def generate_indexed(index, graph_range, tam_arch, alpha, alpha2, bits, seed=None, generator_options=None, stats=None, alpha_table=None):
+      """
+        Gera o mapeamento de índice index de uma execução: sorteia o tamanho do DFG e a
+        arquitetura, e repete o sorteio até que um mapeamento seja encontrado.
+
+        Args:
+            index (int): Índice do mapeamento dentro da execução.
+            graph_range (tuple): Intervalo de número de vértices do grafo (min, max).
+            tam_arch (list): Lista de tuplas (linhas, colunas) de arquiteturas possíveis.
+            alpha (float): Probabilidade de criar conexões adicionais.
+            alpha2 (float): Probabilidade de remover conexões existentes.
+            bits (str): Bits de interconexão (ex: 1100).
+            seed (int | None): Semente global da execução.
+            generator_options (dict | None): Parâmetros opcionais repassados ao Mapping_generator_CGRA.
+            stats (Generation_Stats | None): Telemetria onde as tentativas são registradas.
+            alpha_table (dict | None): (alpha, alpha2) de cada (num_vertices, (linhas, colunas)), como o
+                                       gerado pelo Alpha_Tuner. Configurações ausentes usam alpha e alpha2.
+
+        Returns:
+            tuple: (index, mapping, (linhas, colunas), num_vertices).
+        """
+      rng = Mapping_generator_CGRA.task_rng(seed, index)
+      initial, final = graph_range
+
+      while True:
+         num_vertices = rng.randint(initial, final)
+
+         row, col = rng.choice(tam_arch)
+         II = ceil(num_vertices/(row * col))
+
+         if row * col < num_vertices:
+            print(f"[AVISO] Arquitetura {row}x{col} não suporta {num_vertices} vértices. Pulando.")
+            if stats is not None:
+               stats.record((num_vertices, (row, col), II, bits, alpha, alpha2), "capacity", {})
+            continue
+         task_alpha, task_alpha2 = (alpha_table or {}).get((num_vertices, (row, col)), (alpha, alpha2))
+         mapping_generator = Mapping_generator_CGRA(num_vertices, II, task_alpha, task_alpha2, (row, col), bits, rng, stats=stats,
+                                                    **(generator_options or {}))
+
+         try:
+            mapping = mapping_generator.mapp()
+         except ValueError:
+            continue
+
+         return index, mapping, (row, col), num_vertices
+
+    @staticmethod
+    def generate_indexed_with_stats(index, **kwargs):
+      """
+        Executa generate_indexed com uma telemetria própria, para tarefas executadas em outro processo.
+
+        Returns:
+            tuple: (resultado de generate_indexed, Generation_Stats da tarefa).
+        """
+      stats = Generation_Stats()
+      return Mapping_generator_CGRA.generate_indexed(index, stats=stats, **kwargs), stats
+
+    @staticmethod
+    def iter_mappings(graph_range, tam_arch, alpha, alpha2, bits, k=None, seed=None, workers=1, prefetch=None, shard=(0, 1),
+                      generator_options=None, stats=None, alpha_table=None, dedup=None):
+      """
+        Gera mapeamentos sob demanda, sem passar pelo disco, para consumidores no mesmo processo
+        (por exemplo, um data loader).
+
+        Cada mapeamento de índice index é gerado por generate_indexed com uma sequência aleatória
+        derivada de (seed, index), então a saída depende apenas da semente: é a mesma para
+        qualquer número de workers, e as partes de shard = (i, N), que geram apenas os índices
+        congruentes a i módulo N, são disjuntas e têm como união a execução completa.
+
+        Com workers > 1, os mapeamentos são gerados em um pool de processos que mantém no máximo
+        prefetch tarefas adiantadas; os resultados são entregues na ordem dos índices.
+
+        Args:
+            graph_range (tuple): Intervalo de número de vértices do grafo (min, max).
+            tam_arch (list): Lista de tuplas (linhas, colunas) de arquiteturas possíveis.
+            alpha (float): Probabilidade de criar conexões adicionais.
+            alpha2 (float): Probabilidade de remover conexões existentes.
+            bits (str): Bits de interconexão (ex: 1100).
+            k (int | None): Número total de mapeamentos da execução. Se None, a geração não termina.
+            seed (int | None): Semente da execução.
+            workers (int): Número de processos (1 = no próprio processo, 0 = todos os núcleos).
+            prefetch (int | None): Número máximo de mapeamentos adiantados. Padrão: 4 * workers.
+            shard (tuple): Parte (i, N) da execução a ser gerada.
+            generator_options (dict | None): Parâmetros opcionais repassados ao Mapping_generator_CGRA
+                                             (ex: {'early_abort': True}).
+            stats (Generation_Stats | None): Telemetria onde as tentativas são registradas. Com
+                                             workers > 1, a telemetria de cada tarefa é devolvida
+                                             junto com o mapeamento e acumulada aqui.
+            alpha_table (dict | None): (alpha, alpha2) ajustados por configuração (ver Alpha_Tuner.build_table).
+            dedup (Graph_Deduplicator | None): Se informado, os DFGs isomorfos a um DFG já entregue são
+                                               descartados e k passa a contar apenas DFGs distintos. Os
+                                               índices entregues continuam sendo i, i + N, i + 2N, ...; a
+                                               saída ainda depende só da semente, mas as partes de um
+                                               shard não são deduplicadas entre si.
+
+        Yields:
+            tuple: (index, mapping, (linhas, colunas), num_vertices). O mapping é entregue aberto
+                   (dicionários); quem o guarda em memória deve chamar mapping.pack().
+        """
+      if dedup is not None:
+         yield from Mapping_generator_CGRA.iter_distinct(graph_range, tam_arch, alpha, alpha2, bits, k, seed, workers, prefetch, shard,
+                                                         generator_options, stats, alpha_table, dedup)
+         return
+
+      options = dict(graph_range=graph_range, tam_arch=tam_arch, alpha=alpha, alpha2=alpha2, bits=bits,
+                     seed=seed, generator_options=generator_options, alpha_table=alpha_table)
+      shard_index, shard_count = shard
+      indices = count(shard_index, shard_count) if k is None else iter(range(shard_index, k, shard_count))
+
+      if workers == 0:
+         workers = os.cpu_count() or 1
+
+      if workers <= 1:
+         for index in indices:
+            yield Mapping_generator_CGRA.generate_indexed(index, stats=stats, **options)
+         return
+
+      if stats is None:
+         task = partial(Mapping_generator_CGRA.generate_indexed, **options)
+      else:
+         task = partial(Mapping_generator_CGRA.generate_indexed_with_stats, **options)
+
+      executor = ProcessPoolExecutor(max_workers=workers)
+      try:
+         pending = deque(executor.submit(task, index) for index in islice(indices, prefetch or 4 * workers))
+         while pending:
+            result = pending.popleft().result()
+            if stats is not None:
+               result, task_stats = result
+               stats.merge(task_stats)
+            index = next(indices, None)
+            if index is not None:
+               pending.append(executor.submit(task, index))
+            yield result
+      finally:
+         executor.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def iter_distinct(graph_range, tam_arch, alpha, alpha2, bits, k, seed, workers, prefetch, shard, generator_options, stats, alpha_table, dedup):
+      """
+        iter_mappings com deduplicação: gera índices sem limite e entrega apenas os mapeamentos cujo
+        DFG é novo para dedup, renumerados na ordem em que são entregues, até completar k. Para
+        quando dedup.exhausted indica que não há mais DFGs distintos no intervalo de tamanhos.
+
+        Yields:
+            tuple: (index, mapping, (linhas, colunas), num_vertices).
+        """
+      shard_index, shard_count = shard
+      positions = count(shard_index, shard_count) if k is None else iter(range(shard_index, k, shard_count))
+      position = next(positions, None)
+      if position is None:
+         return
 
-           
-    
+      for _, mapping, (row, col), num_vertices in Mapping_generator_CGRA.iter_mappings(graph_range, tam_arch, alpha, alpha2, bits, None, seed,
+                                                                                       workers, prefetch, shard, generator_options, stats,
+                                                                                       alpha_table):
+         start = perf_counter()
+         is_new = dedup.add(mapping)
+         if not is_new and stats is not None:
+            task_alpha, task_alpha2 = (alpha_table or {}).get((num_vertices, (row, col)), (alpha, alpha2))
+            key = (num_vertices, (row, col), ceil(num_vertices/(row * col)), bits, task_alpha, task_alpha2)
+            stats.reject_accepted(key, "duplicate", {"dedup": perf_counter() - start})
+         if is_new:
+            yield position, mapping, (row, col), num_vertices
+            position = next(positions, None)
+            if position is None:
+               return
+         elif dedup.exhausted:
+            print(f"[AVISO] {dedup.consecutive} DFGs isomorfos seguidos; encerrando com {dedup.distinct} DFGs distintos.")
+            return
@@ -0,0 +1,135 @@
+from src.cgra.interconnection import Interconnection
+from src.utils.Mapping import Mapping
+
+class MRRG_Routing_CGRA:
+    """
+    Routing físico das arestas do DFG no MRRG (Modulo Routing Resource Graph) do CGRA.
+
+    Os recursos do MRRG são os slots (PE, ciclo módulo II) de Interconnection.get_neighbor_table,
+    e cada salto de um slot para um vizinho leva um ciclo. Como o ciclo faz parte do slot, todo
+    caminho do slot da origem ao slot do destino respeita o escalonamento módulo II.
+
+    Cada aresta é roteada por uma BFS sobre a tabela de vizinhos, com buffers reaproveitados entre
+    buscas. A ocupação de cada slot é registrada: slots de nós posicionados não podem ser usados
+    como passagem, e um slot de passagem pertence a uma única rede (nó de origem), cujas arestas
+    podem compartilhar os saltos já roteados.
+    """
+
+    FREE = -1
+    PLACED = -2
+
+    def __init__(self, mapping: Mapping, cgra_dim, II, bits, max_hops=None):
+        """
+        Args:
+            mapping (Mapping): Mapeamento com placement e dfg_edges.
+            cgra_dim (tuple): Dimensões do CGRA (linhas, colunas).
+            II (int): Intervalo de inicialização.
+            bits (str): Bits de interconexão (ex: 1100).
+            max_hops (int | None): Número máximo de saltos de cada rota. Padrão: sem limite.
+        """
+        self.mapping = mapping
+        self.cgra_dim = cgra_dim
+        self.II = II
+        self.max_hops = max_hops
+        self.table = Interconnection.get_neighbor_table(tuple(cgra_dim), II, tuple(Interconnection.get_bits(bits)))
+
+        total = len(self.table)
+        self.occupancy = [MRRG_Routing_CGRA.FREE] * total
+        self.parent = [-1] * total
+        self.seen = [0] * total
+        self.epoch = 0
+
+        self.node_slot = {node: Interconnection.slot_index(pos, cgra_dim, II) for node, pos in mapping.placement.items()}
+        for slot in self.node_slot.values():
+            self.occupancy[slot] = MRRG_Routing_CGRA.PLACED
+        self.net_parent = {}
+
+    def route(self):
+        """
+        Roteia todas as arestas do DFG e salva as rotas em mapping.physical_routes.
+
+        Returns:
+            bool: False se alguma aresta não puder ser roteada; nesse caso as rotas ficam incompletas.
+        """
+        self.mapping.physical_routes = {}
+        for source, targets in self.mapping.dfg_edges.items():
+            for target in targets:
+                slots = self.route_edge(source, target)
+                if slots is None:
+                    return False
+                self.mapping.physical_routes[(source, target)] = [self.slot_position(slot) for slot in slots]
+        return True
+
+    def route_edge(self, source, target):
+        """
+        Busca a menor rota do nó source até o nó target. A busca também pode continuar a partir de
+        qualquer slot de passagem já roteado pela rede de source, que entra na busca com a sua
+        distância até a origem; assim a rota é a menor possível e ainda reaproveita saltos da rede.
+
+        Returns:
+            list | None: Slots da rota, de source a target, ou None se não houver rota livre.
+        """
+        target_slot = self.node_slot[target]
+        tree = self.net_parent.setdefault(source, {self.node_slot[source]: (-1, 0)})
+
+        self.epoch += 1
+        epoch, seen, parent, occupancy, table = self.epoch, self.seen, self.parent, self.occupancy, self.table
+        entries = {}
+        for slot, (_, depth) in tree.items():
+            seen[slot] = epoch
+            parent[slot] = -1
+            entries.setdefault(depth, []).append(slot)
+
+        frontier = []
+        depth = 0
+        found = False
+        while not found and (frontier or depth <= max(entries)):
+            frontier += entries.get(depth, [])
+            if self.max_hops is not None and depth >= self.max_hops:
+                break
+            next_frontier = []
+            for slot in frontier:
+                for neighbor in table[slot]:
+                    if seen[neighbor] == epoch:
+                        continue
+                    if neighbor == target_slot:
+                        parent[neighbor] = slot
+                        found = True
+                        break
+                    owner = occupancy[neighbor]
+                    if owner != MRRG_Routing_CGRA.FREE and owner != source:
+                        continue
+                    seen[neighbor] = epoch
+                    parent[neighbor] = slot
+                    next_frontier.append(neighbor)
+                if found:
+                    break
+            frontier = next_frontier
+            depth += 1
+        if not found:
+            return None
+
+        hops = []
+        slot = parent[target_slot]
+        while parent[slot] != -1:
+            hops.append(slot)
+            slot = parent[slot]
+        hops.reverse()
+
+        # A busca começou em um slot da árvore da rede; o caminho até a origem vem da árvore.
+        trunk = [slot]
+        while tree[trunk[-1]][0] != -1:
+            trunk.append(tree[trunk[-1]][0])
+        trunk.reverse()
+
+        previous = slot
+        for hop in hops:
+            occupancy[hop] = source
+            tree[hop] = (previous, tree[previous][1] + 1)
+            previous = hop
+        return trunk + hops + [target_slot]
+
+    def slot_position(self, slot):
+        pe, cycle = divmod(slot, self.II)
+        row, col = divmod(pe, self.cgra_dim[1])
+        return (row, col, cycle)
@@ -2,12 +2,13 @@ from src.utils.Mapping import Mapping
 import random
 
 class Placement_CGRA:
-    def __init__(self,mapping: Mapping, cgra_dim , dfg_tam : int, II : int) -> None:
+    def __init__(self,mapping: Mapping, cgra_dim , dfg_tam : int, II : int, rng=random) -> None:
         
         self.dfg_tam = dfg_tam
         self.II = II
         self.cgra_dim = cgra_dim
         self.mapping = mapping
+        self.rng = rng
         self.get_placement()
          
 
@@ -15,6 +16,10 @@ class Placement_CGRA:
         """
         Realiza o placement aleatório dos nós no CGRA.
 
+        Sorteia dfg_tam slots distintos com sample_slots, em tempo proporcional a dfg_tam e
+        independente do tamanho da arquitetura, e converte cada índice plano
+        (linha * colunas + coluna) * II + ciclo na posição (linha, coluna, ciclo).
+
         Args:
             mapping (Mapping): Objeto contendo dados do mapeamento.
 
@@ -27,15 +32,41 @@ class Placement_CGRA:
         if max_positions < self.dfg_tam:
             raise ValueError("Capacidade insuficiente!!")
 
-        available_positions = [
-            (row, col, cycle)
-            for row in range(rows)
-            for col in range(cols)
-            for cycle in range(self.II)
-        ]
-        random.shuffle(available_positions)
-        for node in range(self.dfg_tam):
-            if not available_positions:
-                raise ValueError(f"Capacidade insuficiente!!")
-            self.mapping.placement[node] = available_positions.pop()
+        for node, slot in enumerate(Placement_CGRA.sample_slots(self.rng, max_positions, self.dfg_tam)):
+            pe, cycle = divmod(slot, self.II)
+            row, col = divmod(pe, cols)
+            self.mapping.placement[node] = (row, col, cycle)
+
+    @staticmethod
+    def sample_slots(rng, total, k):
+        """
+        Sorteia k índices distintos de range(total), em ordem aleatória, com o algoritmo de Floyd.
+
+        Os índices já escolhidos ficam em um set, ou em um bitmap (bytearray) quando k é uma
+        fração grande de total e o bitmap é mais barato que o set.
+
+        Args:
+            rng (random.Random): Gerador de números aleatórios.
+            total (int): Número de slots da arquitetura.
+            k (int): Número de slots a sortear.
+
+        Returns:
+            list: Os k índices sorteados.
+        """
+        occupied = bytearray(total) if 8 * k >= total else set()
+        if isinstance(occupied, bytearray):
+            is_occupied, occupy = occupied.__getitem__, lambda slot: occupied.__setitem__(slot, 1)
+        else:
+            is_occupied, occupy = occupied.__contains__, occupied.add
+
+        chosen = []
+        for j in range(total - k, total):
+            slot = rng.randrange(j + 1)
+            if is_occupied(slot):
+                slot = j
+            occupy(slot)
+            chosen.append(slot)
 
+        # O algoritmo de Floyd sorteia um conjunto uniforme, mas não uma ordem uniforme.
+        rng.shuffle(chosen)
+        return chosen
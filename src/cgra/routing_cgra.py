@@ -1,5 +1,7 @@
 from collections import deque, defaultdict
 from src.utils.Mapping import Mapping
+from src.cgra.interconnection import Interconnection
+from src.utils.graph_processing import Graph_Processing
 import random
 
 """
@@ -8,12 +10,15 @@ Temos 2 opções, deixar da maneira como esta agora e so mudar para que o metodo
 Ou fazer algo melhor, fazer um dicionario com os vizinhos de cada no, gerados apartir de interconnections e depois passar como parametro para a classe, quando routing requisitar vizinhos de um no, ela dara como parametro o no (chave do dicionario), e retornara o valor do dicionario que é uma lista com os vizinhos, gerados apartir das interconexões
 """
 class Routing_CGRA:
-    def __init__(self, mapping:Mapping,dfg_tam:int, alpha, alpha2, neighbors_dict:dict) -> None:
+    def __init__(self, mapping:Mapping,dfg_tam:int, alpha, alpha2, interconnection:Interconnection, rng=random, early_abort=False) -> None:
         self.dfg_tam = dfg_tam
         self.alpha = alpha
         self.alpha2 = alpha2
         self.mapping = mapping
-        self.neighbors_dict = neighbors_dict
+        self.interconnection = interconnection
+        self.rng = rng
+        self.early_abort = early_abort
+        self.reject_cause = None
         self.get_routing()
         
     def get_routing(self):
@@ -21,31 +26,31 @@ class Routing_CGRA:
         """
         Realiza o roteamento do DFG no CGRA, gerando os caminhos de roteamento.
 
+        Com early_abort, a tentativa é interrompida assim que não pode mais gerar um DFG
+        válido, e reject_cause recebe 'disconnected', 'cyclic' ou 'unbalanced'. As
+        verificações só usam partes do grafo que não podem mais mudar (ver finish_node),
+        então nenhuma tentativa que terminaria válida é descartada.
+
         Args:
             mapping (Mapping): Objeto contendo dados do mapeamento.
         """
         self.mapping.dfg_edges = defaultdict(list)
         self.mapping.routing = {}
+        self.reject_cause = None
 
-        position_to_node = {pos: node for node, pos in self.mapping.placement.items()}
+        self.successors = self.interconnection.successors()
         visited = set()
 
-        queue = deque([random.randint(0, self.dfg_tam - 1)])
+        queue = deque([self.rng.randint(0, self.dfg_tam - 1)])
         visited.add(queue[0])
 
+        if self.early_abort and not self.start_monitor(queue[0]):
+            return
+
         while queue:
             current_node = queue.popleft()
             
-            neighbors = self.neighbors_dict[current_node]
-            for neighbor_pos in neighbors:
-                if neighbor_pos not in position_to_node:
-                    continue
-
-                neighbor_node = position_to_node[neighbor_pos]
-
-                if neighbor_node == current_node:
-                    continue
-
+            for neighbor_node in self.successors[current_node]:
                 if neighbor_node in self.mapping.dfg_edges[current_node] or current_node in self.mapping.dfg_edges[neighbor_node]:
                     continue
 
@@ -53,42 +58,210 @@ class Routing_CGRA:
                     self.mapping.dfg_edges[current_node].append(neighbor_node)
                     queue.append(neighbor_node)
                     visited.add(neighbor_node)
+                    if self.early_abort:
+                        self.preds[neighbor_node].add(current_node)
 
                 else:
-                    if random.random() < self.alpha:
+                    if self.rng.random() < self.alpha:
                         self.mapping.dfg_edges[current_node].append(neighbor_node)
+                        if self.early_abort:
+                            self.preds[neighbor_node].add(current_node)
 
-                        if random.random() < self.alpha2 and self.mapping.dfg_edges[neighbor_node]:
-                            target_to_remove = random.choice(list(self.mapping.dfg_edges[neighbor_node]))
+                        if self.rng.random() < self.alpha2 and self.mapping.dfg_edges[neighbor_node]:
+                            target_to_remove = self.rng.choice(list(self.mapping.dfg_edges[neighbor_node]))
                             self.mapping.dfg_edges[neighbor_node].remove(target_to_remove)
+                            if self.early_abort:
+                                self.preds[target_to_remove].discard(neighbor_node)
+                                self.touched.append(target_to_remove)
+
+            if self.early_abort and not self.finish_node(current_node):
+                return
+
+    def start_monitor(self, root):
+        """
+        Prepara o estado das verificações incrementais.
+
+        pending_in[v] conta os nós ainda não processados que têm v como vizinho, ou seja, que
+        ainda podem criar uma aresta para v ou remover uma aresta que sai de v. Um nó processado
+        com pending_in igual a 0 está fechado: suas arestas de saída não mudam mais.
+
+        Returns:
+            bool: False se algum nó não é alcançável a partir da raiz pelas interconexões.
+        """
+        self.root = root
+        self.pending_in = dict.fromkeys(self.successors, 0)
+        for node, targets in self.successors.items():
+            for target in targets:
+                self.pending_in[target] += 1
+        self.preds = {node: set() for node in self.successors}
+        self.processed = set()
+        self.closed = set()
+        self.levels = {}
+        self.touched = []
+
+        reachable = {root}
+        stack = [root]
+        while stack:
+            for neighbor in self.successors[stack.pop()]:
+                if neighbor not in reachable:
+                    reachable.add(neighbor)
+                    stack.append(neighbor)
+        if len(reachable) < self.dfg_tam:
+            self.reject_cause = "disconnected"
+            return False
+        return True
+
+    def finish_node(self, node):
+        """
+        Atualiza o estado depois que node foi processado e verifica as partes do grafo que
+        acabaram de se tornar definitivas: ciclos formados apenas por nós fechados e níveis
+        de nós cujas arestas de entrada e ancestrais não mudam mais.
+
+        Returns:
+            bool: False se a tentativa não pode mais gerar um DFG válido.
+        """
+        self.processed.add(node)
+        candidates = [node] + self.touched
+        self.touched = []
+        for target in self.successors[node]:
+            self.pending_in[target] -= 1
+            if not self.pending_in[target]:
+                candidates.append(target)
+
+        to_settle = list(candidates)
+        for candidate in candidates:
+            if candidate in self.processed and not self.pending_in[candidate] and candidate not in self.closed:
+                self.closed.add(candidate)
+                if self.closes_cycle(candidate):
+                    self.reject_cause = "cyclic"
+                    return False
+                to_settle.extend(self.mapping.dfg_edges.get(candidate, []))
+
+        return self.settle(to_settle)
+
+    def closes_cycle(self, node):
+        """
+        Verifica se node, recém fechado, está em um ciclo formado apenas por nós fechados.
+        """
+        edges = self.mapping.dfg_edges
+        stack = list(edges.get(node, []))
+        seen = set()
+        while stack:
+            current = stack.pop()
+            if current == node:
+                return True
+            if current in seen or current not in self.closed:
+                continue
+            seen.add(current)
+            stack.extend(edges.get(current, []))
+        return False
+
+    def settle(self, nodes):
+        """
+        Calcula o nível definitivo dos nós cujas arestas de entrada não mudam mais e cujos
+        predecessores já têm nível definitivo, propagando para os sucessores.
+
+        Returns:
+            bool: False se um nó sem predecessores não é a raiz (o grafo fica desconexo) ou se
+                  os predecessores de um nó estão em níveis diferentes.
+        """
+        edges = self.mapping.dfg_edges
+        closed, levels, pending_in, all_preds = self.closed, self.levels, self.pending_in, self.preds
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            if node in levels:
+                continue
+            preds = all_preds[node]
+            level = None
+            settled = not pending_in[node]
+            for pred in preds:
+                if pred in closed and pred in levels:
+                    if level is None:
+                        level = levels[pred]
+                    elif levels[pred] != level:
+                        # Arestas definitivas vindas de níveis diferentes: novas arestas não desfazem o conflito.
+                        self.reject_cause = "unbalanced"
+                        return False
+                else:
+                    settled = False
+            if not settled:
+                continue
+
+            if level is None:
+                if node != self.root:
+                    self.reject_cause = "disconnected"
+                    return False
+                levels[node] = 0
+            else:
+                levels[node] = level + 1
+
+            if node in closed:
+                stack.extend(edges.get(node, ()))
+        return True
 
     @staticmethod  
     def get_routing_path(mapping):
         """
         Retorna o caminho de roteamento de um nó para outro.
 
+        Os níveis do DFG (calculados uma vez por Graph_Processing.kahn_sweep) limitam as buscas:
+        em um DFG balanceado, cada busca só percorre as arestas que saem da origem.
+
         Args:
             mapping (Mapping): Objeto contendo o mapeamento.
         """
-        def dfs(current, path, dst):
-            if current == dst:
-                return path
-            for next_node in mapping.dfg_edges.get(current, []):
-                if next_node not in path:
-                    result = dfs(next_node, path + [next_node], dst)
-                    if result:
-                        return result
-            return None
-
+        levels = Graph_Processing(mapping, len(mapping.dfg_vertices)).kahn_sweep()[1]
         for source, targets in mapping.dfg_edges.items():
             for target in targets:
                 if (source, target) not in mapping.routing:
-                    path = dfs(source, [source], target)
+                    path = Routing_CGRA.find_path(mapping.dfg_edges, source, target, levels)
                     if path:
                         mapping.routing[(source, target)] = path
                     else:
                         raise ValueError(f"Roteamento falhou entre {source} e {target}.")
 
-        
+    @staticmethod
+    def find_path(dfg_edges, source, target, levels=None):
+        """
+        Busca em profundidade iterativa de source até target, explorando os sucessores na ordem
+        de dfg_edges. Cada nó é visitado no máximo uma vez, então a busca é O(V + E) e não tem
+        limite de recursão. Em um DAG, um nó de onde target não foi alcançado também não o alcança
+        por outro caminho, então o caminho devolvido é o primeiro caminho simples dessa ordem.
+
+        Com levels (profundidades de kahn_sweep), a busca não entra em nós com nível maior ou
+        igual ao de target, nem em nós sem nível (que estão em ciclos ou depois deles): nenhum
+        desses nós alcança target, então o caminho devolvido é o mesmo.
+
+        Args:
+            dfg_edges (dict): Arestas do DFG.
+            source: Nó de origem.
+            target: Nó de destino.
+            levels (dict | None): Níveis dos nós calculados por Graph_Processing.kahn_sweep.
+
+        Returns:
+            list | None: Os nós do caminho, de source a target, ou None se não houver caminho.
+        """
+        if source == target:
+            return [source]
 
-   
+        target_level = levels.get(target) if levels is not None else None
+        path = [source]
+        visited = {source}
+        stack = [iter(dfg_edges.get(source, ()))]
+        while stack:
+            for next_node in stack[-1]:
+                if next_node not in visited:
+                    visited.add(next_node)
+                    if next_node == target:
+                        path.append(next_node)
+                        return path
+                    if target_level is not None and levels.get(next_node, target_level) >= target_level:
+                        continue
+                    path.append(next_node)
+                    stack.append(iter(dfg_edges.get(next_node, ())))
+                    break
+            else:
+                stack.pop()
+                path.pop()
+        return None
@@ -1,6 +1,9 @@
 import matplotlib.pyplot as plt
 import networkx as nx
 from src.utils.Mapping import Mapping
+import subprocess
+import hashlib
+import shutil
 import os
 
 class Graph_Visualizer:
@@ -16,7 +19,125 @@ class Graph_Visualizer:
         directory = os.path.dirname(dot_file)
         output_file = os.path.join(directory, os.path.splitext(os.path.basename(dot_file))[0] + ".png")
 
-        os.system(f"dot -Tpng {dot_file} -o {output_file}")
+        try:
+            subprocess.run(["dot", "-Tpng", dot_file, "-o", output_file], check=False)
+        except OSError as e:
+            print(f"Erro ao gerar imagem de {dot_file}: {e}")
+
+    @staticmethod
+    def render_batch(dot_files, cache_dir=None):
+        """
+        Gera as imagens de vários arquivos DOT com uma única chamada ao Graphviz (dot -O).
+
+        Com cache_dir, as imagens ficam em um cache indexado pelo hash do conteúdo DOT: arquivos
+        com o mesmo conteúdo são renderizados uma só vez, e as imagens já existentes no cache são
+        apenas ligadas (hard link, ou cópia se o sistema de arquivos não permitir) ao destino.
+
+        Args:
+            dot_files (list): Caminhos dos arquivos DOT. A imagem de cada um é salva ao lado dele, com extensão .png.
+            cache_dir (str | None): Diretório do cache de imagens. Se None, não há cache.
+
+        Returns:
+            int: Número de imagens efetivamente renderizadas pelo Graphviz.
+        """
+        targets = {}
+        for dot_file in dot_files:
+            try:
+                with open(dot_file, "rb") as f:
+                    key = hashlib.sha1(f.read().replace(b"\r\n", b"\n")).hexdigest()
+            except OSError as e:
+                print(f"Erro ao ler {dot_file}: {e}")
+                continue
+            targets.setdefault(key, []).append(dot_file)
+
+        misses = {}
+        for key, files in targets.items():
+            if cache_dir is None or not os.path.exists(os.path.join(cache_dir, key + ".png")):
+                misses[key] = files[0]
+
+        if misses:
+            try:
+                subprocess.run(["dot", "-Tpng", "-O", *misses.values()], check=False)
+            except OSError as e:
+                print(f"Erro ao gerar imagens: {e}")
+                return 0
+
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        rendered = 0
+        for key, files in targets.items():
+            source = os.path.join(cache_dir, key + ".png") if cache_dir is not None else None
+            output_file = None
+            if key in misses:
+                output_file = misses[key] + ".png"
+                if not os.path.exists(output_file):
+                    print(f"Erro ao gerar imagem de {misses[key]}")
+                    continue
+                rendered += 1
+                if source is None:
+                    source = output_file
+                else:
+                    try:
+                        os.replace(output_file, source)
+                    except OSError as e:
+                        # Sem o cache, a imagem ainda pode ser ligada aos destinos a partir da saída do dot.
+                        print(f"Erro ao guardar {output_file} no cache: {e}")
+                        source = output_file
+
+            # Um destino que não pode ser escrito não impede os outros arquivos do lote.
+            for dot_file in files:
+                try:
+                    Graph_Visualizer.link_image(source, os.path.splitext(dot_file)[0] + ".png")
+                except OSError as e:
+                    print(f"Erro ao salvar a imagem de {dot_file}: {e}")
+            if source == output_file:
+                try:
+                    os.remove(output_file)
+                except OSError:
+                    pass
+        return rendered
+
+    @staticmethod
+    def link_image(source, png_file):
+        """
+        Coloca em png_file a imagem source, por hard link ou, se não for possível, por cópia, e
+        atualiza a data de modificação para que find_pending_images a considere atualizada.
+        """
+        temporary = png_file + ".tmp"
+        try:
+            try:
+                os.link(source, temporary)
+            except OSError:
+                shutil.copyfile(source, temporary)
+            os.replace(temporary, png_file)
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        os.utime(png_file)
+
+    @staticmethod
+    def find_pending_images(folder_path):
+        """
+        Encontra os arquivos DOT de um diretório (incluindo subdiretórios) cuja imagem
+        ainda não existe ou é mais antiga que o próprio arquivo DOT.
+
+        Args:
+            folder_path (str): Caminho para a pasta raiz da busca.
+
+        Returns:
+            list: Caminhos dos arquivos DOT que precisam ser renderizados.
+        """
+        pending = []
+        for root, _, files in os.walk(folder_path):
+            for file in files:
+                if not file.endswith(".dot"):
+                    continue
+                dot_file = os.path.join(root, file)
+                png_file = os.path.splitext(dot_file)[0] + ".png"
+                if not os.path.exists(png_file) or os.path.getmtime(png_file) < os.path.getmtime(dot_file):
+                    pending.append(dot_file)
+        return pending
 
     @staticmethod
     def plot_cgra(mapping, cgra_dim, routing=True, output_file="cgra.png"):
@@ -96,18 +217,36 @@ class Graph_Visualizer:
     #     print(f"DFG exportado para {filename}")
 
     @staticmethod
-    def export_to_dot(mapping, filename):
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write("strict digraph {\n")
+    def to_dot(mapping):
+        """
+        Gera o texto DOT do DFG de um mapeamento.
+
+        Args:
+            mapping (Mapping): Objeto contendo o mapeamento.
+
+        Returns:
+            str: Conteúdo DOT, no mesmo formato de export_to_dot.
+        """
+        lines = ["strict digraph {\n"]
+
+        # 1. Escrever os nós em ordem
+        for node in sorted(mapping.placement.keys()):
+            lines.append(f'    {node} [opcode=add];\n')
 
-            # 1. Escrever os nós em ordem
-            for node in sorted(mapping.placement.keys()):
-                f.write(f'    {node} [opcode=add];\n')
+        # Nós de roteamento inseridos pelo Graph_Balancer (sem placement), como no Script_Graph_Balancing
+        for node in sorted(set(mapping.dfg_vertices) - mapping.placement.keys()):
+            lines.append(f'    {node} [operand=Routing];\n')
 
-            for (src, dst) in sorted(mapping.routing.keys()):
-                f.write(f'    {src} -> {dst};\n')
+        for (src, dst) in sorted(mapping.routing.keys()):
+            lines.append(f'    {src} -> {dst};\n')
 
-            f.write("}\n")
+        lines.append("}\n")
+        return "".join(lines)
+
+    @staticmethod
+    def export_to_dot(mapping, filename):
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(Graph_Visualizer.to_dot(mapping))
 
         print(f"DFG exportado para {filename}")
 
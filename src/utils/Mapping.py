@@ -1,7 +1,205 @@
+from array import array
+
 class Mapping:
+  """
+    Placement, arestas e rotas de um DFG mapeado.
+
+    O objeto tem dois estados. Aberto, os campos são dicionários e listas, usados durante a
+    geração. Depois de pack(), tudo fica em um único array de inteiros (placement em um trecho
+    plano e arestas no formato CSR), para manter milhões de mapeamentos em memória. Os campos
+    continuam acessíveis como dicionários: o primeiro acesso a placement, dfg_edges, routing ou
+    physical_routes de um mapeamento compactado o abre de novo (unpack), preservando as ordens.
+
+    Nenhuma etapa do gerador chama pack(): os mapeamentos são entregues abertos, e o Mapp_Controler,
+    o Archive_Writer e o Numpy_Dataset_Writer os gravam e descartam em seguida. Quem guarda os
+    mapeamentos em memória (por exemplo, uma lista de amostras de treino) deve chamar pack() em
+    cada um ao guardá-lo.
+  """
+
+  __slots__ = ("num_vertices", "dfg_num_edges", "_vertices", "_placement", "_dfg_edges", "_routing", "_physical_routes", "_packed")
+
   def __init__(self,num_vertices):
-    self.routing = {}
-    self.placement: dict = {}
-    self.dfg_edges: dict = {}
-    self.dfg_vertices = list(range(num_vertices)) 
+    self.num_vertices = num_vertices
     self.dfg_num_edges = 0
+    self._vertices = None
+    self._placement = {}
+    self._dfg_edges = {}
+    self._routing = {}
+    self._physical_routes = {}
+    self._packed = None
+
+  @property
+  def dfg_vertices(self):
+    return range(self.num_vertices) if self._vertices is None else self._vertices
+
+  @dfg_vertices.setter
+  def dfg_vertices(self, vertices):
+    self._vertices = vertices
+
+  @property
+  def placement(self):
+    if self._packed is not None:
+      self.unpack()
+    return self._placement
+
+  @placement.setter
+  def placement(self, placement):
+    if self._packed is not None:
+      self.unpack()
+    self._placement = placement
+
+  @property
+  def dfg_edges(self):
+    if self._packed is not None:
+      self.unpack()
+    return self._dfg_edges
+
+  @dfg_edges.setter
+  def dfg_edges(self, dfg_edges):
+    if self._packed is not None:
+      self.unpack()
+    self._dfg_edges = dfg_edges
+
+  @property
+  def routing(self):
+    if self._packed is not None:
+      self.unpack()
+    return self._routing
+
+  @routing.setter
+  def routing(self, routing):
+    if self._packed is not None:
+      self.unpack()
+    self._routing = routing
+
+  @property
+  def physical_routes(self):
+    if self._packed is not None:
+      self.unpack()
+    return self._physical_routes
+
+  @physical_routes.setter
+  def physical_routes(self, physical_routes):
+    if self._packed is not None:
+      self.unpack()
+    self._physical_routes = physical_routes
+
+  @property
+  def is_packed(self):
+    return self._packed is not None
+
+  def pack(self):
+    """
+      Compacta o mapeamento em um único array de inteiros, com um cabeçalho de 6 tamanhos
+      (n, m, e, r, p, q) seguido dos segmentos:
+
+        nodes (n) e positions (3n): nós do placement e suas posições (linha, coluna, ciclo).
+        edge_nodes (m), edge_offsets (m+1) e edge_targets (e): dfg_edges em CSR; os destinos de
+                                     edge_nodes[i] são edge_targets[edge_offsets[i]:edge_offsets[i+1]].
+        route_pairs (2r): pares (origem, destino) de routing; só os caminhos que não são a própria
+                          aresta [origem, destino] são guardados à parte.
+        physical_pairs (2p), physical_offsets (p+1) e physical_positions (3q): physical_routes em CSR.
+
+      Returns:
+          Mapping: O próprio mapeamento, para encadear chamadas.
+    """
+    if self._packed is not None:
+      return self
+
+    nodes = array("i", self._placement)
+    positions = array("i")
+    for pos in self._placement.values():
+      positions.extend(pos)
+
+    edge_nodes = array("i", self._dfg_edges)
+    edge_offsets = array("i", [0])
+    edge_targets = array("i")
+    for targets in self._dfg_edges.values():
+      edge_targets.extend(targets)
+      edge_offsets.append(len(edge_targets))
+
+    route_pairs = array("i")
+    route_paths = {}
+    for index, ((src, dst), path) in enumerate(self._routing.items()):
+      route_pairs.append(src)
+      route_pairs.append(dst)
+      if len(path) != 2 or path[0] != src or path[1] != dst:
+        route_paths[index] = tuple(path)
+
+    physical_pairs = array("i")
+    physical_offsets = array("i", [0])
+    physical_positions = array("i")
+    for (src, dst), path in self._physical_routes.items():
+      physical_pairs.append(src)
+      physical_pairs.append(dst)
+      for pos in path:
+        physical_positions.extend(pos)
+      physical_offsets.append(len(physical_positions) // 3)
+
+    data = array("i", [len(nodes), len(edge_nodes), len(edge_targets), len(route_pairs) // 2,
+                       len(physical_pairs) // 2, len(physical_positions) // 3])
+    for segment in (nodes, positions, edge_nodes, edge_offsets, edge_targets, route_pairs,
+                    physical_pairs, physical_offsets, physical_positions):
+      data.extend(segment)
+
+    self._packed = (data, route_paths or None)
+    self._placement = self._dfg_edges = self._routing = self._physical_routes = None
+    return self
+
+  def unpack(self):
+    """
+      Reconstrói os dicionários de um mapeamento compactado por pack().
+    """
+    data, route_paths = self._packed
+    self._packed = None
+
+    n, m, e, r, p, q = data[:6]
+    segments = []
+    offset = 6
+    for size in (n, 3 * n, m, m + 1, e, 2 * r, 2 * p, p + 1, 3 * q):
+      segments.append(data[offset:offset + size])
+      offset += size
+    (nodes, positions, edge_nodes, edge_offsets, edge_targets, route_pairs,
+     physical_pairs, physical_offsets, physical_positions) = segments
+
+    self._placement = {node: tuple(positions[3 * i:3 * i + 3]) for i, node in enumerate(nodes)}
+    self._dfg_edges = {node: edge_targets[edge_offsets[i]:edge_offsets[i + 1]].tolist() for i, node in enumerate(edge_nodes)}
+
+    self._routing = {}
+    for index in range(r):
+      src, dst = route_pairs[2 * index], route_pairs[2 * index + 1]
+      self._routing[(src, dst)] = list(route_paths[index]) if route_paths and index in route_paths else [src, dst]
+
+    self._physical_routes = {}
+    for index in range(p):
+      self._physical_routes[(physical_pairs[2 * index], physical_pairs[2 * index + 1])] = [
+        tuple(physical_positions[3 * i:3 * i + 3]) for i in range(physical_offsets[index], physical_offsets[index + 1])
+      ]
+    return self
+
+  def __getstate__(self):
+    return (self.num_vertices, self.dfg_num_edges, self._vertices, self._placement, self._dfg_edges,
+            self._routing, self._physical_routes, self._packed)
+
+  def __setstate__(self, state):
+    (self.num_vertices, self.dfg_num_edges, self._vertices, self._placement, self._dfg_edges,
+     self._routing, self._physical_routes, self._packed) = state
+
+  def to_bitset(self):
+    """
+      Converte as arestas do DFG em máscaras de bits: o bit j de successors[i] indica a aresta
+      i -> j e o bit i de predecessors[j] indica a mesma aresta. Usado pelo Graph_Processing
+      para validar DFGs pequenos com operações de bits.
+
+      Returns:
+          tuple: (successors, predecessors), listas de inteiros indexadas pelos nós.
+    """
+    num_vertices = len(self.dfg_vertices)
+    successors = [0] * num_vertices
+    predecessors = [0] * num_vertices
+    for node, targets in self.dfg_edges.items():
+      node_bit = 1 << node
+      for target in targets:
+        successors[node] |= 1 << target
+        predecessors[target] |= node_bit
+    return successors, predecessors
@@ -0,0 +1,148 @@
+import re
+import networkx as nx
+from src.utils.Mapping import Mapping
+
+_ID = r'(?:[A-Za-z_][A-Za-z_0-9]*|-?\d+(?:\.\d+)?|"(?:[^"\\]|\\.)*")'
+_HEADER = re.compile(rf'\s*(?:strict\s+)?digraph\s*(?:{_ID}\s*)?\{{\s*$')
+_EDGE = re.compile(rf'\s*({_ID})\s*->\s*({_ID})\s*(?:\[([^\]]*)\])?\s*;?\s*$')
+_NODE = re.compile(rf'\s*({_ID})\s*(?:\[([^\]]*)\])?\s*;?\s*$')
+_ATTR = re.compile(rf'\s*({_ID})\s*=\s*({_ID})\s*[,;]?')
+_KEYWORDS = {"node", "edge", "graph", "subgraph", "digraph", "strict"}
+
+class Dot_Reader:
+    """
+    Leitor rápido de arquivos DOT no formato escrito por Graph_Visualizer.export_to_dot e pelos
+    scripts (uma declaração por linha: 'strict digraph {', 'N [opcode=add];', 'a -> b;', '}').
+
+    Cada linha é reconhecida por uma expressão regular, sem montar a árvore sintática do pydot. Se
+    alguma linha estiver fora desse formato (subgrafos, atributos padrão, várias declarações na mesma
+    linha, comentários...), a leitura é refeita com o networkx/pydot.
+    """
+
+    @staticmethod
+    def parse_attrs(text):
+        """
+        Args:
+            text (str | None): Conteúdo entre colchetes de uma declaração.
+
+        Returns:
+            dict | None: Atributos (valores como no pydot, com aspas), ou None se o texto não for reconhecido.
+        """
+        if not text or text.isspace():
+            return {}
+        attrs = {}
+        position = 0
+        while position < len(text):
+            match = _ATTR.match(text, position)
+            if match is None:
+                return None if text[position:].strip() else attrs
+            attrs[match.group(1).strip('"')] = match.group(2)
+            position = match.end()
+        return attrs
+
+    @staticmethod
+    def parse(text):
+        """
+        Lê o texto DOT no formato restrito.
+
+        Args:
+            text (str): Conteúdo do arquivo DOT.
+
+        Returns:
+            tuple | None: (nodes, edges), com nodes um dicionário nome -> atributos na ordem de
+                          aparição e edges uma lista de (origem, destino, atributos); None se o texto
+                          não estiver no formato reconhecido.
+        """
+        lines = iter(text.splitlines())
+        for line in lines:
+            if line.strip():
+                if _HEADER.match(line) is None:
+                    return None
+                break
+        else:
+            return None
+
+        nodes = {}
+        edges = []
+        closed = False
+        for line in lines:
+            if not line or line.isspace():
+                continue
+            if closed:
+                return None
+            if line.strip() == "}":
+                closed = True
+                continue
+
+            match = _EDGE.match(line)
+            if match is not None:
+                attrs = Dot_Reader.parse_attrs(match.group(3))
+                if attrs is None:
+                    return None
+                source, target = match.group(1).strip('"'), match.group(2).strip('"')
+                nodes.setdefault(source, {})
+                nodes.setdefault(target, {})
+                edges.append((source, target, attrs))
+                continue
+
+            match = _NODE.match(line)
+            if match is None or match.group(1) in _KEYWORDS:
+                return None
+            attrs = Dot_Reader.parse_attrs(match.group(2))
+            if attrs is None:
+                return None
+            nodes.setdefault(match.group(1).strip('"'), {}).update(attrs)
+
+        return (nodes, edges) if closed else None
+
+    @staticmethod
+    def read_graph(file_path):
+        """
+        Carrega um arquivo DOT como grafo direcionado, com os mesmos nomes (str) e atributos que
+        nx.DiGraph(nx.nx_pydot.read_dot(file_path)).
+
+        Args:
+            file_path (str): Caminho do arquivo .dot.
+
+        Returns:
+            nx.DiGraph: Grafo lido.
+        """
+        with open(file_path, encoding="utf-8") as f:
+            parsed = Dot_Reader.parse(f.read())
+        if parsed is None:
+            return nx.DiGraph(nx.nx_pydot.read_dot(file_path))
+
+        nodes, edges = parsed
+        graph = nx.DiGraph()
+        graph.add_nodes_from(nodes.items())
+        graph.add_edges_from(edges)
+        return graph
+
+    @staticmethod
+    def read_mapping(file_path):
+        """
+        Carrega um DFG exportado por Graph_Visualizer.export_to_dot como Mapping, com dfg_edges e
+        routing preenchidos (o DOT não guarda o placement).
+
+        Args:
+            file_path (str): Caminho do arquivo .dot.
+
+        Returns:
+            Mapping: DFG lido.
+
+        Raises:
+            ValueError: Se os nós não forem os inteiros 0..n-1.
+        """
+        graph = Dot_Reader.read_graph(file_path)
+        try:
+            names = {name: int(name) for name in graph.nodes}
+        except ValueError:
+            raise ValueError(f"{file_path}: os nós do DFG devem ser inteiros.")
+        if sorted(names.values()) != list(range(len(names))):
+            raise ValueError(f"{file_path}: os nós do DFG devem ser 0..{len(names) - 1}.")
+
+        mapping = Mapping(len(names))
+        mapping.dfg_edges = {names[node]: [names[target] for target in graph.successors(node)] for node in graph.nodes}
+        mapping.routing = {(names[source], names[target]): [names[source], names[target]] for source, target in graph.edges}
+        mapping.dfg_num_edges = graph.number_of_edges()
+        return mapping
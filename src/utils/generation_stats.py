@@ -0,0 +1,87 @@
+from collections import Counter, defaultdict
+import json
+import csv
+
+class Generation_Stats:
+    """
+    Telemetria da geração de mapeamentos: conta as tentativas de cada configuração por causa
+    de rejeição e acumula o tempo gasto em cada etapa.
+
+    As configurações são identificadas pela tupla (dfg_tam, cgra_dim, II, bits, alpha, alpha2).
+    """
+
+    CAUSES = ["accepted", "disconnected", "cyclic", "unbalanced", "routing_path", "capacity", "duplicate"]
+    STAGES = ["placement", "interconnection", "routing", "validation", "balancing", "routing_path", "dedup"]
+
+    def __init__(self):
+        self.counts = defaultdict(Counter)
+        self.times = defaultdict(Counter)
+
+    def record(self, key, cause, timings, count=1):
+        """
+        Registra uma tentativa.
+
+        Args:
+            key (tuple): (dfg_tam, cgra_dim, II, bits, alpha, alpha2).
+            cause (str): 'accepted' ou a causa da rejeição.
+            timings (dict): Tempo, em segundos, de cada etapa executada.
+            count (int): Número de tentativas com essa causa (por exemplo, as descartadas de um lote).
+        """
+        self.counts[key][cause] += count
+        self.times[key].update(timings)
+
+    def reject_accepted(self, key, cause, timings):
+        """
+        Reclassifica uma tentativa já registrada como aceita, rejeitada depois da geração (por
+        exemplo, um DFG isomorfo a outro já gerado).
+        """
+        self.counts[key]["accepted"] -= 1
+        self.record(key, cause, timings)
+
+    def merge(self, other):
+        """
+        Acrescenta os contadores de outro Generation_Stats (por exemplo, de um worker).
+        """
+        for key, counts in other.counts.items():
+            self.counts[key].update(counts)
+        for key, times in other.times.items():
+            self.times[key].update(times)
+
+    def rows(self):
+        """
+        Returns:
+            list: Um dicionário por configuração, com tentativas, rejeições por causa e tempo por etapa.
+        """
+        rows = []
+        for key in sorted(self.counts):
+            dfg_tam, cgra_dim, II, bits, alpha, alpha2 = key
+            counts, times = self.counts[key], self.times[key]
+            attempts = sum(counts.values())
+            rows.append({
+                "dfg_tam": dfg_tam,
+                "cgra_dim": f"{cgra_dim[0]}x{cgra_dim[1]}",
+                "II": II,
+                "bits": bits,
+                "alpha": alpha,
+                "alpha2": alpha2,
+                "attempts": attempts,
+                "acceptance_rate": counts["accepted"] / attempts if attempts else 0.0,
+                **{cause: counts[cause] for cause in Generation_Stats.CAUSES},
+                **{f"time_{stage}": times[stage] for stage in Generation_Stats.STAGES},
+                "time_total": sum(times.values()),
+            })
+        return rows
+
+    def dump(self, path):
+        """
+        Salva a telemetria em JSON ou CSV, conforme a extensão de path.
+        """
+        rows = self.rows()
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            if path.endswith(".csv"):
+                writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["dfg_tam"])
+                writer.writeheader()
+                writer.writerows(rows)
+            else:
+                json.dump(rows, f, indent=2)
+        print(f"Telemetria salva em {path}")
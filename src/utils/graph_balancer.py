@@ -0,0 +1,70 @@
+from src.utils.Mapping import Mapping
+from src.utils.graph_processing import Graph_Processing
+
+class Graph_Balancer:
+    """
+    Balanceamento de DFGs em memória, equivalente ao balance_graph do Script_Graph_Balancing, mas
+    sobre o Mapping e sem passar por networkx ou por arquivos DOT.
+    """
+
+    @staticmethod
+    def balance(mapping: Mapping, levels=None):
+        """
+        Insere nós de roteamento nas arestas que atravessam mais de um nível, de modo que toda
+        aresta u -> v passe a ligar o nível L ao nível L + 1.
+
+        Os nós inseridos recebem os índices seguintes aos do DFG (num_vertices, num_vertices + 1, ...)
+        e não têm placement. As arestas originais mantêm a ordem de dfg_edges; as entradas de routing
+        das arestas divididas são substituídas pelas dos novos saltos.
+
+        Args:
+            mapping (Mapping): Mapeamento a ser balanceado (alterado no lugar).
+            levels (dict | None): Níveis {nó: profundidade} já calculados por Graph_Processing.kahn_sweep
+                                  (ou calculate_predecessors_and_levels). Se None, são calculados aqui.
+                                  Os níveis dos nós inseridos são acrescentados a esse dicionário.
+
+        Returns:
+            int: Número de nós de roteamento inseridos.
+
+        Raises:
+            ValueError: Se o DFG for desconexo ou cíclico.
+        """
+        if levels is None:
+            cause, levels = Graph_Processing(mapping, len(mapping.dfg_vertices)).kahn_sweep()
+            if cause in ("disconnected", "cyclic"):
+                raise ValueError(f"DFG {'desconexo' if cause == 'disconnected' else 'cíclico'} não pode ser balanceado.")
+
+        dfg_edges = mapping.dfg_edges
+        routing = mapping.routing
+        first = next_node = mapping.num_vertices
+        routing_nodes = {}
+
+        for source in list(dfg_edges):
+            targets = dfg_edges[source]
+            for position, target in enumerate(targets):
+                gap = levels[target] - levels[source]
+                if gap <= 1:
+                    continue
+                previous = source
+                for step in range(1, gap):
+                    node = next_node
+                    next_node += 1
+                    levels[node] = levels[source] + step
+                    if previous == source:
+                        targets[position] = node
+                    else:
+                        routing_nodes[previous] = [node]
+                    if (source, target) in routing:
+                        routing[(previous, node)] = [previous, node]
+                    previous = node
+                routing_nodes[previous] = [target]
+                if routing.pop((source, target), None) is not None:
+                    routing[(previous, target)] = [previous, target]
+
+        dfg_edges.update(routing_nodes)
+        added = next_node - first
+        mapping.num_vertices = next_node
+        mapping.dfg_num_edges += added
+        if not isinstance(mapping.dfg_vertices, range):
+            mapping.dfg_vertices = list(mapping.dfg_vertices) + list(range(first, next_node))
+        return added
@@ -0,0 +1,127 @@
+from networkx.algorithms.isomorphism import DiGraphMatcher
+import networkx as nx
+
+class Graph_Deduplicator:
+    """
+    Descarta, durante a geração, DFGs isomorfos a um DFG já aceito.
+
+    Cada DFG recebe uma forma canônica calculada por refinamento de cores (Weisfeiler-Lehman
+    direcionado, partindo dos graus de entrada e saída). Quando o refinamento separa todos os nós,
+    as cores finais são uma rotulação canônica e as arestas renomeadas identificam o grafo a menos
+    de isomorfismo. Caso contrário (nós simétricos), o histórico do refinamento serve de hash e os
+    DFGs com o mesmo hash são comparados com o DiGraphMatcher do networkx, como no
+    Isormophic_Remove_Script. Os DFGs de cada hash são guardados como tuplas de arestas.
+    """
+
+    def __init__(self, max_consecutive=10000):
+        """
+        Args:
+            max_consecutive (int): Número de duplicatas seguidas a partir do qual se assume que não
+                                   há mais DFGs distintos para gerar (ver exhausted).
+        """
+        self.max_consecutive = max_consecutive
+        self.canonical = set()
+        self.buckets = {}
+        self.distinct = 0
+        self.duplicates = 0
+        self.consecutive = 0
+
+    @staticmethod
+    def canonical_form(dfg_edges, num_vertices):
+        """
+        Refina as cores dos nós até estabilizarem.
+
+        Args:
+            dfg_edges (dict): Arestas do DFG.
+            num_vertices (int): Número de nós do DFG (nós fora de 0..num_vertices-1 são ignorados).
+
+        Returns:
+            tuple: (key, edges). Se o refinamento separar todos os nós, key é a forma canônica
+                   exata e edges é None; senão key é um hash do refinamento e edges a lista de arestas.
+        """
+        successors = [[] for _ in range(num_vertices)]
+        predecessors = [[] for _ in range(num_vertices)]
+        edges = []
+        for source, targets in dfg_edges.items():
+            if not 0 <= source < num_vertices:
+                continue
+            for target in targets:
+                if 0 <= target < num_vertices:
+                    successors[source].append(target)
+                    predecessors[target].append(source)
+                    edges.append((source, target))
+
+        signatures = [(len(predecessors[node]), len(successors[node])) for node in range(num_vertices)]
+        history = []
+        classes = 0
+        while True:
+            # Ordenar as assinaturas torna a numeração das cores independente da numeração dos nós.
+            ranks = {signature: color for color, signature in enumerate(sorted(set(signatures)))}
+            colors = [ranks[signature] for signature in signatures]
+            history.append(tuple(sorted(signatures)))
+            if len(ranks) == classes or len(ranks) == num_vertices:
+                break
+            classes = len(ranks)
+            signatures = [(colors[node],
+                           tuple(sorted(colors[p] for p in predecessors[node])),
+                           tuple(sorted(colors[s] for s in successors[node])))
+                          for node in range(num_vertices)]
+
+        if len(ranks) == num_vertices:
+            return (num_vertices, tuple(sorted((colors[source], colors[target]) for source, target in edges))), None
+        return hash(tuple(history)), edges
+
+    def add(self, mapping):
+        """
+        Registra o DFG do mapeamento, se ele ainda não foi visto.
+
+        Args:
+            mapping (Mapping): Mapeamento aceito pelo gerador.
+
+        Returns:
+            bool: True se o DFG é novo; False se é isomorfo a um DFG já registrado.
+        """
+        num_vertices = len(mapping.dfg_vertices)
+        key, edges = Graph_Deduplicator.canonical_form(mapping.dfg_edges, num_vertices)
+
+        if edges is None:
+            is_new = key not in self.canonical
+            if is_new:
+                self.canonical.add(key)
+        else:
+            # Os buckets guardam só as arestas; os grafos do networkx são montados apenas quando
+            # outro DFG cai no mesmo bucket e precisa ser comparado.
+            bucket = self.buckets.setdefault(key, [])
+            edges = tuple(edges)
+            if bucket:
+                graph = Graph_Deduplicator.to_graph(edges, num_vertices)
+                is_new = not any(DiGraphMatcher(Graph_Deduplicator.to_graph(*existing), graph).is_isomorphic() for existing in bucket)
+            else:
+                is_new = True
+            if is_new:
+                bucket.append((edges, num_vertices))
+
+        if is_new:
+            self.distinct += 1
+            self.consecutive = 0
+        else:
+            self.duplicates += 1
+            self.consecutive += 1
+        return is_new
+
+    @staticmethod
+    def to_graph(edges, num_vertices):
+        """
+        Monta o nx.DiGraph de um DFG guardado em um bucket.
+        """
+        graph = nx.DiGraph(edges)
+        graph.add_nodes_from(range(num_vertices))
+        return graph
+
+    @property
+    def exhausted(self):
+        """
+        True depois de max_consecutive duplicatas seguidas: o intervalo de tamanhos provavelmente
+        não tem mais DFGs distintos a gerar.
+        """
+        return self.consecutive >= self.max_consecutive
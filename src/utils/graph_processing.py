@@ -8,8 +8,159 @@ class Graph_Processing:
       self.dfg_tam = dfg_tam
 
    def is_valid(self):
+      return self.validate() is None
+
+   # validate_bitset funciona com qualquer DFG, mas cada onda percorre todos os nós restantes;
+   # acima de 16 nós a passada linear de kahn_sweep é mais rápida.
+   BITSET_MAX_NODES = 16
+
+   def validate(self):
+
+      """
+        Verifica o DFG e informa o primeiro critério em que ele falha, na mesma ordem de is_valid.
+        DFGs com até BITSET_MAX_NODES nós são verificados por validate_bitset e os demais por kahn_sweep.
+
+        Returns:
+            str | None: 'disconnected', 'cyclic' ou 'unbalanced', ou None se o DFG for válido.
+        """
+
+      if self.dfg_tam <= Graph_Processing.BITSET_MAX_NODES:
+         return self.validate_bitset()
+      return self.kahn_sweep()[0]
+
+   def kahn_sweep(self):
+
+      """
+        Valida o DFG em uma única passada do algoritmo de Kahn com contadores de grau de entrada,
+        calculando ao mesmo tempo os níveis e o balanceamento.
+
+        Se a passada remove todos os nós, o DFG é acíclico, e então ele é conexo (a partir do
+        primeiro nó de dfg_edges, como em is_connected) se e somente se esse nó é a única fonte
+        e todos os dfg_tam nós aparecem no grafo. Só quando sobra um ciclo é feita uma busca a
+        partir desse nó, para distinguir 'disconnected' de 'cyclic'.
+
+        Returns:
+            tuple: (causa, níveis), com causa 'disconnected', 'cyclic', 'unbalanced' ou None e
+                   níveis {nó: profundidade} dos nós removidos pela passada.
+        """
+
+      dfg_edges = self.mapping.dfg_edges
+      if not dfg_edges:
+         return "disconnected", {}
+      start = next(iter(dfg_edges))
+
+      in_degree = dict.fromkeys(dfg_edges, 0)
+      for targets in dfg_edges.values():
+         for target in targets:
+            in_degree[target] = in_degree.get(target, 0) + 1
+
+      sources = [node for node, degree in in_degree.items() if degree == 0]
+      levels = dict.fromkeys(sources, 0)
+      pred_level = {}
+      balanced = True
+      stack = sources[:]
+      while stack:
+         node = stack.pop()
+         level = levels[node]
+         for target in dfg_edges.get(node, ()):
+            first = pred_level.setdefault(target, level)
+            if first != level:
+               balanced = False
+               if level > first:
+                  pred_level[target] = level
+            in_degree[target] -= 1
+            if in_degree[target] == 0:
+               levels[target] = pred_level[target] + 1
+               stack.append(target)
+
+      if len(levels) < len(in_degree):
+         reached = {start}
+         stack = [start]
+         while stack:
+            for target in dfg_edges.get(stack.pop(), ()):
+               if target not in reached:
+                  reached.add(target)
+                  stack.append(target)
+         return ("disconnected" if len(reached) != self.dfg_tam else "cyclic"), levels
+
+      if sources != [start] or len(levels) != self.dfg_tam:
+         return "disconnected", levels
+      if not balanced:
+         return "unbalanced", levels
+      return None, levels
+
+   def validate_bitset(self):
+
+      """
+        Mesma verificação de validate, com o DFG representado por máscaras de bits (Mapping.to_bitset).
+
+        A conectividade é a busca a partir do primeiro nó de dfg_edges, como em is_connected. Os
+        níveis são as ondas do algoritmo de Kahn: cada onda é a máscara dos nós restantes sem
+        predecessores restantes. Se sobrarem nós sem onda, há um ciclo. O DFG é balanceado se
+        todos os predecessores de cada nó estão na onda anterior à do nó.
+
+        Returns:
+            str | None: 'disconnected', 'cyclic' ou 'unbalanced', ou None se o DFG for válido.
+        """
+
       mapping = self.mapping
-      return(self.is_connected(mapping) and not self.has_cycle(mapping.dfg_edges) and self.is_balanced(mapping))
+      if not mapping.dfg_edges:
+         return "disconnected"
+
+      successors, predecessors = mapping.to_bitset()
+      all_nodes = (1 << self.dfg_tam) - 1
+
+      reached = frontier = 1 << next(iter(mapping.dfg_edges))
+      while frontier:
+         found = 0
+         while frontier:
+            bit = frontier & -frontier
+            found |= successors[bit.bit_length() - 1]
+            frontier ^= bit
+         frontier = found & ~reached
+         reached |= frontier
+      if reached != all_nodes:
+         return "disconnected"
+
+      remaining = all_nodes
+      previous_wave = 0
+      while remaining:
+         wave = 0
+         pending = remaining
+         while pending:
+            bit = pending & -pending
+            node = bit.bit_length() - 1
+            if not predecessors[node] & remaining:
+               if predecessors[node] & ~previous_wave:
+                  return "unbalanced" if not self.has_cycle_bitset(predecessors, remaining) else "cyclic"
+               wave |= bit
+            pending ^= bit
+         if not wave:
+            return "cyclic"
+         remaining &= ~wave
+         previous_wave = wave
+      return None
+
+   @staticmethod
+   def has_cycle_bitset(predecessors, remaining):
+
+      """
+        Verifica se o subgrafo dos nós de remaining tem um ciclo, removendo repetidamente os nós
+        sem predecessores em remaining.
+        """
+
+      while remaining:
+         sources = 0
+         pending = remaining
+         while pending:
+            bit = pending & -pending
+            if not predecessors[bit.bit_length() - 1] & remaining:
+               sources |= bit
+            pending ^= bit
+         if not sources:
+            return True
+         remaining &= ~sources
+      return False
 
    def is_balanced(self, mapping:Mapping):
 
@@ -61,9 +212,9 @@ class Graph_Processing:
          for dest in edges:
             predecessors[dest].append(node)
 
-      aux_predecessors = {node: preds.copy() for node, preds in predecessors.items()}
+      remaining = {node: len(preds) for node, preds in predecessors.items()}
 
-      nodes_without_predecessors = deque(node for node, preds in aux_predecessors.items() if not preds)
+      nodes_without_predecessors = deque(node for node, count in remaining.items() if not count)
       visited = set() 
       current_level = 0
 
@@ -76,12 +227,12 @@ class Graph_Processing:
             levels[node] = current_level
 
             for dest in dfg_edges.get(node, []):
-               aux_predecessors[dest].remove(node)
-               if not aux_predecessors[dest]:
+               remaining[dest] -= 1
+               if not remaining[dest]:
                   next_nodes.append(dest)
 
-            nodes_without_predecessors = next_nodes
-            current_level += 1
+         nodes_without_predecessors = next_nodes
+         current_level += 1
 
 
       nodes_in_cycles = set(dfg_edges.keys()) - visited
@@ -100,30 +251,27 @@ class Graph_Processing:
         Returns:
             bool: True se houver ciclo, False caso contrário.
         """
-        visited = set()
-        stack = set()
-
-        def dfs(node, path):
-            if node in stack:
-                return True, path + [node]
-            if node in visited:
-                return False, []
-
-            visited.add(node)
-            stack.add(node)
-
-            for neighbor in dfg_edges.get(node, []):
-                has_cycle, cycle_path = dfs(neighbor, path + [node])
-                if has_cycle:
-                    return True, cycle_path
-
-            stack.remove(node)
-            return False, []
-
-        for node in dfg_edges.keys():
-            has_cycle, cycle_path = dfs(node, [])
-            if has_cycle:
-                return True
+        # 0 = não visitado, 1 = na pilha da busca, 2 = concluído.
+        state = {}
+
+        for start in dfg_edges:
+            if start in state:
+                continue
+            state[start] = 1
+            stack = [(start, iter(dfg_edges.get(start, ())))]
+            while stack:
+                node, neighbors = stack[-1]
+                for neighbor in neighbors:
+                    neighbor_state = state.get(neighbor, 0)
+                    if neighbor_state == 1:
+                        return True
+                    if neighbor_state == 0:
+                        state[neighbor] = 1
+                        stack.append((neighbor, iter(dfg_edges.get(neighbor, ()))))
+                        break
+                else:
+                    state[node] = 2
+                    stack.pop()
 
         return False
 
@@ -140,18 +288,13 @@ class Graph_Processing:
       if not mapping.dfg_edges:
          return False
 
-      visited = set()
-
-      def dfs(node):
-         """
-            Realiza busca em profundidade para verificar conectividade.
-            """
-         if node not in visited:
-            visited.add(node)
-            for neighbor in mapping.dfg_edges[node]:
-               dfs(neighbor)
-
       start_node = next(iter(mapping.dfg_edges))
-      dfs(start_node)
+      visited = {start_node}
+      stack = [start_node]
+      while stack:
+         for neighbor in mapping.dfg_edges.get(stack.pop(), ()):
+            if neighbor not in visited:
+               visited.add(neighbor)
+               stack.append(neighbor)
       return len(visited) == self.dfg_tam
 
@@ -181,21 +181,20 @@ class Graph_Transformer:
         if not dfg_edges:
             return False
 
-        visited = set()
-        
-        start_node = next((node for node in dfg_edges if dfg_edges[node] or any(node in targets for targets in dfg_edges.values())), None)
+        all_nodes = set(dfg_edges.keys()).union(*dfg_edges.values())
+        targets = set().union(*dfg_edges.values())
+
+        start_node = next((node for node in dfg_edges if dfg_edges[node] or node in targets), None)
         
         if start_node is None:
             return False
 
-        def dfs(node):
-            if node not in visited:
-                visited.add(node)
-                for neighbor in dfg_edges.get(node, []):
-                    dfs(neighbor)
-
-        dfs(start_node)
-
-        all_nodes = set(dfg_edges.keys()).union(*dfg_edges.values())
+        visited = {start_node}
+        stack = [start_node]
+        while stack:
+            for neighbor in dfg_edges.get(stack.pop(), []):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    stack.append(neighbor)
 
         return visited == all_nodes
@@ -0,0 +1,226 @@
+from src.utils.Mapping import Mapping
+from src.utils.Graph_Visualizer import Graph_Visualizer
+import tarfile
+import json
+import gzip
+import glob
+import io
+import os
+
+"""
+Formato do arquivo de mapeamentos:
+
+    Os mapeamentos são acrescentados a arquivos de shard com tamanho máximo
+    ({prefix}{numero:05d}.jsonl, .jsonl.gz ou .tar). Cada shard tem um índice
+    ({prefix}{numero:05d}.idx) com uma linha "nome<TAB>offset<TAB>tamanho" por mapeamento,
+    que permite ler um mapeamento com um único seek.
+
+    jsonl: um registro JSON por linha. Com compressão, cada registro é um membro gzip
+           independente, então o shard continua sendo um .gz válido e o offset do índice
+           aponta para o início do membro.
+    tar:   um membro {nome}.dot por mapeamento (ou {nome}.dot.gz com compressão), com o mesmo
+           conteúdo gerado por Graph_Visualizer.export_to_dot. O offset aponta para os dados do membro.
+           Como o DOT só tem o DFG, o placement e as rotas físicas só ficam no formato jsonl.
+"""
+
+class Archive_Writer:
+    """
+    Escreve mapeamentos em shards de tamanho limitado, em vez de um arquivo DOT por mapeamento.
+    """
+
+    def __init__(self, output_dir, format="jsonl", compress=False, max_shard_bytes=64 * 1024 * 1024, prefix="mappings_"):
+        """
+        Args:
+            output_dir (str): Diretório dos shards.
+            format (str): 'jsonl' ou 'tar'.
+            compress (bool): Se True, comprime cada registro com gzip.
+            max_shard_bytes (int): Tamanho a partir do qual um novo shard é aberto.
+            prefix (str): Prefixo dos arquivos de shard. Execuções particionadas devem usar
+                          prefixos diferentes para escrever no mesmo diretório.
+        """
+        if format not in ["jsonl", "tar"]:
+            raise ValueError("Formato deve ser 'jsonl' ou 'tar'.")
+
+        self.output_dir = output_dir
+        self.format = format
+        self.compress = compress
+        self.max_shard_bytes = max_shard_bytes
+        self.prefix = prefix
+        self.shard_number = len(glob.glob(os.path.join(output_dir, f"{prefix}[0-9][0-9][0-9][0-9][0-9].idx")))
+        self.shard_file = None
+        self.tar = None
+        self.index_file = None
+
+        os.makedirs(output_dir, exist_ok=True)
+
+    def open_shard(self):
+        base = os.path.join(self.output_dir, f"{self.prefix}{self.shard_number:05d}")
+        extension = "tar" if self.format == "tar" else "jsonl.gz" if self.compress else "jsonl"
+        path = f"{base}.{extension}"
+        self.index_file = open(f"{base}.idx", "w", encoding="utf-8")
+        if self.format == "tar":
+            self.tar = tarfile.open(path, "w", format=tarfile.GNU_FORMAT)
+        else:
+            self.shard_file = open(path, "wb")
+
+    def close_shard(self):
+        if self.tar is not None:
+            self.tar.close()
+            self.tar = None
+        if self.shard_file is not None:
+            self.shard_file.close()
+            self.shard_file = None
+        if self.index_file is not None:
+            self.index_file.close()
+            self.index_file = None
+            self.shard_number += 1
+
+    def current_size(self):
+        return self.tar.offset if self.tar is not None else self.shard_file.tell()
+
+    def write(self, name, mapping: Mapping, metadata=None):
+        """
+        Acrescenta um mapeamento ao shard atual.
+
+        Args:
+            name (str): Nome do mapeamento (chave do índice).
+            mapping (Mapping): Mapeamento a ser salvo.
+            metadata (dict): Informações adicionais salvas junto do registro (apenas jsonl).
+        """
+        if self.index_file is None:
+            self.open_shard()
+
+        if self.format == "tar":
+            data = Graph_Visualizer.to_dot(mapping).encode("utf-8")
+            member_name = f"{name}.dot"
+            if self.compress:
+                data = gzip.compress(data)
+                member_name += ".gz"
+            info = tarfile.TarInfo(member_name)
+            info.size = len(data)
+            offset = self.tar.offset + len(info.tobuf(self.tar.format, self.tar.encoding, self.tar.errors))
+            self.tar.addfile(info, io.BytesIO(data))
+        else:
+            data = (json.dumps(Archive_Writer.to_record(name, mapping, metadata)) + "\n").encode("utf-8")
+            if self.compress:
+                data = gzip.compress(data)
+            offset = self.shard_file.tell()
+            self.shard_file.write(data)
+
+        self.index_file.write(f"{name}\t{offset}\t{len(data)}\n")
+
+        if self.current_size() >= self.max_shard_bytes:
+            self.close_shard()
+
+    def close(self):
+        self.close_shard()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    @staticmethod
+    def to_record(name, mapping: Mapping, metadata=None):
+        """
+        Converte um mapeamento em um registro serializável em JSON.
+        """
+        record = {
+            "name": name,
+            "metadata": metadata or {},
+            "num_vertices": len(mapping.dfg_vertices),
+            "placement": [[node, *pos] for node, pos in mapping.placement.items()],
+            "dfg_edges": [[node, list(targets)] for node, targets in mapping.dfg_edges.items()],
+            "routing": [[src, dst, list(path)] for (src, dst), path in mapping.routing.items()],
+        }
+        if mapping.physical_routes:
+            record["physical_routes"] = [[src, dst, [list(pos) for pos in path]] for (src, dst), path in mapping.physical_routes.items()]
+        return record
+
+    @staticmethod
+    def from_record(record):
+        """
+        Reconstrói o Mapping de um registro gerado por to_record.
+        """
+        mapping = Mapping(record["num_vertices"])
+        mapping.placement = {node: (r, c, t) for node, r, c, t in record["placement"]}
+        mapping.dfg_edges = {node: targets for node, targets in record["dfg_edges"]}
+        mapping.routing = {(src, dst): path for src, dst, path in record["routing"]}
+        mapping.physical_routes = {(src, dst): [tuple(pos) for pos in path] for src, dst, path in record.get("physical_routes", [])}
+        return mapping
+
+
+class Archive_Reader:
+    """
+    Acesso aleatório aos mapeamentos de um diretório escrito pelo Archive_Writer.
+    """
+
+    def __init__(self, output_dir):
+        """
+        Carrega os índices de todos os shards do diretório.
+
+        Args:
+            output_dir (str): Diretório dos shards.
+        """
+        self.entries = {}
+        for index_path in sorted(glob.glob(os.path.join(output_dir, "*.idx"))):
+            base = os.path.splitext(index_path)[0]
+            shard = next(path for path in [base + ".jsonl", base + ".jsonl.gz", base + ".tar"] if os.path.exists(path))
+            with open(index_path, encoding="utf-8") as f:
+                for line in f:
+                    name, offset, size = line.rstrip("\n").split("\t")
+                    self.entries[name] = (shard, int(offset), int(size))
+
+    def names(self):
+        return list(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def read_bytes(self, name):
+        """
+        Lê os bytes de um mapeamento, já descomprimidos.
+        """
+        shard, offset, size = self.entries[name]
+        with open(shard, "rb") as f:
+            f.seek(offset)
+            data = f.read(size)
+        if shard.endswith(".gz") or data[:2] == b"\x1f\x8b":
+            data = gzip.decompress(data)
+        return data
+
+    def read_dot(self, name):
+        """
+        Retorna o texto DOT de um mapeamento.
+        """
+        shard = self.entries[name][0]
+        if shard.endswith(".tar"):
+            return self.read_bytes(name).decode("utf-8")
+        return Graph_Visualizer.to_dot(self.to_mapping(name))
+
+    def to_mapping(self, name):
+        """
+        Reconstrói o Mapping de um mapeamento salvo em jsonl.
+
+        Raises:
+            ValueError: Se o shard for tar, que guarda apenas o DOT.
+        """
+        if self.entries[name][0].endswith(".tar"):
+            raise ValueError(f"O shard de {name} é tar e guarda apenas o DOT; use read_dot.")
+        return Archive_Writer.from_record(json.loads(self.read_bytes(name)))
+
+    def extract_to_dot(self, name, filename):
+        """
+        Extrai um mapeamento para um arquivo DOT, como export_to_dot.
+
+        Args:
+            name (str): Nome do mapeamento.
+            filename (str): Caminho do arquivo DOT de destino.
+        """
+        if self.entries[name][0].endswith(".tar"):
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write(self.read_dot(name))
+            print(f"DFG exportado para {filename}")
+        else:
+            Graph_Visualizer.export_to_dot(self.to_mapping(name), filename)
@@ -0,0 +1,179 @@
+from src.utils.Mapping import Mapping
+import numpy as np
+import glob
+import os
+
+"""
+Formato do dataset NumPy:
+
+    Cada shard é um diretório {prefix}{numero:05d}/ com arrays .npy planos:
+
+        edge_index.npy   int32 (2, E)  arestas de todos os grafos, com os nós numerados
+                                       localmente em cada grafo (0..n-1).
+        placement.npy    int16 (N, 3)  posição (linha, coluna, ciclo) de cada nó; (-1, -1, -1) para
+                                       os nós de roteamento inseridos pelo Graph_Balancer.
+        node_offsets.npy int64 (G+1,)  nós do grafo g: placement[node_offsets[g]:node_offsets[g+1]].
+        edge_offsets.npy int64 (G+1,)  arestas do grafo g: edge_index[:, edge_offsets[g]:edge_offsets[g+1]].
+        cgra_dim.npy     int16 (G, 2)  dimensões do CGRA de cada grafo.
+        index.npy        int64 (G,)    índice do mapeamento na execução que o gerou.
+
+    Os arquivos .npy são abertos com np.load(mmap_mode='r'), então o leitor devolve views
+    sem cópia e só as páginas efetivamente acessadas são lidas do disco.
+"""
+
+class Numpy_Dataset_Writer:
+    """
+    Acumula mapeamentos em arrays planos e grava um shard quando o tamanho máximo é atingido.
+    """
+
+    def __init__(self, output_dir, max_shard_bytes=64 * 1024 * 1024, prefix="dataset_"):
+        """
+        Args:
+            output_dir (str): Diretório do dataset.
+            max_shard_bytes (int): Tamanho aproximado a partir do qual o shard é gravado.
+            prefix (str): Prefixo dos diretórios de shard.
+        """
+        self.output_dir = output_dir
+        self.max_shard_bytes = max_shard_bytes
+        self.prefix = prefix
+        self.shard_number = len(glob.glob(os.path.join(output_dir, f"{prefix}[0-9][0-9][0-9][0-9][0-9]")))
+        self.reset()
+
+        os.makedirs(output_dir, exist_ok=True)
+
+    def reset(self):
+        self.sources = []
+        self.targets = []
+        self.placement = []
+        self.node_offsets = [0]
+        self.edge_offsets = [0]
+        self.cgra_dims = []
+        self.indices = []
+
+    def shard_bytes(self):
+        return 8 * len(self.sources) + 6 * len(self.placement) + 28 * len(self.indices)
+
+    def write(self, mapping: Mapping, cgra_dim, index=-1):
+        """
+        Acrescenta um mapeamento ao shard atual.
+
+        Args:
+            mapping (Mapping): Mapeamento a ser salvo.
+            cgra_dim (tuple): Dimensões do CGRA (linhas, colunas).
+            index (int): Índice do mapeamento na execução.
+        """
+        num_vertices = len(mapping.dfg_vertices)
+        for node in range(num_vertices):
+            # Nós de roteamento inseridos pelo Graph_Balancer não têm placement.
+            self.placement.append(mapping.placement.get(node, (-1, -1, -1)))
+        for src, dst in sorted(mapping.routing.keys()):
+            self.sources.append(src)
+            self.targets.append(dst)
+
+        self.node_offsets.append(len(self.placement))
+        self.edge_offsets.append(len(self.sources))
+        self.cgra_dims.append(cgra_dim)
+        self.indices.append(index)
+
+        if self.shard_bytes() >= self.max_shard_bytes:
+            self.flush()
+
+    def flush(self):
+        """
+        Grava o shard atual, se houver mapeamentos pendentes.
+        """
+        if not self.indices:
+            return
+
+        shard_dir = os.path.join(self.output_dir, f"{self.prefix}{self.shard_number:05d}")
+        os.makedirs(shard_dir, exist_ok=True)
+
+        arrays = {
+            "edge_index": np.array([self.sources, self.targets], dtype=np.int32).reshape(2, -1),
+            "placement": np.array(self.placement, dtype=np.int16).reshape(-1, 3),
+            "node_offsets": np.array(self.node_offsets, dtype=np.int64),
+            "edge_offsets": np.array(self.edge_offsets, dtype=np.int64),
+            "cgra_dim": np.array(self.cgra_dims, dtype=np.int16).reshape(-1, 2),
+            "index": np.array(self.indices, dtype=np.int64),
+        }
+        for name, array in arrays.items():
+            np.save(os.path.join(shard_dir, f"{name}.npy"), array)
+
+        self.shard_number += 1
+        self.reset()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+class Numpy_Dataset:
+    """
+    Leitor de um dataset gravado pelo Numpy_Dataset_Writer, com os shards mapeados em memória.
+    """
+
+    ARRAYS = ["edge_index", "placement", "node_offsets", "edge_offsets", "cgra_dim", "index"]
+
+    def __init__(self, output_dir):
+        """
+        Abre todos os shards do diretório com np.load(mmap_mode='r').
+
+        Args:
+            output_dir (str): Diretório do dataset.
+        """
+        self.shards = []
+        for shard_dir in sorted(glob.glob(os.path.join(output_dir, "*", "node_offsets.npy"))):
+            shard_dir = os.path.dirname(shard_dir)
+            self.shards.append({name: np.load(os.path.join(shard_dir, f"{name}.npy"), mmap_mode="r") for name in Numpy_Dataset.ARRAYS})
+
+        sizes = [len(shard["index"]) for shard in self.shards]
+        self.shard_starts = np.concatenate(([0], np.cumsum(sizes, dtype=np.int64)))
+
+    def __len__(self):
+        return int(self.shard_starts[-1])
+
+    def locate(self, graph):
+        """
+        Retorna o shard e a posição local do grafo de índice global graph.
+        """
+        if not 0 <= graph < len(self):
+            raise IndexError(f"Grafo {graph} fora do intervalo [0, {len(self)}).")
+        shard = int(np.searchsorted(self.shard_starts, graph, side="right")) - 1
+        return self.shards[shard], graph - int(self.shard_starts[shard])
+
+    def __getitem__(self, graph):
+        """
+        Retorna views sem cópia das arestas e do placement de um grafo.
+
+        Args:
+            graph (int): Índice global do grafo no dataset.
+
+        Returns:
+            tuple: (edge_index (2, E) int32, placement (n, 3) int16).
+        """
+        shard, local = self.locate(graph)
+        node_start, node_end = shard["node_offsets"][local:local + 2]
+        edge_start, edge_end = shard["edge_offsets"][local:local + 2]
+        return shard["edge_index"][:, edge_start:edge_end], shard["placement"][node_start:node_end]
+
+    def cgra_dim(self, graph):
+        shard, local = self.locate(graph)
+        return tuple(int(x) for x in shard["cgra_dim"][local])
+
+    def to_mapping(self, graph):
+        """
+        Reconstrói o Mapping de um grafo do dataset.
+        """
+        edge_index, placement = self[graph]
+        mapping = Mapping(len(placement))
+        mapping.placement = {node: tuple(int(x) for x in pos) for node, pos in enumerate(placement) if pos[0] >= 0}
+        mapping.dfg_edges = {node: [] for node in range(len(placement))}
+        for src, dst in edge_index.T.tolist():
+            mapping.dfg_edges[src].append(dst)
+            mapping.routing[(src, dst)] = [src, dst]
+        return mapping
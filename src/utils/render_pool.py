@@ -0,0 +1,106 @@
+from src.utils.Graph_Visualizer import Graph_Visualizer
+import threading
+import queue
+import os
+
+class Render_Pool:
+    """
+    Pool limitado de threads que renderiza arquivos DOT em PNG em segundo plano.
+
+    O gerador enfileira os caminhos dos arquivos DOT com submit() e segue para a próxima
+    tentativa; cada thread retira da fila todos os arquivos já enfileirados (até batch_size) e
+    os renderiza com uma única chamada ao Graphviz (Graph_Visualizer.render_batch), usando o
+    cache de imagens por conteúdo. A fila tem tamanho máximo, então submit() só bloqueia quando
+    a renderização está atrasada em relação à geração.
+    """
+
+    def __init__(self, workers=None, max_pending=256, batch_size=64, cache_dir=None):
+        """
+        Args:
+            workers (int): Número de threads de renderização. Por padrão, o número de núcleos.
+            max_pending (int): Número máximo de arquivos aguardando renderização.
+            batch_size (int): Número máximo de arquivos por chamada ao Graphviz.
+            cache_dir (str | None): Diretório do cache de imagens (ver Graph_Visualizer.render_batch).
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.cache_dir = cache_dir
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.threads = [threading.Thread(target=self.worker, daemon=True) for _ in range(self.workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def worker(self):
+        """
+        Consome a fila até receber o sinal de parada (None), em lotes de até batch_size arquivos.
+        """
+        while True:
+            batch = [self.queue.get()]
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None
+            if stop:
+                batch.pop()
+            try:
+                if batch:
+                    Graph_Visualizer.render_batch(batch, self.cache_dir)
+            except Exception as e:
+                # Uma thread que termina deixa de esvaziar a fila, e submit() e close() passariam a
+                # bloquear para sempre quando a fila enchesse.
+                print(f"Erro ao renderizar o lote de {batch[0]}: {e}")
+            finally:
+                for _ in range(len(batch) + stop):
+                    self.queue.task_done()
+            if stop:
+                return
+
+    def submit(self, dot_file):
+        """
+        Enfileira um arquivo DOT para renderização.
+
+        Args:
+            dot_file (str): Caminho para o arquivo DOT.
+        """
+        self.queue.put(dot_file)
+
+    def close(self):
+        """
+        Espera a renderização de todos os arquivos enfileirados e encerra as threads.
+        """
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+    @staticmethod
+    def render_tree(folder_path, workers=None, cache_dir=None):
+        """
+        Renderiza de uma só vez todos os arquivos DOT de um diretório que ainda não têm
+        imagem atualizada. Usado pelo modo de renderização adiada.
+
+        Args:
+            folder_path (str): Caminho para a pasta raiz da saída.
+            workers (int): Número de threads de renderização.
+            cache_dir (str | None): Diretório do cache de imagens.
+
+        Returns:
+            int: Número de arquivos que ficaram com imagem atualizada (renderizada ou vinda do cache).
+        """
+        pending = Graph_Visualizer.find_pending_images(folder_path)
+        with Render_Pool(workers, cache_dir=cache_dir) as pool:
+            for dot_file in pending:
+                pool.submit(dot_file)
+        # As falhas do Graphviz (ou a sua ausência) só aparecem como imagens que continuam pendentes.
+        failed = len(Graph_Visualizer.find_pending_images(folder_path)) if pending else 0
+        generated = len(pending) - failed
+        print(f"{generated} imagens geradas em {folder_path}" + (f", {failed} com erro" if failed else ""))
+        return generated